@@ -0,0 +1,136 @@
+"""ConfigManager 配置查找耗时对比
+
+用法:
+    python benchmarks/config_lookup_bench.py [查找次数]
+
+对比旧版（每次切分点分键并逐级查找嵌套字典）与当前的展开视图，
+分别测量单个查找、SystemConfigManager 的 (节, 键) 查找和 get_many 批量查找，
+以及修改配置后第一次查找时重新生成视图的耗时。
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 日志和配置文件都写到临时目录
+os.chdir(tempfile.mkdtemp(prefix="config_bench_"))
+
+from utils.config_manager import ConfigManager
+from utils.system_config import SystemConfigManager
+
+
+# BrowserManager.start_browser 读取的配置
+BROWSER_PATHS = [
+    "chrome.automation.use_local_browser",
+    "chrome.automation.headless",
+    "chrome.executable_path",
+    "chrome.automation.window_size.width",
+    "chrome.automation.window_size.height",
+    "chrome.automation.disable_gpu",
+    "chrome.automation.user_agent.enabled",
+    "chrome.automation.user_agent.type",
+    "chrome.automation.user_agent.custom",
+    "chrome.automation.user_agent.presets.chrome_mac",
+]
+
+
+def legacy_get_config(config, key, default=None):
+    """旧版查找: 切分点分键后逐级查找"""
+    try:
+        keys = key.split('.')
+        value = config
+        for k in keys:
+            value = value[k]
+        return value
+    except (KeyError, TypeError):
+        return default
+
+
+def legacy_system_get_config(config, section, key, default=None):
+    """旧版 SystemConfigManager.get_config: 拼接键后调用父类方法"""
+    return legacy_get_config(config, f"{section}.{key}", default)
+
+
+def build_config():
+    """生成与系统配置文件结构相同的配置"""
+    return {
+        "cursor": {
+            "executable_path": "C:\\Cursor\\Cursor.exe",
+            "data_dir": "C:\\Cursor\\data",
+            "config_file": "C:\\Cursor\\storage.json",
+            "db_file": "C:\\Cursor\\state.vscdb"
+        },
+        "chrome": {
+            "executable_path": "C:\\Chrome\\chrome.exe",
+            "user_data_dir": "C:\\Chrome\\User Data",
+            "automation": {
+                "headless": False,
+                "user_agent": {
+                    "enabled": True,
+                    "type": "chrome_mac",
+                    "custom": "",
+                    "presets": {name: f"Mozilla/5.0 ({name})" for name in (
+                        "chrome_windows", "chrome_mac", "chrome_android", "chrome_ios"
+                    )}
+                },
+                "window_size": {"width": 1920, "height": 1080},
+                "disable_gpu": True,
+                "use_local_browser": True
+            }
+        },
+        "backup": {"enabled": True, "interval_days": 7, "max_backups": 5, "backup_dir": "backups"},
+        "logging": {"jsonl": False}
+    }
+
+
+def measure(func, count, repeat=5):
+    """测量调用count次的最短平均耗时（微秒）"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(count):
+            func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    manager = SystemConfigManager("config/bench_config.json")
+    manager.config = build_config()
+    config = manager.config
+    sections = [path.split(".", 1) for path in BROWSER_PATHS]
+    
+    print(f"查找次数: {count}，每次查找 {len(BROWSER_PATHS)} 个配置（BrowserManager.start_browser 读取的配置）")
+    print(f"{'方式':<36}{'微秒/次':>12}")
+    results = [
+        ("旧版 get_config(路径)", measure(
+            lambda: [legacy_get_config(config, path) for path in BROWSER_PATHS], count)),
+        ("展开视图 get_config(路径)", measure(
+            lambda: [ConfigManager.get_config(manager, path) for path in BROWSER_PATHS], count)),
+        ("旧版 get_config(节, 键)", measure(
+            lambda: [legacy_system_get_config(config, section, key) for section, key in sections], count)),
+        ("展开视图 get_config(节, 键)", measure(
+            lambda: [manager.get_config(section, key) for section, key in sections], count)),
+        ("展开视图 get_many(路径列表)", measure(
+            lambda: manager.get_many(BROWSER_PATHS), count)),
+    ]
+    for name, elapsed in results:
+        print(f"{name:<36}{elapsed:>12.2f}")
+        
+    # 修改配置后第一次查找需要重新生成视图
+    def rebuild():
+        manager._version += 1
+        manager._flat_view()
+    print(f"重新生成展开视图: {measure(rebuild, 1000):.2f} 微秒/次（{len(manager._flat_view())} 个路径）")
+    
+    # 放弃待保存的修改，临时配置不写入文件
+    manager._dirty = False
+    ConfigManager.flush_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""LogMessage 内存占用和创建耗时对比
+
+用法:
+    python benchmarks/log_message_bench.py [记录数]
+
+对比旧版（实例字典、创建时立即格式化时间）与当前的 __slots__ 版本，
+输出每条记录的内存占用和创建耗时。
+"""
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import LogMessage
+
+
+class LegacyLogMessage:
+    """旧版日志消息，用于对比"""
+    
+    def __init__(self, level, message, time_str=None, source=None):
+        self.level = level
+        self.message = message
+        self.time_str = time_str or datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        self.source = source or "app"
+        self.seq = 0
+
+
+def make_records(cls, count, messages):
+    """创建count条日志记录，级别和来源每次都是新拼接的字符串，模拟运行时生成的值"""
+    level_parts = ("IN", "FO")
+    source_parts = ("Db", "Manager")
+    return [
+        cls("".join(level_parts), messages[i], source="".join(source_parts))
+        for i in range(count)
+    ]
+
+
+def measure_memory(cls, count, messages):
+    """测量每条记录占用的字节数，不含消息文本本身"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    records = make_records(cls, count, messages)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+    return (after - before) / count
+
+
+def measure_time(cls, count, messages, repeat=5):
+    """测量创建一条记录的最短平均耗时（微秒）"""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        make_records(cls, count, messages)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best / count * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    messages = [f"消息 {i}" for i in range(count)]
+    
+    print(f"记录数: {count}")
+    print(f"{'实现':<20}{'字节/条':>12}{'微秒/条':>12}")
+    results = {}
+    for name, cls in (("LegacyLogMessage", LegacyLogMessage), ("LogMessage", LogMessage)):
+        memory = measure_memory(cls, count, messages)
+        elapsed = measure_time(cls, count, messages)
+        results[name] = (memory, elapsed)
+        print(f"{name:<20}{memory:>12.1f}{elapsed:>12.2f}")
+        
+    legacy, current = results["LegacyLogMessage"], results["LogMessage"]
+    print(f"内存减少 {1 - current[0] / legacy[0]:.0%}，创建耗时减少 {1 - current[1] / legacy[1]:.0%}")
+    
+    # 访问time_str时才格式化
+    records = make_records(LogMessage, 1000, messages)
+    started = time.perf_counter()
+    for record in records:
+        record.time_str
+    print(f"首次格式化time_str: {(time.perf_counter() - started) / len(records) * 1e6:.2f} 微秒/条")
+
+
+if __name__ == "__main__":
+    main()
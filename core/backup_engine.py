@@ -0,0 +1,293 @@
+import os
+import gzip
+import time
+import shutil
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from utils.logger import LoggerManager
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _BackupRestarted(Exception):
+    """分步备份因源数据库被修改而反复从头开始"""
+
+
+class BackupEngine:
+    """SQLite在线备份引擎
+    
+    使用 sqlite3.Connection.backup 分步复制数据库页面，每一步之间释放锁并短暂休眠，
+    Cursor正在写入时也能得到一致的快照，且不会长时间阻塞Cursor。
+    备份可以按流式压缩为gzip或zstd（需要安装zstandard），并记录每次备份的耗时和吞吐量。
+    """
+    
+    # 压缩格式对应的文件后缀
+    SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+    
+    # 流式压缩和解压时每次读写的字节数
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, pages_per_step=256, sleep_ms=5, max_restarts=3, history_size=50):
+        """初始化备份引擎
+        
+        Args:
+            pages_per_step: 每一步复制的页面数
+            sleep_ms: 两步之间的休眠时间（毫秒），让出数据库锁
+            max_restarts: 分步备份被源数据库的修改打断的最大次数，超过后改为一步复制
+            history_size: 保留的备份记录数量
+        """
+        self.pages_per_step = pages_per_step
+        self.sleep_ms = sleep_ms
+        self.max_restarts = max_restarts
+        self.logger = LoggerManager()
+        self._lock = threading.Lock()
+        self._history = deque(maxlen=history_size)
+        
+    @classmethod
+    def resolve_compression(cls, compression):
+        """确定实际使用的压缩格式
+        
+        Args:
+            compression: 请求的压缩格式，为None或空字符串时不压缩
+            
+        Returns:
+            str: gzip、zstd或None，未安装zstandard时zstd退回gzip
+        """
+        if not compression:
+            return None
+        compression = compression.lower()
+        if compression == "zstd" and zstandard is None:
+            return "gzip"
+        if compression not in cls.SUFFIXES:
+            raise ValueError(f"不支持的压缩格式: {compression}")
+        return compression
+        
+    @classmethod
+    def compression_of(cls, path):
+        """根据文件后缀判断备份文件的压缩格式
+        
+        Args:
+            path: 备份文件路径
+            
+        Returns:
+            str: gzip、zstd或None
+        """
+        for compression, suffix in cls.SUFFIXES.items():
+            if path.endswith(suffix):
+                return compression
+        return None
+        
+    def backup(self, src_path, dest_path, compression=None, progress_callback=None):
+        """在线备份数据库
+        
+        先用备份API把一致的快照写入临时文件，需要压缩时再流式压缩，
+        最后原子地替换为目标文件。
+        
+        Args:
+            src_path: 源数据库路径
+            dest_path: 目标文件路径，需要压缩时会自动补上对应后缀
+            compression: 压缩格式，gzip、zstd或None
+            progress_callback: 进度回调，参数为 (已复制页数, 总页数)
+            
+        Returns:
+            dict: 备份统计信息，包括目标路径、数据库大小、输出大小、页数、耗时和吞吐量
+            
+        Raises:
+            sqlite3.Error: 读取源数据库或写入快照失败
+            OSError: 写入目标文件失败
+        """
+        requested = compression
+        compression = self.resolve_compression(compression)
+        if requested and compression != requested.lower():
+            self.logger.warning("未安装zstandard，改用gzip压缩备份", "BackupEngine")
+        suffix = self.SUFFIXES.get(compression, "")
+        if suffix and not dest_path.endswith(suffix):
+            dest_path += suffix
+            
+        dest_dir = os.path.dirname(os.path.abspath(dest_path))
+        os.makedirs(dest_dir, exist_ok=True)
+        snapshot_path = dest_path + ".snapshot"
+        partial_path = dest_path + ".part"
+        
+        started = time.perf_counter()
+        try:
+            copy_state = self._copy_pages(src_path, snapshot_path, progress_callback)
+            db_bytes = os.path.getsize(snapshot_path)
+            if compression:
+                self._compress(snapshot_path, partial_path, compression)
+                os.remove(snapshot_path)
+            else:
+                os.replace(snapshot_path, partial_path)
+            os.replace(partial_path, dest_path)
+        finally:
+            for path in (snapshot_path, partial_path):
+                if os.path.exists(path):
+                    os.remove(path)
+                    
+        duration = time.perf_counter() - started
+        stats = {
+            "src_path": src_path,
+            "dest_path": dest_path,
+            "compression": compression,
+            "pages": copy_state["pages"],
+            "restarts": copy_state["restarts"],
+            "db_bytes": db_bytes,
+            "output_bytes": os.path.getsize(dest_path),
+            "duration": duration,
+            "throughput": db_bytes / duration if duration > 0 else 0.0,
+            "time": time.time()
+        }
+        with self._lock:
+            self._history.append(stats)
+            
+        self.logger.info(
+            f"备份完成: {dest_path} ({db_bytes / 1024:.1f} KB -> {stats['output_bytes'] / 1024:.1f} KB, "
+            f"{duration:.2f}秒, {stats['throughput'] / (1024 * 1024):.2f} MB/s)",
+            "BackupEngine"
+        )
+        return stats
+        
+    def _copy_pages(self, src_path, dest_path, progress_callback=None):
+        """使用备份API分步复制数据库页面
+        
+        其他连接在两步之间修改源数据库时，备份会从头开始。Cursor持续写入时
+        分步备份可能一直无法完成，因此被打断超过max_restarts次后改为一步复制剩余内容。
+        
+        Args:
+            src_path: 源数据库路径
+            dest_path: 快照文件路径
+            progress_callback: 进度回调，参数为 (已复制页数, 总页数)
+            
+        Returns:
+            dict: 复制的总页数pages和被打断的次数restarts
+        """
+        uri = Path(os.path.abspath(src_path)).as_uri() + "?mode=ro"
+        src = sqlite3.connect(uri, uri=True)
+        dest = sqlite3.connect(dest_path)
+        state = {"pages": 0, "copied": 0, "restarts": 0}
+        
+        def on_progress(status, remaining, total):
+            copied = total - remaining
+            if copied < state["copied"]:
+                state["restarts"] += 1
+                if state["restarts"] > self.max_restarts:
+                    raise _BackupRestarted()
+            state["pages"] = total
+            state["copied"] = copied
+            if progress_callback:
+                progress_callback(copied, total)
+                
+        try:
+            try:
+                src.backup(dest, pages=self.pages_per_step, progress=on_progress, sleep=self.sleep_ms / 1000)
+            except _BackupRestarted:
+                self.logger.warning(
+                    f"备份过程中数据库被修改了{state['restarts']}次，改为一步复制", "BackupEngine"
+                )
+                state["copied"] = 0
+                src.backup(dest, pages=-1, progress=on_progress)
+        finally:
+            dest.close()
+            src.close()
+        return state
+        
+    def _compress(self, src_path, dest_path, compression):
+        """流式压缩文件
+        
+        Args:
+            src_path: 原始文件路径
+            dest_path: 压缩文件路径
+            compression: gzip或zstd
+        """
+        with open(src_path, "rb") as src:
+            if compression == "zstd":
+                with open(dest_path, "wb") as raw:
+                    with zstandard.ZstdCompressor(level=3).stream_writer(raw) as writer:
+                        shutil.copyfileobj(src, writer, self.CHUNK_SIZE)
+            else:
+                with gzip.open(dest_path, "wb", compresslevel=6) as writer:
+                    shutil.copyfileobj(src, writer, self.CHUNK_SIZE)
+                    
+    def _decompress(self, src_path, dest_path, compression):
+        """流式解压文件
+        
+        Args:
+            src_path: 压缩文件路径
+            dest_path: 解压后的文件路径
+            compression: gzip或zstd
+        """
+        with open(dest_path, "wb") as dest:
+            if compression == "zstd":
+                if zstandard is None:
+                    raise RuntimeError("还原zstd压缩的备份需要安装zstandard")
+                with open(src_path, "rb") as raw:
+                    with zstandard.ZstdDecompressor().stream_reader(raw) as reader:
+                        shutil.copyfileobj(reader, dest, self.CHUNK_SIZE)
+            else:
+                with gzip.open(src_path, "rb") as reader:
+                    shutil.copyfileobj(reader, dest, self.CHUNK_SIZE)
+                    
+    def restore(self, backup_path, db_path, progress_callback=None):
+        """从备份还原数据库
+        
+        通过备份API把备份写回目标数据库，而不是直接覆盖文件，
+        目标数据库的WAL文件和其他连接都能看到一致的结果。
+        
+        Args:
+            backup_path: 备份文件路径，支持gzip和zstd压缩
+            db_path: 目标数据库路径
+            progress_callback: 进度回调，参数为 (已复制页数, 总页数)
+            
+        Returns:
+            dict: 还原统计信息，包括页数和耗时
+        """
+        started = time.perf_counter()
+        compression = self.compression_of(backup_path)
+        snapshot_path = None
+        if compression:
+            snapshot_path = backup_path + ".restore"
+            self._decompress(backup_path, snapshot_path, compression)
+            source_path = snapshot_path
+        else:
+            source_path = backup_path
+            
+        try:
+            src = sqlite3.connect(source_path)
+            dest = sqlite3.connect(db_path)
+            total_pages = [0]
+            
+            def on_progress(status, remaining, total):
+                total_pages[0] = total
+                if progress_callback:
+                    progress_callback(total - remaining, total)
+                    
+            try:
+                src.backup(dest, pages=self.pages_per_step, progress=on_progress, sleep=self.sleep_ms / 1000)
+            finally:
+                dest.close()
+                src.close()
+        finally:
+            if snapshot_path and os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+                
+        duration = time.perf_counter() - started
+        self.logger.info(f"还原完成: {backup_path} -> {db_path} ({duration:.2f}秒)", "BackupEngine")
+        return {"pages": total_pages[0], "duration": duration}
+        
+    def get_history(self):
+        """获取最近的备份记录
+        
+        Returns:
+            list: 备份统计信息列表，按时间先后排列
+        """
+        with self._lock:
+            return list(self._history)
+
+
+# 进程内共享的备份引擎
+backup_engine = BackupEngine()
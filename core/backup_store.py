@@ -0,0 +1,383 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+import threading
+from datetime import datetime
+from utils.logger import LoggerManager
+from core.backup_engine import backup_engine
+
+
+class BackupStore:
+    """按内容寻址的增量备份仓库
+    
+    文件被切分为固定大小的块，每个块以SHA-256命名并只保存一份，
+    每个快照用一个清单记录组成各文件的块。SQLite数据库按页原地修改，
+    固定大小的块与页对齐，数据库只改动少量页时新快照只需要写入少量新块。
+    快照列表保存在index.json中，列出备份时无需遍历目录。
+    
+    目录结构:
+        chunks/ab/abcdef...   zlib压缩的块
+        snapshots/<名称>.json 快照清单
+        index.json            快照索引
+    """
+    
+    # 块大小，为SQLite常见页大小的整数倍
+    CHUNK_SIZE = 64 * 1024
+    
+    def __init__(self, root):
+        """初始化备份仓库
+        
+        Args:
+            root: 仓库根目录
+        """
+        self.root = root
+        self.chunks_dir = os.path.join(root, "chunks")
+        self.snapshots_dir = os.path.join(root, "snapshots")
+        self.index_path = os.path.join(root, "index.json")
+        self.logger = LoggerManager()
+        self._lock = threading.Lock()
+        
+    def list_snapshots(self):
+        """获取快照列表
+        
+        Returns:
+            list: 快照摘要列表，按时间从新到旧排列
+        """
+        with self._lock:
+            return list(reversed(self._load_index()))
+            
+    def has_snapshot(self, name):
+        """仓库中是否有指定名称的快照
+        
+        Args:
+            name: 快照名称
+            
+        Returns:
+            bool: 是否存在
+        """
+        return os.path.exists(self._manifest_path(name))
+        
+    def create_snapshot(self, files, name=None, databases=()):
+        """创建快照
+        
+        Args:
+            files: 文件名到源文件路径的字典，不存在的文件会被跳过
+            name: 快照名称，为None时使用时间戳
+            databases: 其中属于SQLite数据库的文件名，会先通过备份API取得一致的副本
+            
+        Returns:
+            dict: 快照摘要，包括名称、时间、文件数、总大小、新写入的字节数和耗时
+        """
+        started = time.perf_counter()
+        if not name:
+            name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        os.makedirs(self.chunks_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+        
+        with self._lock:
+            # 同一秒内创建多个快照时追加序号
+            base_name, suffix = name, 1
+            while os.path.exists(self._manifest_path(name)):
+                suffix += 1
+                name = f"{base_name}_{suffix}"
+                
+            manifest = {"name": name, "time": time.time(), "files": []}
+            stats = {"total_bytes": 0, "new_bytes": 0, "chunks": 0, "new_chunks": 0}
+            
+            for file_name, path in files.items():
+                if not path or not os.path.exists(path):
+                    continue
+                if file_name in databases:
+                    entry = self._store_database(file_name, path, stats)
+                else:
+                    entry = self._store_file(file_name, path, stats)
+                entry["source"] = path
+                entry["database"] = file_name in databases
+                manifest["files"].append(entry)
+                
+            manifest.update(stats)
+            self._write_json(self._manifest_path(name), manifest)
+            
+            summary = {
+                "name": name,
+                "time": manifest["time"],
+                "files": [entry["name"] for entry in manifest["files"]],
+                "total_bytes": stats["total_bytes"],
+                "new_bytes": stats["new_bytes"],
+                "duration": time.perf_counter() - started
+            }
+            index = self._load_index()
+            index.append(summary)
+            self._write_json(self.index_path, index)
+            
+        self.logger.info(
+            f"已创建快照 {name}: 共{stats['total_bytes'] / 1024:.1f} KB, "
+            f"新写入{stats['new_bytes'] / 1024:.1f} KB ({stats['new_chunks']}/{stats['chunks']}个块), "
+            f"{summary['duration']:.2f}秒",
+            "BackupStore"
+        )
+        return summary
+        
+    def _store_database(self, file_name, path, stats):
+        """通过备份API取得数据库的一致副本后切块保存
+        
+        Args:
+            file_name: 文件名
+            path: 数据库路径
+            stats: 统计信息，会被更新
+            
+        Returns:
+            dict: 清单中的文件条目
+        """
+        fd, snapshot_path = tempfile.mkstemp(suffix=".snapshot", dir=self.root)
+        os.close(fd)
+        try:
+            backup_engine.backup(path, snapshot_path)
+            return self._store_file(file_name, snapshot_path, stats)
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+                
+    def _store_file(self, file_name, path, stats):
+        """将文件切块保存，已存在的块不再写入
+        
+        Args:
+            file_name: 文件名
+            path: 文件路径
+            stats: 统计信息，会被更新
+            
+        Returns:
+            dict: 清单中的文件条目
+        """
+        chunks = []
+        size = 0
+        with open(path, "rb") as f:
+            while True:
+                data = f.read(self.CHUNK_SIZE)
+                if not data:
+                    break
+                digest = hashlib.sha256(data).hexdigest()
+                chunk_path = self._chunk_path(digest)
+                if not os.path.exists(chunk_path):
+                    os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+                    compressed = zlib.compress(data, 6)
+                    self._write_bytes(chunk_path, compressed)
+                    stats["new_chunks"] += 1
+                    stats["new_bytes"] += len(compressed)
+                chunks.append(digest)
+                size += len(data)
+        stats["chunks"] += len(chunks)
+        stats["total_bytes"] += size
+        return {"name": file_name, "size": size, "chunks": chunks}
+        
+    def restore_snapshot(self, name, targets):
+        """还原快照中的文件
+        
+        Args:
+            name: 快照名称
+            targets: 文件名到还原目标路径的字典，不在字典中的文件不还原
+            
+        Returns:
+            list: 已还原的目标路径
+        """
+        manifest = self._read_manifest(name)
+        restored = []
+        for entry in manifest["files"]:
+            target = targets.get(entry["name"])
+            if not target or not os.path.exists(os.path.dirname(target) or "."):
+                continue
+                
+            fd, temp_path = tempfile.mkstemp(suffix=".restore", dir=os.path.dirname(target) or ".")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    for digest in entry["chunks"]:
+                        f.write(self._read_chunk(digest))
+                if entry.get("database") and os.path.exists(target):
+                    # 通过备份API写回正在使用的数据库
+                    backup_engine.restore(temp_path, target)
+                else:
+                    os.replace(temp_path, target)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            restored.append(target)
+            self.logger.info(f"已从快照 {name} 还原: {target}", "BackupStore")
+        return restored
+        
+    def delete_snapshot(self, name):
+        """删除快照，不再被任何快照引用的块一并删除
+        
+        Args:
+            name: 快照名称
+            
+        Returns:
+            int: 删除的块数量
+        """
+        with self._lock:
+            manifest_path = self._manifest_path(name)
+            if os.path.exists(manifest_path):
+                os.remove(manifest_path)
+            try:
+                index = self._read_index()
+            except ValueError as e:
+                # 索引损坏时保留原文件，也不回收块，避免误删其他快照的数据
+                self.logger.error(f"备份索引已损坏，跳过块回收: {e}", "BackupStore")
+                return 0
+            index = [item for item in index if item["name"] != name]
+            self._write_json(self.index_path, index)
+            return self._collect_garbage()
+            
+    def prune(self, keep):
+        """只保留最新的若干个快照
+        
+        Args:
+            keep: 保留的快照数量
+            
+        Returns:
+            list: 被删除的快照名称
+        """
+        if keep <= 0:
+            return []
+        with self._lock:
+            try:
+                index = self._read_index()
+            except ValueError as e:
+                self.logger.error(f"备份索引已损坏，跳过清理: {e}", "BackupStore")
+                return []
+            removed = [item["name"] for item in index[:-keep]]
+            if not removed:
+                return []
+            for name in removed:
+                manifest_path = self._manifest_path(name)
+                if os.path.exists(manifest_path):
+                    os.remove(manifest_path)
+            self._write_json(self.index_path, index[-keep:])
+            self._collect_garbage()
+        self.logger.info(f"已清理旧快照: {', '.join(removed)}", "BackupStore")
+        return removed
+        
+    def _collect_garbage(self):
+        """删除不再被任何快照引用的块（调用方需持有self._lock）
+        
+        引用集合取自磁盘上的全部快照清单而不是索引，索引缺项时不会误删块；
+        任何清单无法读取时放弃本次回收，宁可多留块也不破坏其他快照。
+        
+        Returns:
+            int: 删除的块数量
+        """
+        removed = 0
+        if not os.path.exists(self.chunks_dir):
+            return removed
+            
+        referenced = set()
+        if os.path.exists(self.snapshots_dir):
+            for file_name in os.listdir(self.snapshots_dir):
+                if not file_name.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(self.snapshots_dir, file_name), "r", encoding="utf-8") as f:
+                        manifest = json.load(f)
+                    for entry in manifest["files"]:
+                        referenced.update(entry["chunks"])
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    self.logger.error(f"快照清单 {file_name} 无法读取，跳过块回收: {e}", "BackupStore")
+                    return removed
+                    
+        for prefix in os.listdir(self.chunks_dir):
+            prefix_dir = os.path.join(self.chunks_dir, prefix)
+            for digest in os.listdir(prefix_dir):
+                if digest not in referenced:
+                    os.remove(os.path.join(prefix_dir, digest))
+                    removed += 1
+        return removed
+        
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+        
+    def _manifest_path(self, name):
+        return os.path.join(self.snapshots_dir, f"{name}.json")
+        
+    def _read_chunk(self, digest):
+        """读取并校验块
+        
+        Args:
+            digest: 块的SHA-256
+            
+        Returns:
+            bytes: 块内容
+            
+        Raises:
+            ValueError: 块内容与摘要不一致
+        """
+        with open(self._chunk_path(digest), "rb") as f:
+            data = zlib.decompress(f.read())
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"备份块已损坏: {digest}")
+        return data
+        
+    def _read_manifest(self, name):
+        with open(self._manifest_path(name), "r", encoding="utf-8") as f:
+            return json.load(f)
+            
+    def _load_index(self):
+        """读取快照索引（调用方需持有self._lock）
+        
+        Returns:
+            list: 快照摘要列表，按时间从旧到新排列
+        """
+        try:
+            return self._read_index()
+        except ValueError as e:
+            self.logger.error(f"备份索引已损坏: {e}", "BackupStore")
+            return []
+            
+    def _read_index(self):
+        """读取快照索引，索引损坏时抛出异常（调用方需持有self._lock）
+        
+        Returns:
+            list: 快照摘要列表，按时间从旧到新排列
+            
+        Raises:
+            ValueError: 索引内容无法解析
+        """
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return []
+        if not isinstance(index, list):
+            raise ValueError("索引不是快照列表")
+        return index
+            
+    def _write_json(self, path, data):
+        """原子地写入JSON文件
+        
+        Args:
+            path: 文件路径
+            data: 数据
+        """
+        self._write_bytes(path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+        
+    @staticmethod
+    def _write_bytes(path, data):
+        """先写临时文件并刷到磁盘再替换，避免中断时留下不完整的文件
+        
+        Args:
+            path: 文件路径
+            data: 文件内容
+        """
+        directory = os.path.dirname(path) or "."
+        fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -18,6 +18,21 @@ class BrowserManager:
         self.system_config = system_config
         self.logger = logging.getLogger("BrowserManager")
         
+    def on_config_changed(self, config_file, paths):
+        """系统配置文件被外部修改
+        
+        启动浏览器时总是读取最新的配置，浏览器已经启动时记录哪些设置要在下次启动时生效。
+        
+        Args:
+            config_file: 配置文件路径
+            paths: 采用了文件中新值的配置路径列表
+        """
+        if not self.system_config or config_file != os.path.abspath(self.system_config.config_file):
+            return
+        changed = [path for path in paths if path.startswith("chrome.")]
+        if changed and self.browser:
+            self.logger.info(f"浏览器配置已变化，下次启动浏览器时生效: {', '.join(changed)}")
+            
     def start_browser(self, browser_type="chromium", headless=None):
         """启动浏览器
         
@@ -29,16 +44,25 @@ class BrowserManager:
             bool: 启动是否成功
         """
         try:
-            # 从配置文件获取设置
-            use_local_browser = True  # 默认使用本地浏览器
+            # 从配置文件一次获取所有设置
+            settings = {
+                "chrome.automation.use_local_browser": True,  # 默认使用本地浏览器
+                "chrome.automation.headless": False,
+                "chrome.executable_path": "",
+                "chrome.automation.window_size.width": 1920,
+                "chrome.automation.window_size.height": 1080,
+                "chrome.automation.disable_gpu": True,
+                "chrome.automation.user_agent.enabled": False,
+                "chrome.automation.user_agent.type": "default",
+                "chrome.automation.user_agent.custom": ""
+            }
             if self.system_config:
-                use_local_browser = self.system_config.get_config(
-                    "chrome", "automation.use_local_browser", True)
-                
-                # 如果headless未指定，从配置文件获取
-                if headless is None:
-                    headless = self.system_config.get_config(
-                        "chrome", "automation.headless", False)
+                settings = self.system_config.get_many(settings)
+            use_local_browser = settings["chrome.automation.use_local_browser"]
+            
+            # 如果headless未指定，从配置文件获取
+            if headless is None:
+                headless = settings["chrome.automation.headless"]
             
             # 启动Playwright
             self.playwright = sync_playwright().start()
@@ -51,7 +75,7 @@ class BrowserManager:
             
             # 检查是否使用自定义Chrome路径
             if browser_type == "chromium" and use_local_browser and self.system_config:
-                chrome_path = self.system_config.get_config("chrome", "executable_path", "")
+                chrome_path = settings["chrome.executable_path"]
                 if chrome_path and os.path.exists(chrome_path):
                     launch_options["executable_path"] = chrome_path
                     self.logger.info(f"使用本地Chrome浏览器: {chrome_path}")
@@ -61,11 +85,11 @@ class BrowserManager:
             # 获取其他浏览器选项
             if self.system_config:
                 # 获取窗口大小
-                width = self.system_config.get_config("chrome", "automation.window_size.width", 1920)
-                height = self.system_config.get_config("chrome", "automation.window_size.height", 1080)
+                width = settings["chrome.automation.window_size.width"]
+                height = settings["chrome.automation.window_size.height"]
                 
                 # 获取其他选项
-                disable_gpu = self.system_config.get_config("chrome", "automation.disable_gpu", True)
+                disable_gpu = settings["chrome.automation.disable_gpu"]
                 
                 # 应用浏览器参数
                 args = []
@@ -88,16 +112,16 @@ class BrowserManager:
             
             # 设置用户代理
             if self.system_config:
-                ua_enabled = self.system_config.get_config("chrome", "automation.user_agent.enabled", False)
+                ua_enabled = settings["chrome.automation.user_agent.enabled"]
                 if ua_enabled:
-                    ua_type = self.system_config.get_config("chrome", "automation.user_agent.type", "default")
+                    ua_type = settings["chrome.automation.user_agent.type"]
                     ua_string = ""
                     
                     if ua_type == "custom":
-                        ua_string = self.system_config.get_config("chrome", "automation.user_agent.custom", "")
+                        ua_string = settings["chrome.automation.user_agent.custom"]
                     elif ua_type != "default" and ua_type in ["chrome_windows", "chrome_mac", "chrome_android", "chrome_ios"]:
                         ua_string = self.system_config.get_config(
-                            f"chrome.automation.user_agent.presets.{ua_type}", 
+                            "chrome", f"automation.user_agent.presets.{ua_type}", 
                             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
                         )
                         
@@ -1,9 +1,18 @@
 import os
 import sqlite3
 import json
+import time
 import logging
+import tempfile
+import threading
 from datetime import datetime
+from itertools import islice
 from utils.logger import LoggerManager
+from core.db_pool import SqliteConnectionPool
+from core.lazy_value import wrap_value, looks_like_json
+from core.search_index import KeyValueSearchIndex
+from core.backup_engine import backup_engine
+from utils.json_stream import iter_json_object_items
 
 class DbManager:
     """数据库管理器类，用于管理Cursor数据库"""
@@ -32,6 +41,13 @@ class DbManager:
         # 设置日志
         self.logger = LoggerManager()
         
+        # 数据库连接池，复用每个线程的只读连接和共享的写连接
+        self.pool = SqliteConnectionPool()
+        
+        # 键值对全文索引，第一次搜索时创建
+        self.search_index = None
+        self._index_lock = threading.Lock()
+        
         # 数据库路径
         self.db_path = None
         if db_path:
@@ -53,10 +69,32 @@ class DbManager:
             self.logger.error(f"数据库文件不存在: {db_path}", "DbManager")
             return False
             
-        self.db_path = db_path
-        self.logger.info(f"设置数据库路径: {db_path}", "DbManager")
+        if db_path != self.db_path:
+            self.db_path = db_path
+            self.pool.open(db_path)
+            self.logger.info(f"设置数据库路径: {db_path}", "DbManager")
         return True
         
+    def get_pool_stats(self):
+        """获取连接池统计信息
+        
+        Returns:
+            dict: 连接池命中/未命中统计
+        """
+        return self.pool.get_stats()
+        
+    def close(self):
+        """关闭连接池中的所有数据库连接"""
+        stats = self.pool.get_stats()
+        self.pool.close()
+        if self.search_index is not None:
+            self.search_index.close()
+        self.logger.info(
+            f"关闭数据库连接池 (只读命中 {stats['reader_hits']} 次, 未命中 {stats['reader_misses']} 次, "
+            f"写连接命中 {stats['writer_hits']} 次, 未命中 {stats['writer_misses']} 次)",
+            "DbManager"
+        )
+        
     def get_db_info(self):
         """获取数据库信息
         
@@ -82,25 +120,23 @@ class DbManager:
             else:
                 size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
                 
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 获取表列表
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = [table[0] for table in cursor.fetchall()]
-            
-            # 获取每个表的行数
-            table_info = []
-            for table in tables:
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM [{table}];")
-                    count = cursor.fetchone()[0]
-                    table_info.append(f"{table} ({count}行)")
-                except sqlite3.OperationalError:
-                    table_info.append(f"{table} (无法读取)")
-                    
-            conn.close()
+            # 从连接池获取只读连接
+            with self.pool.reader() as conn:
+                cursor = conn.cursor()
+                
+                # 获取表列表
+                cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
+                tables = [table[0] for table in cursor.fetchall()]
+                
+                # 获取每个表的行数
+                table_info = []
+                for table in tables:
+                    try:
+                        cursor.execute(f"SELECT COUNT(*) FROM [{table}];")
+                        count = cursor.fetchone()[0]
+                        table_info.append(f"{table} ({count}行)")
+                    except sqlite3.OperationalError:
+                        table_info.append(f"{table} (无法读取)")
             
             return {
                 "status": "正常",
@@ -129,7 +165,7 @@ class DbManager:
             offset: 偏移量
             
         Returns:
-            dict: 表数据信息
+            dict: 表数据信息，JSON形式的值为LazyJsonValue
         """
         if not self.db_path or not os.path.exists(self.db_path):
             return {
@@ -141,21 +177,20 @@ class DbManager:
             }
             
         try:
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # 使用行工厂获取列名
-            cursor = conn.cursor()
-            
-            # 获取表的总行数
-            cursor.execute(f"SELECT COUNT(*) FROM [{table_name}];")
-            total = cursor.fetchone()[0]
-            
-            # 获取表数据
-            cursor.execute(f"SELECT * FROM [{table_name}] LIMIT {limit} OFFSET {offset};")
-            rows = cursor.fetchall()
+            # 从连接池获取只读连接
+            with self.pool.reader() as conn:
+                cursor = conn.cursor()
+                
+                # 获取表的总行数
+                cursor.execute(f"SELECT COUNT(*) FROM [{table_name}];")
+                total = cursor.fetchone()[0]
+                
+                # 获取表数据，行工厂只设置在游标上，避免影响池中的连接
+                cursor.row_factory = sqlite3.Row  # 使用行工厂获取列名
+                cursor.execute(f"SELECT * FROM [{table_name}] LIMIT {limit} OFFSET {offset};")
+                rows = cursor.fetchall()
             
             if not rows:
-                conn.close()
                 return {
                     "status": "正常",
                     "message": "表中没有数据",
@@ -172,18 +207,10 @@ class DbManager:
             for row in rows:
                 row_data = {}
                 for column in columns:
-                    value = row[column]
-                    # 尝试解析JSON字符串
-                    if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
-                        try:
-                            value = json.loads(value)
-                        except:
-                            pass
-                    row_data[column] = value
+                    # JSON字符串包装为延迟解析值，需要时再解析
+                    row_data[column] = wrap_value(column, row[column])
                 data.append(row_data)
                 
-            conn.close()
-            
             return {
                 "status": "正常",
                 "message": f"成功获取表数据，共{total}行",
@@ -213,7 +240,7 @@ class DbManager:
             offset: 偏移量
             
         Returns:
-            dict: 键值对数据信息
+            dict: 键值对数据信息，JSON形式的值为LazyJsonValue
         """
         if not self.db_path or not os.path.exists(self.db_path):
             return {
@@ -224,20 +251,19 @@ class DbManager:
             }
             
         try:
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 获取表的总行数
-            cursor.execute(f"SELECT COUNT(*) FROM [{table_name}];")
-            total = cursor.fetchone()[0]
-            
-            # 获取键值对数据
-            cursor.execute(f"SELECT [{key_column}], [{value_column}] FROM [{table_name}] LIMIT {limit} OFFSET {offset};")
-            rows = cursor.fetchall()
+            # 从连接池获取只读连接
+            with self.pool.reader() as conn:
+                cursor = conn.cursor()
+                
+                # 获取表的总行数
+                cursor.execute(f"SELECT COUNT(*) FROM [{table_name}];")
+                total = cursor.fetchone()[0]
+                
+                # 获取键值对数据
+                cursor.execute(f"SELECT [{key_column}], [{value_column}] FROM [{table_name}] LIMIT {limit} OFFSET {offset};")
+                rows = cursor.fetchall()
             
             if not rows:
-                conn.close()
                 return {
                     "status": "正常",
                     "message": "表中没有数据",
@@ -249,19 +275,10 @@ class DbManager:
             data = {}
             for row in rows:
                 key = row[0]
-                value = row[1]
                 
-                # 尝试解析JSON字符串
-                if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
-                    try:
-                        value = json.loads(value)
-                    except:
-                        pass
-                        
-                data[key] = value
+                # JSON字符串包装为延迟解析值，需要时再解析
+                data[key] = wrap_value(key, row[1])
                 
-            conn.close()
-            
             return {
                 "status": "正常",
                 "message": f"成功获取键值对数据，共{total}对",
@@ -278,8 +295,69 @@ class DbManager:
                 "total": 0
             }
             
-    def search_keys(self, keyword, table_name="ItemTable", key_column="key", value_column="value", limit=100):
-        """搜索键
+    def iter_key_values(self, after_key=None, batch=500, table_name="ItemTable", key_column="key", value_column="value", keyword=None):
+        """按键顺序分批遍历键值对
+        
+        使用键集分页（WHERE key > 上一批最后一个键）代替LIMIT/OFFSET，
+        每一批的查询代价与所在位置无关，且任意时刻内存中只保留一批数据。
+        值保持数据库中的原始形式，不做JSON解析。
+        
+        Args:
+            after_key: 从该键之后开始遍历，为None时从头开始
+            batch: 每批读取的行数
+            table_name: 表名，默认为ItemTable
+            key_column: 键列名，默认为key
+            value_column: 值列名，默认为value
+            keyword: 键的过滤关键字，为None时不过滤
+            
+        Yields:
+            tuple: (键, 值)
+            
+        Raises:
+            sqlite3.Error: 数据库不存在或查询失败
+        """
+        if not self.db_path or not os.path.exists(self.db_path):
+            raise sqlite3.OperationalError("数据库文件不存在")
+            
+        conditions = []
+        params = []
+        if keyword:
+            conditions.append(f"[{key_column}] LIKE ?")
+            params.append(f"%{keyword}%")
+        conditions.append(f"[{key_column}] > ?")
+        where = " AND ".join(conditions)
+        
+        # 第一批没有起始键时去掉范围条件
+        first_where = " AND ".join(conditions[:-1])
+        first_sql = f"SELECT [{key_column}], [{value_column}] FROM [{table_name}]"
+        if first_where:
+            first_sql += f" WHERE {first_where}"
+        first_sql += f" ORDER BY [{key_column}] LIMIT ?;"
+        next_sql = f"SELECT [{key_column}], [{value_column}] FROM [{table_name}] WHERE {where} ORDER BY [{key_column}] LIMIT ?;"
+        
+        last_key = after_key
+        while True:
+            # 每一批单独查询，不在两批之间持有读事务
+            with self.pool.reader() as conn:
+                if last_key is None:
+                    rows = conn.execute(first_sql, (*params, batch)).fetchall()
+                else:
+                    rows = conn.execute(next_sql, (*params, last_key, batch)).fetchall()
+                    
+            for row in rows:
+                yield row[0], row[1]
+                
+            if len(rows) < batch:
+                return
+            last_key = rows[-1][0]
+            
+    def search_keys(self, keyword, table_name="ItemTable", key_column="key", value_column="value", limit=100, use_index=True):
+        """搜索键和值
+        
+        全文索引可用时在索引中搜索键和解析后的JSON值，
+        双引号括起的部分按短语匹配，其余每个词按前缀匹配，
+        键中包含整个关键字的行同样返回，与LIKE查询一致。
+        索引不可用时退回对键的LIKE查询。
         
         Args:
             keyword: 关键字
@@ -287,9 +365,10 @@ class DbManager:
             key_column: 键列名，默认为key
             value_column: 值列名，默认为value
             limit: 限制返回的行数
+            use_index: 是否使用全文索引
             
         Returns:
-            dict: 搜索结果
+            dict: 搜索结果，JSON形式的值为LazyJsonValue
         """
         if not self.db_path or not os.path.exists(self.db_path):
             return {
@@ -299,47 +378,29 @@ class DbManager:
                 "total": 0
             }
             
-        try:
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 搜索键
-            cursor.execute(f"SELECT [{key_column}], [{value_column}] FROM [{table_name}] WHERE [{key_column}] LIKE ? LIMIT {limit};", (f"%{keyword}%",))
-            rows = cursor.fetchall()
-            
-            if not rows:
-                conn.close()
-                return {
-                    "status": "正常",
-                    "message": "没有找到匹配的数据",
-                    "data": {},
-                    "total": 0
-                }
-                
-            # 转换数据为字典
-            data = {}
-            for row in rows:
-                key = row[0]
-                value = row[1]
-                
-                # 尝试解析JSON字符串
-                if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
-                    try:
-                        value = json.loads(value)
-                    except:
-                        pass
-                        
-                data[key] = value
+        if use_index:
+            try:
+                rows = self._search_index(keyword, table_name, key_column, value_column, limit)
+            except sqlite3.Error as e:
+                # 索引损坏或查询语法不受支持时退回LIKE查询
+                self.logger.warning(f"全文索引搜索失败，改用LIKE查询: {e}", "DbManager")
+                rows = None
+            if rows is not None:
+                return self._search_result(rows)
                 
-            conn.close()
-            
-            return {
-                "status": "正常",
-                "message": f"成功找到{len(data)}条匹配数据",
-                "data": data,
-                "total": len(data)
-            }
+        try:
+            # 按键顺序分批搜索，取到足够的条数即停止
+            rows = list(islice(
+                self.iter_key_values(
+                    batch=min(limit, 500),
+                    table_name=table_name,
+                    key_column=key_column,
+                    value_column=value_column,
+                    keyword=keyword
+                ),
+                limit
+            ))
+            return self._search_result(rows)
             
         except Exception as e:
             self.logger.error(f"搜索键失败: {e}", "DbManager")
@@ -350,6 +411,91 @@ class DbManager:
                 "total": 0
             }
             
+    def _search_result(self, rows):
+        """将搜索到的行转换为搜索结果
+        
+        Args:
+            rows: (键, 值) 列表
+            
+        Returns:
+            dict: 搜索结果
+        """
+        if not rows:
+            return {
+                "status": "正常",
+                "message": "没有找到匹配的数据",
+                "data": {},
+                "total": 0
+            }
+            
+        # 转换数据为字典
+        data = {}
+        for row in rows:
+            key = row[0]
+            
+            # JSON字符串包装为延迟解析值，需要时再解析
+            data[key] = wrap_value(key, row[1])
+            
+        return {
+            "status": "正常",
+            "message": f"成功找到{len(data)}条匹配数据",
+            "data": data,
+            "total": len(data)
+        }
+        
+    def _search_index(self, keyword, table_name, key_column, value_column, limit):
+        """在全文索引中搜索，索引过期时先增量更新
+        
+        Args:
+            keyword: 查询文本
+            table_name: 表名
+            key_column: 键列名
+            value_column: 值列名
+            limit: 限制返回的行数
+            
+        Returns:
+            list: 按键排序的 (键, 值) 列表，索引不可用或查询中没有可匹配的词时为None
+        """
+        with self._index_lock:
+            if self.search_index is None:
+                try:
+                    self.search_index = KeyValueSearchIndex()
+                except (OSError, sqlite3.Error) as e:
+                    self.logger.warning(f"创建全文索引失败: {e}", "DbManager")
+                    return None
+                if not self.search_index.available:
+                    self.logger.warning("SQLite不支持FTS5，搜索将使用LIKE查询", "DbManager")
+            if not self.search_index.available:
+                return None
+            # 查询中没有可按词匹配的内容时交给LIKE查询
+            if not self.search_index.build_match_query(keyword):
+                return None
+                
+            # 只有源数据库变化时才重新扫描，并且只重建发生变化的键
+            if self.search_index.is_stale(self.db_path, table_name):
+                stats = self.search_index.refresh(
+                    self.db_path,
+                    self.iter_key_values(table_name=table_name, key_column=key_column, value_column=value_column),
+                    table_name
+                )
+                self.logger.info(
+                    f"更新全文索引: 新增 {stats['added']} 个键, 更新 {stats['updated']} 个键, 删除 {stats['removed']} 个键",
+                    "DbManager"
+                )
+                
+        keys = self.search_index.search(self.db_path, keyword, table_name, limit)
+        if not keys:
+            return []
+            
+        # 按索引返回的键顺序从源数据库取值
+        with self.pool.reader() as conn:
+            placeholders = ", ".join("?" * len(keys))
+            values = dict(conn.execute(
+                f"SELECT [{key_column}], [{value_column}] FROM [{table_name}] WHERE [{key_column}] IN ({placeholders});",
+                keys
+            ).fetchall())
+        return [(key, values[key]) for key in keys if key in values]
+        
     def set_key_value(self, key, value, table_name="ItemTable", key_column="key", value_column="value"):
         """设置键值对
         
@@ -370,29 +516,21 @@ class DbManager:
             }
             
         try:
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # 如果值是字典或列表，转换为JSON字符串
             if isinstance(value, (dict, list)):
                 value = json.dumps(value, ensure_ascii=False)
                 
-            # 查询键是否存在
-            cursor.execute(f"SELECT COUNT(*) FROM [{table_name}] WHERE [{key_column}] = ?;", (key,))
-            exists = cursor.fetchone()[0] > 0
-            
-            if exists:
-                # 更新现有键值对
-                cursor.execute(f"UPDATE [{table_name}] SET [{value_column}] = ? WHERE [{key_column}] = ?;", (value, key))
-                message = f"成功更新键 '{key}' 的值"
-            else:
-                # 插入新键值对
-                cursor.execute(f"INSERT INTO [{table_name}] ([{key_column}], [{value_column}]) VALUES (?, ?);", (key, value))
-                message = f"成功添加新键值对 '{key}'"
+            # 使用连接池中的写连接，退出时自动提交
+            with self.pool.writer() as conn:
+                cursor = conn.cursor()
                 
-            conn.commit()
-            conn.close()
+                # 先尝试更新，没有更新到任何行时再插入，省去单独的存在性查询
+                cursor.execute(f"UPDATE [{table_name}] SET [{value_column}] = ? WHERE [{key_column}] = ?;", (value, key))
+                if cursor.rowcount > 0:
+                    message = f"成功更新键 '{key}' 的值"
+                else:
+                    cursor.execute(f"INSERT INTO [{table_name}] ([{key_column}], [{value_column}]) VALUES (?, ?);", (key, value))
+                    message = f"成功添加新键值对 '{key}'"
             
             self.logger.info(message, "DbManager")
             return {
@@ -425,25 +563,19 @@ class DbManager:
             }
             
         try:
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 查询键是否存在
-            cursor.execute(f"SELECT COUNT(*) FROM [{table_name}] WHERE [{key_column}] = ?;", (key,))
-            exists = cursor.fetchone()[0] > 0
-            
+            # 使用连接池中的写连接，退出时自动提交
+            with self.pool.writer() as conn:
+                cursor = conn.cursor()
+                
+                # 删除键，根据受影响的行数判断键是否存在
+                cursor.execute(f"DELETE FROM [{table_name}] WHERE [{key_column}] = ?;", (key,))
+                exists = cursor.rowcount > 0
+                
             if not exists:
-                conn.close()
                 return {
                     "status": "错误",
                     "message": f"键 '{key}' 不存在"
                 }
-                
-            # 删除键
-            cursor.execute(f"DELETE FROM [{table_name}] WHERE [{key_column}] = ?;", (key,))
-            conn.commit()
-            conn.close()
             
             self.logger.info(f"成功删除键 '{key}'", "DbManager")
             return {
@@ -474,14 +606,10 @@ class DbManager:
             }
             
         try:
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 清空表
-            cursor.execute(f"DELETE FROM [{table_name}];")
-            conn.commit()
-            conn.close()
+            # 使用连接池中的写连接，退出时自动提交
+            with self.pool.writer() as conn:
+                # 清空表
+                conn.execute(f"DELETE FROM [{table_name}];")
             
             self.logger.info(f"成功清空表 '{table_name}'", "DbManager")
             return {
@@ -496,14 +624,18 @@ class DbManager:
                 "message": f"清空表失败: {str(e)}"
             }
             
-    def backup_database(self, backup_path=None):
-        """备份数据库
+    def backup_database(self, backup_path=None, compression=None, progress_callback=None):
+        """在线备份数据库
+        
+        使用SQLite备份API分步复制，Cursor正在写入时也能得到一致的备份。
         
         Args:
             backup_path: 备份文件路径，如果为None则使用默认路径
+            compression: 压缩格式，gzip、zstd或None，压缩时会自动补上对应后缀
+            progress_callback: 进度回调，参数为 (已复制页数, 总页数)
             
         Returns:
-            dict: 操作结果
+            dict: 操作结果，成功时包含备份路径backup_path和备份统计信息stats
         """
         if not self.db_path or not os.path.exists(self.db_path):
             return {
@@ -518,15 +650,16 @@ class DbManager:
                 os.makedirs(backup_dir, exist_ok=True)
                 backup_path = os.path.join(backup_dir, f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
                 
-            # 复制数据库文件
-            import shutil
-            shutil.copy2(self.db_path, backup_path)
+            # 分步复制数据库页面，不会长时间持有数据库锁
+            stats = backup_engine.backup(self.db_path, backup_path, compression, progress_callback)
+            backup_path = stats["dest_path"]
             
             self.logger.info(f"成功备份数据库到 '{backup_path}'", "DbManager")
             return {
                 "status": "正常",
-                "message": f"成功备份数据库到 '{backup_path}'",
-                "backup_path": backup_path
+                "message": f"成功备份数据库到 '{backup_path}' ({stats['duration']:.2f}秒)",
+                "backup_path": backup_path,
+                "stats": stats
             }
             
         except Exception as e:
@@ -540,7 +673,7 @@ class DbManager:
         """从备份还原数据库
         
         Args:
-            backup_path: 备份文件路径
+            backup_path: 备份文件路径，支持gzip和zstd压缩的备份
             
         Returns:
             dict: 操作结果
@@ -558,16 +691,11 @@ class DbManager:
             }
             
         try:
-            # 确保数据库文件关闭
-            try:
-                conn = sqlite3.connect(self.db_path)
-                conn.close()
-            except:
-                pass
+            # 确保连接池中的数据库连接全部关闭，下次使用时重新打开
+            self.pool.close()
                 
-            # 复制备份文件到数据库文件
-            import shutil
-            shutil.copy2(backup_path, self.db_path)
+            # 通过备份API写回数据库，不直接覆盖可能带有WAL文件的数据库文件
+            backup_engine.restore(backup_path, self.db_path)
             
             self.logger.info(f"成功从 '{backup_path}' 还原数据库", "DbManager")
             return {
@@ -582,7 +710,7 @@ class DbManager:
                 "message": f"还原数据库失败: {str(e)}"
             }
             
-    def export_to_json(self, export_path=None, table_name="ItemTable", key_column="key", value_column="value"):
+    def export_to_json(self, export_path=None, table_name="ItemTable", key_column="key", value_column="value", progress_callback=None):
         """导出表数据到JSON文件
         
         Args:
@@ -590,6 +718,7 @@ class DbManager:
             table_name: 表名，默认为ItemTable
             key_column: 键列名，默认为key
             value_column: 值列名，默认为value
+            progress_callback: 进度回调，每导出一批数据调用一次，参数为已导出的条数
             
         Returns:
             dict: 操作结果
@@ -607,40 +736,67 @@ class DbManager:
                 os.makedirs(export_dir, exist_ok=True)
                 export_path = os.path.join(export_dir, f"{table_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
                 
-            # 获取键值对数据
-            result = self.get_key_value_pairs(table_name, key_column, value_column, limit=100000)
-            if result["status"] != "正常":
-                return result
-                
-            # 导出到JSON文件
-            with open(export_path, "w", encoding="utf-8") as f:
-                json.dump(result["data"], f, ensure_ascii=False, indent=4)
+            # 分批读取键值对并逐条写入临时文件，输出格式与json.dump(..., indent=4)一致，
+            # 全部写完后才替换目标文件，取消或失败时不会留下不完整的文件
+            count = 0
+            directory = os.path.dirname(os.path.abspath(export_path))
+            fd, temp_path = tempfile.mkstemp(prefix=os.path.basename(export_path) + ".", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write("{")
+                    for key, value in self.iter_key_values(table_name=table_name, key_column=key_column, value_column=value_column):
+                        # 尝试解析JSON字符串，导出时每个值只用一次，不经过解析缓存
+                        if looks_like_json(value):
+                            try:
+                                value = json.loads(value)
+                            except:
+                                pass
+                        elif isinstance(value, bytes):
+                            value = value.decode("utf-8", errors="replace")
+                            
+                        item = json.dumps(value, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+                        f.write("," if count else "")
+                        f.write(f"\n    {json.dumps(key, ensure_ascii=False)}: {item}")
+                        count += 1
+                        if progress_callback and count % 500 == 0:
+                            progress_callback(count)
+                    f.write("\n}" if count else "}")
+                os.replace(temp_path, export_path)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
                 
-            self.logger.info(f"成功导出表 '{table_name}' 数据到 '{export_path}'", "DbManager")
+            self.logger.info(f"成功导出表 '{table_name}' 的 {count} 条数据到 '{export_path}'", "DbManager")
             return {
                 "status": "正常",
-                "message": f"成功导出表 '{table_name}' 数据到 '{export_path}'",
-                "export_path": export_path
+                "message": f"成功导出表 '{table_name}' 的 {count} 条数据到 '{export_path}'",
+                "export_path": export_path,
+                "count": count
             }
             
-        except Exception as e:
+        except (OSError, sqlite3.Error, ValueError, TypeError) as e:
+            # 进度回调抛出的取消异常不在此处理，交给调用方
             self.logger.error(f"导出到JSON失败: {e}", "DbManager")
             return {
                 "status": "错误",
                 "message": f"导出到JSON失败: {str(e)}"
             }
             
-    def import_from_json(self, import_path, table_name="ItemTable", key_column="key", value_column="value"):
+    def import_from_json(self, import_path, table_name="ItemTable", key_column="key", value_column="value", progress_callback=None):
         """从JSON文件导入数据到表
         
+        流式读取JSON文件，边解析边写入，所有数据在同一个事务中导入。
+        
         Args:
             import_path: 导入文件路径
             table_name: 表名，默认为ItemTable
             key_column: 键列名，默认为key
             value_column: 值列名，默认为value
+            progress_callback: 进度回调，每导入一批数据调用一次，参数为 (已导入条数, 总条数)，总条数未知时为0
             
         Returns:
-            dict: 操作结果
+            dict: 操作结果，成功时包含导入条数count和每秒导入条数rows_per_sec
         """
         if not import_path or not os.path.exists(import_path):
             return {
@@ -655,44 +811,20 @@ class DbManager:
             }
             
         try:
-            # 从JSON文件导入数据
             with open(import_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                stats = self.bulk_upsert(
+                    iter_json_object_items(f), table_name, key_column, value_column,
+                    progress_callback=progress_callback
+                )
                 
-            if not isinstance(data, dict):
-                return {
-                    "status": "错误",
-                    "message": "导入文件格式不正确，应为JSON对象"
-                }
-                
-            # 连接数据库
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # 导入数据
-            for key, value in data.items():
-                # 如果值是字典或列表，转换为JSON字符串
-                if isinstance(value, (dict, list)):
-                    value = json.dumps(value, ensure_ascii=False)
-                    
-                # 查询键是否存在
-                cursor.execute(f"SELECT COUNT(*) FROM [{table_name}] WHERE [{key_column}] = ?;", (key,))
-                exists = cursor.fetchone()[0] > 0
-                
-                if exists:
-                    # 更新现有键值对
-                    cursor.execute(f"UPDATE [{table_name}] SET [{value_column}] = ? WHERE [{key_column}] = ?;", (value, key))
-                else:
-                    # 插入新键值对
-                    cursor.execute(f"INSERT INTO [{table_name}] ([{key_column}], [{value_column}]) VALUES (?, ?);", (key, value))
-                    
-            conn.commit()
-            conn.close()
-            
-            self.logger.info(f"成功从 '{import_path}' 导入 {len(data)} 条数据到表 '{table_name}'", "DbManager")
+            message = (f"成功从 '{import_path}' 导入 {stats['count']} 条数据到表 '{table_name}'"
+                       f"（{stats['elapsed']:.2f}秒，{stats['rows_per_sec']:.0f}条/秒）")
+            self.logger.info(message, "DbManager")
             return {
                 "status": "正常",
-                "message": f"成功从 '{import_path}' 导入 {len(data)} 条数据到表 '{table_name}'"
+                "message": message,
+                "count": stats["count"],
+                "rows_per_sec": stats["rows_per_sec"]
             }
             
         except Exception as e:
@@ -700,4 +832,135 @@ class DbManager:
             return {
                 "status": "错误",
                 "message": f"从JSON导入失败: {str(e)}"
-            } 
\ No newline at end of file
+            }
+            
+    def bulk_upsert(self, items, table_name="ItemTable", key_column="key", value_column="value", batch=1000, progress_callback=None):
+        """批量写入键值对，已存在的键更新值，不存在的键插入
+        
+        所有数据在一个显式事务中写入，任一批失败时整体回滚。
+        键列有唯一约束且SQLite支持UPSERT时使用 INSERT ... ON CONFLICT DO UPDATE 配合executemany，
+        否则逐条先更新再插入。
+        
+        Args:
+            items: 产出 (键, 值) 的可迭代对象，字典或列表值会转换为JSON字符串
+            table_name: 表名，默认为ItemTable
+            key_column: 键列名，默认为key
+            value_column: 值列名，默认为value
+            batch: 每批写入的行数
+            progress_callback: 进度回调，每写入一批调用一次，参数为 (已写入条数, 0)
+            
+        Returns:
+            dict: 写入条数count、耗时elapsed（秒）、每秒写入条数rows_per_sec和是否使用了UPSERT
+            
+        Raises:
+            sqlite3.Error: 写入失败
+        """
+        started = time.perf_counter()
+        count = 0
+        
+        with self.pool.writer() as conn:
+            conn.execute("BEGIN IMMEDIATE;")
+            use_upsert = self._supports_upsert(conn, table_name, key_column)
+            if use_upsert:
+                write_rows = self._upsert_rows
+            else:
+                write_rows = self._update_or_insert_rows
+                
+            for rows in self._iter_value_batches(items, batch):
+                write_rows(conn, rows, table_name, key_column, value_column)
+                count += len(rows)
+                if progress_callback:
+                    progress_callback(count, 0)
+                    
+        elapsed = time.perf_counter() - started
+        return {
+            "count": count,
+            "elapsed": elapsed,
+            "rows_per_sec": count / elapsed if elapsed > 0 else 0.0,
+            "upsert": use_upsert
+        }
+        
+    @staticmethod
+    def _iter_value_batches(items, batch):
+        """将键值对按批分组，并把字典或列表值转换为JSON字符串
+        
+        Args:
+            items: 产出 (键, 值) 的可迭代对象
+            batch: 每批的行数
+            
+        Yields:
+            list: (值, 键) 列表，顺序与SQL参数一致
+        """
+        rows = []
+        for key, value in items:
+            if isinstance(value, (dict, list)):
+                value = json.dumps(value, ensure_ascii=False)
+            rows.append((value, key))
+            if len(rows) >= batch:
+                yield rows
+                rows = []
+        if rows:
+            yield rows
+            
+    @staticmethod
+    def _supports_upsert(conn, table_name, key_column):
+        """判断是否可以对表使用 ON CONFLICT DO UPDATE
+        
+        Args:
+            conn: 数据库连接
+            table_name: 表名
+            key_column: 键列名
+            
+        Returns:
+            bool: SQLite版本不低于3.24且键列单独具有主键或唯一约束时返回True
+        """
+        if sqlite3.sqlite_version_info < (3, 24, 0):
+            return False
+            
+        # 键列是唯一的主键列
+        pk_columns = [row[1] for row in conn.execute(f"PRAGMA table_info([{table_name}]);") if row[5]]
+        if pk_columns == [key_column]:
+            return True
+            
+        # 键列上有非部分的唯一索引
+        for _, index_name, unique, _, partial in conn.execute(f"PRAGMA index_list([{table_name}]);"):
+            if not unique or partial:
+                continue
+            columns = [row[2] for row in conn.execute(f"PRAGMA index_info([{index_name}]);")]
+            if columns == [key_column]:
+                return True
+        return False
+        
+    @staticmethod
+    def _upsert_rows(conn, rows, table_name, key_column, value_column):
+        """使用UPSERT批量写入一批数据
+        
+        Args:
+            conn: 数据库连接
+            rows: (值, 键) 列表
+            table_name: 表名
+            key_column: 键列名
+            value_column: 值列名
+        """
+        conn.executemany(
+            f"INSERT INTO [{table_name}] ([{value_column}], [{key_column}]) VALUES (?, ?) "
+            f"ON CONFLICT([{key_column}]) DO UPDATE SET [{value_column}] = excluded.[{value_column}];",
+            rows
+        )
+        
+    @staticmethod
+    def _update_or_insert_rows(conn, rows, table_name, key_column, value_column):
+        """键列没有唯一约束时逐条先更新，未更新到任何行时再插入
+        
+        Args:
+            conn: 数据库连接
+            rows: (值, 键) 列表
+            table_name: 表名
+            key_column: 键列名
+            value_column: 值列名
+        """
+        update_sql = f"UPDATE [{table_name}] SET [{value_column}] = ? WHERE [{key_column}] = ?;"
+        insert_sql = f"INSERT INTO [{table_name}] ([{value_column}], [{key_column}]) VALUES (?, ?);"
+        for row in rows:
+            if conn.execute(update_sql, row).rowcount == 0:
+                conn.execute(insert_sql, row)
@@ -0,0 +1,206 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SqliteConnectionPool:
+    """SQLite连接池
+    
+    每个线程持有一个长期存在的只读连接，所有写操作共享同一个写连接。
+    切换数据库文件时写连接立即关闭，只读连接标记为过期，
+    由持有它的线程在下次使用时关闭并重新打开，不会关闭其他线程正在使用的连接。
+    已结束的线程留下的只读连接在创建新的只读连接时关闭。
+    """
+    
+    def __init__(self, db_path=None, timeout=5.0):
+        """初始化连接池
+        
+        Args:
+            db_path: 数据库文件路径
+            timeout: 连接等待数据库锁的超时时间（秒）
+        """
+        self.timeout = timeout
+        self.db_path = None
+        
+        # 保护连接列表和统计信息
+        self._lock = threading.Lock()
+        # 写连接同一时间只允许一个线程使用，需要同时持有两把锁时先取该锁
+        self._write_lock = threading.RLock()
+        # 每个线程的只读连接
+        self._local = threading.local()
+        # 线程标识 -> (线程, 只读连接)，用于关闭已结束线程留下的连接
+        self._readers = {}
+        self._writer = None
+        # 每次切换数据库时递增，线程持有的旧连接会因此失效
+        self._generation = 0
+        
+        self._stats = {
+            "reader_hits": 0,
+            "reader_misses": 0,
+            "writer_hits": 0,
+            "writer_misses": 0,
+            "reopens": 0
+        }
+        
+        if db_path:
+            self.open(db_path)
+            
+    def open(self, db_path):
+        """切换到指定的数据库文件
+        
+        路径与当前相同时不做任何操作，已有连接继续复用。
+        
+        Args:
+            db_path: 数据库文件路径
+        """
+        with self._write_lock, self._lock:
+            if db_path == self.db_path:
+                return
+            if self.db_path is not None:
+                self._stats["reopens"] += 1
+            self._close_all_locked()
+            self.db_path = db_path
+            
+    def close(self):
+        """关闭当前线程的只读连接和写连接，其他线程的只读连接在下次使用时重新打开"""
+        with self._write_lock, self._lock:
+            self._close_all_locked()
+            
+    def _close_all_locked(self):
+        """使所有连接失效（调用方需先后持有self._write_lock和self._lock）
+        
+        其他线程的只读连接可能正在使用，只递增代数，由各线程自己关闭。
+        """
+        self._generation += 1
+        entry = self._readers.pop(threading.get_ident(), None)
+        if entry is not None:
+            self._close_quietly(entry[1])
+        self._local.conn = None
+        self._prune_readers_locked()
+        
+        if self._writer is not None:
+            self._close_quietly(self._writer)
+            self._writer = None
+            
+    def _prune_readers_locked(self):
+        """关闭已结束线程留下的只读连接（调用方需持有self._lock）"""
+        for ident, (thread, conn) in list(self._readers.items()):
+            if not thread.is_alive():
+                del self._readers[ident]
+                self._close_quietly(conn)
+                
+    @staticmethod
+    def _close_quietly(conn):
+        """关闭连接，忽略关闭时的错误
+        
+        Args:
+            conn: 数据库连接
+        """
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+            
+    def _connect_readonly(self):
+        """以只读方式打开数据库，只读模式不可用时退回普通连接
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        uri = Path(os.path.abspath(self.db_path)).as_uri() + "?mode=ro"
+        try:
+            return sqlite3.connect(uri, uri=True, timeout=self.timeout, check_same_thread=False)
+        except sqlite3.OperationalError:
+            return sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+            
+    def _get_reader(self):
+        """获取当前线程的只读连接
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is not None and local.generation == self._generation:
+            with self._lock:
+                self._stats["reader_hits"] += 1
+            return conn
+            
+        if conn is not None:
+            # 数据库已切换，由本线程关闭自己的旧连接
+            with self._lock:
+                self._readers.pop(threading.get_ident(), None)
+            self._close_quietly(conn)
+            local.conn = None
+            
+        if not self.db_path:
+            raise sqlite3.OperationalError("未设置数据库路径")
+            
+        conn = self._connect_readonly()
+        with self._lock:
+            self._stats["reader_misses"] += 1
+            self._prune_readers_locked()
+            self._readers[threading.get_ident()] = (threading.current_thread(), conn)
+            local.conn = conn
+            local.generation = self._generation
+        return conn
+        
+    def _get_writer(self):
+        """获取共享的写连接（调用方需持有self._write_lock）
+        
+        Returns:
+            sqlite3.Connection: 数据库连接
+        """
+        if self._writer is not None:
+            with self._lock:
+                self._stats["writer_hits"] += 1
+            return self._writer
+            
+        if not self.db_path:
+            raise sqlite3.OperationalError("未设置数据库路径")
+            
+        self._writer = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        with self._lock:
+            self._stats["writer_misses"] += 1
+        return self._writer
+        
+    @contextmanager
+    def reader(self):
+        """获取只读连接的上下文管理器
+        
+        Yields:
+            sqlite3.Connection: 当前线程的只读连接
+        """
+        yield self._get_reader()
+        
+    @contextmanager
+    def writer(self):
+        """获取写连接的上下文管理器，正常退出时提交，异常时回滚
+        
+        Yields:
+            sqlite3.Connection: 共享的写连接
+        """
+        with self._write_lock:
+            conn = self._get_writer()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+                
+    def get_stats(self):
+        """获取连接池统计信息
+        
+        Returns:
+            dict: 命中/未命中次数、重新打开次数及当前打开的连接数
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open_readers"] = len(self._readers)
+            stats["writer_open"] = self._writer is not None
+        total = stats["reader_hits"] + stats["reader_misses"]
+        stats["reader_hit_rate"] = stats["reader_hits"] / total if total else 0.0
+        return stats
@@ -0,0 +1,417 @@
+import os
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+from utils.logger import LoggerManager
+
+
+class _WatchedDb:
+    """单个被监视数据库的状态"""
+    
+    def __init__(self, db_path, table_name):
+        self.db_path = db_path
+        self.table_name = table_name
+        # 调用watch的次数，全部取消后才停止监视
+        self.refcount = 0
+        # 监视连接，data_version只在同一个连接上有意义
+        self.conn = None
+        # 保护监视连接，扫描在工作线程中进行
+        self.lock = threading.Lock()
+        # 键 -> (rowid, 值长度, 小值或大值首尾的摘要)
+        self.snapshot = None
+        # 大值的键 -> 完整值的摘要
+        self.large_digests = {}
+        self.data_version = None
+        self.fingerprint = None
+        # 是否有扫描正在进行，以及扫描期间是否又收到了变化通知
+        self.scanning = False
+        self.pending = False
+
+
+class DbWatcher(QObject):
+    """Cursor数据库变化监视器
+    
+    通过QFileSystemWatcher监视数据库文件、WAL文件及其所在目录，
+    文件事件经过防抖后在工作线程中检查 PRAGMA data_version，
+    确认有其他连接提交了修改时才扫描表并与上次的快照比较，只通知真正变化的键。
+    
+    扫描时每行只比较rowid和值的长度，不超过SMALL_VALUE的值在SQL中一并取出并计算摘要，
+    较大的值只取首尾各EDGE_LENGTH个字符计算摘要，rowid、长度或首尾变化时才按rowid读取完整值，
+    避免每次提交都读取整张表的全部内容。data_version变化而这些都没有变化时，
+    大值可能在中间被原地UPDATE，此时再读取全部大值与上次的完整摘要比较。
+    """
+    
+    # 数据库变化信号，参数为 (数据库路径, 变化内容)
+    # 变化内容为字典: table, added {键: 值}, modified {键: 值}, removed [键]
+    changed = pyqtSignal(str, object)
+    
+    # 工作线程扫描完成的内部信号，参数为 (数据库状态, 变化内容, 是否扫描了表)
+    _scan_finished = pyqtSignal(object, object, bool)
+    
+    # 在扫描时直接取出并计算摘要的值的最大长度
+    SMALL_VALUE = 256
+    # 较大的值参与快速比较的首尾长度
+    EDGE_LENGTH = 64
+    
+    # 单例模式
+    _instance = None
+    
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(DbWatcher, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+        
+    def __init__(self, debounce_ms=500):
+        """初始化数据库变化监视器
+        
+        Args:
+            debounce_ms: 文件事件的防抖时间（毫秒）
+        """
+        if self._initialized:
+            return
+        super().__init__()
+        
+        self.logger = LoggerManager()
+        # 数据库路径 -> _WatchedDb
+        self._watched = {}
+        
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.fileChanged.connect(self._on_fs_event)
+        self._fs_watcher.directoryChanged.connect(self._on_fs_event)
+        
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.check_now)
+        
+        self._scan_finished.connect(self._on_scan_finished)
+        
+        self._stats = {"events": 0, "checks": 0, "scans": 0, "changes": 0}
+        self._initialized = True
+        
+    def watch(self, db_path, table_name="ItemTable"):
+        """开始监视数据库
+        
+        同一个数据库可以被多个调用方监视，每次watch都需要对应一次unwatch。
+        
+        Args:
+            db_path: 数据库文件路径
+            table_name: 需要比较键变化的表名
+        """
+        if not db_path:
+            return
+        db_path = os.path.abspath(db_path)
+        state = self._watched.get(db_path)
+        if state is None:
+            state = _WatchedDb(db_path, table_name)
+            self._watched[db_path] = state
+            self._add_fs_paths(state)
+            # 建立初始快照，不发出变化通知
+            self._start_scan(state)
+        state.refcount += 1
+        
+    def unwatch(self, db_path):
+        """停止监视数据库
+        
+        Args:
+            db_path: 数据库文件路径
+        """
+        if not db_path:
+            return
+        db_path = os.path.abspath(db_path)
+        state = self._watched.get(db_path)
+        if state is None:
+            return
+        state.refcount -= 1
+        if state.refcount > 0:
+            return
+            
+        del self._watched[db_path]
+        paths = [p for p in (db_path, db_path + "-wal") if p in self._fs_watcher.files()]
+        if paths:
+            self._fs_watcher.removePaths(paths)
+        # 其他被监视的数据库不在同一目录时才移除目录监视
+        directory = os.path.dirname(db_path)
+        if not any(os.path.dirname(p) == directory for p in self._watched):
+            if directory in self._fs_watcher.directories():
+                self._fs_watcher.removePath(directory)
+        with state.lock:
+            self._close_conn(state)
+            
+    def is_watching(self, db_path):
+        """是否正在监视数据库
+        
+        Args:
+            db_path: 数据库文件路径
+            
+        Returns:
+            bool: 是否正在监视
+        """
+        return bool(db_path) and os.path.abspath(db_path) in self._watched
+        
+    def check_now(self):
+        """立即检查所有被监视的数据库"""
+        for state in list(self._watched.values()):
+            self._start_scan(state)
+            
+    def get_stats(self):
+        """获取监视统计信息
+        
+        Returns:
+            dict: 文件事件、检查、扫描和确认变化的次数
+        """
+        stats = dict(self._stats)
+        stats["watched"] = len(self._watched)
+        return stats
+        
+    def _add_fs_paths(self, state):
+        """将数据库文件、WAL文件和所在目录加入文件监视
+        
+        目录监视用于发现WAL文件的创建以及数据库文件被替换。
+        
+        Args:
+            state: 数据库状态
+        """
+        existing = set(self._fs_watcher.files()) | set(self._fs_watcher.directories())
+        paths = [p for p in (state.db_path, state.db_path + "-wal", os.path.dirname(state.db_path))
+                 if p not in existing and os.path.exists(p)]
+        if paths:
+            self._fs_watcher.addPaths(paths)
+            
+    def _on_fs_event(self, path):
+        """文件或目录变化，重新开始防抖计时"""
+        self._stats["events"] += 1
+        self._debounce.start()
+        
+    def _start_scan(self, state):
+        """在工作线程中检查数据库是否变化
+        
+        Args:
+            state: 数据库状态
+        """
+        if state.scanning:
+            state.pending = True
+            return
+        state.scanning = True
+        state.pending = False
+        self._stats["checks"] += 1
+        thread = threading.Thread(target=self._scan, args=(state,), daemon=True)
+        thread.start()
+        
+    def _scan(self, state):
+        """检查data_version和文件状态，有变化时扫描表并计算变化的键（在工作线程中执行）
+        
+        Args:
+            state: 数据库状态
+        """
+        diff = None
+        scanned = False
+        try:
+            with state.lock:
+                fingerprint = self._fingerprint(state.db_path)
+                if fingerprint is None:
+                    self._close_conn(state)
+                else:
+                    # 数据库文件被替换后旧连接看不到新文件，需要重新打开
+                    if state.fingerprint is not None and fingerprint[0] != state.fingerprint[0]:
+                        self._close_conn(state)
+                    if state.conn is None:
+                        uri = Path(state.db_path).as_uri() + "?mode=ro"
+                        state.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                        state.data_version = None
+                    version = state.conn.execute("PRAGMA data_version;").fetchone()[0]
+                    
+                    # 其他连接提交修改后data_version才会变化，检查点等操作不会触发扫描
+                    if version != state.data_version:
+                        diff = self._diff_snapshot(state)
+                        scanned = True
+                        state.data_version = version
+                    state.fingerprint = fingerprint
+        except sqlite3.Error as e:
+            self.logger.warning(f"检查数据库变化失败: {e}", "DbWatcher")
+        self._scan_finished.emit(state, diff, scanned)
+        
+    def _diff_snapshot(self, state):
+        """扫描表并与上次的快照比较（调用方需持有state.lock）
+        
+        Args:
+            state: 数据库状态
+            
+        Returns:
+            dict: 变化内容，第一次扫描时为None
+        """
+        previous = state.snapshot
+        snapshot = {}
+        added = {}
+        modified = {}
+        # 需要按rowid读取完整值的大值: 键 -> rowid
+        large = {}
+        
+        try:
+            rows = state.conn.execute(
+                f"SELECT key, rowid, length(value), "
+                f"CASE WHEN length(value) <= ?1 THEN value END, "
+                f"CASE WHEN length(value) > ?1 THEN substr(value, 1, ?2) END, "
+                f"CASE WHEN length(value) > ?1 THEN substr(value, -?2) END "
+                f"FROM [{state.table_name}];",
+                (self.SMALL_VALUE, self.EDGE_LENGTH)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # 表不存在时只通知数据库发生了变化
+            rows = []
+            
+        for key, rowid, length, value, head, tail in rows:
+            if value is not None:
+                digest = self._digest(value)
+            elif head is not None:
+                digest = self._digest(head) + self._digest(tail)
+            else:
+                digest = None
+            fingerprint = (rowid, length, digest)
+            snapshot[key] = fingerprint
+            if head is None:
+                state.large_digests.pop(key, None)
+                
+            if previous is not None:
+                old = previous.pop(key, None)
+                if old is None:
+                    target = added
+                elif old != fingerprint:
+                    target = modified
+                else:
+                    continue
+                target[key] = value
+                if head is not None:
+                    large[key] = rowid
+                    
+        state.snapshot = snapshot
+        if previous is None:
+            # 第一次扫描时记录大值的完整摘要，供之后找不到变化时比较
+            state.large_digests = {
+                key: self._digest(value) for key, value in self._iter_large_values(state)
+            }
+            return None
+            
+        for key, rowid in large.items():
+            row = state.conn.execute(
+                f"SELECT value FROM [{state.table_name}] WHERE rowid = ?;", (rowid,)
+            ).fetchone()
+            value = row[0] if row is not None else None
+            target = added if key in added else modified
+            target[key] = value
+            state.large_digests[key] = self._digest(value)
+        for key in previous:
+            state.large_digests.pop(key, None)
+            
+        if not added and not modified and not previous:
+            # 有其他连接提交了修改却没有发现变化，可能是大值中间的内容被原地UPDATE，
+            # 此时才重新计算大值的完整摘要
+            for key, value in self._iter_large_values(state):
+                digest = self._digest(value)
+                if state.large_digests.get(key) != digest:
+                    state.large_digests[key] = digest
+                    modified[key] = value
+                    
+        return {
+            "table": state.table_name,
+            "added": added,
+            "modified": modified,
+            # 上次快照中剩下的键已被删除
+            "removed": sorted(previous)
+        }
+        
+    def _iter_large_values(self, state):
+        """逐行读取超过SMALL_VALUE的值（调用方需持有state.lock）
+        
+        Args:
+            state: 数据库状态
+            
+        Yields:
+            tuple: (键, 值)
+        """
+        try:
+            yield from state.conn.execute(
+                f"SELECT key, value FROM [{state.table_name}] WHERE length(value) > ?;",
+                (self.SMALL_VALUE,)
+            )
+        except sqlite3.OperationalError:
+            return
+            
+    def _on_scan_finished(self, state, diff, scanned):
+        """扫描完成，在GUI线程中发出变化通知
+        
+        Args:
+            state: 数据库状态
+            diff: 变化内容，没有变化时为None
+            scanned: 是否扫描了表
+        """
+        state.scanning = False
+        if scanned:
+            self._stats["scans"] += 1
+        if self._watched.get(state.db_path) is not state:
+            return
+            
+        # 文件被替换或WAL文件新建后需要重新加入监视
+        self._add_fs_paths(state)
+        
+        if diff is not None:
+            self._stats["changes"] += 1
+            self.changed.emit(state.db_path, diff)
+        if state.pending:
+            self._start_scan(state)
+            
+    @staticmethod
+    def _digest(value):
+        """计算值的摘要
+        
+        Args:
+            value: 数据库中的值
+            
+        Returns:
+            bytes: 8字节摘要
+        """
+        if isinstance(value, str):
+            data = value.encode("utf-8", errors="surrogatepass")
+        elif isinstance(value, bytes):
+            data = value
+        else:
+            data = repr(value).encode("utf-8")
+        return hashlib.blake2b(data, digest_size=8).digest()
+        
+    @staticmethod
+    def _fingerprint(db_path):
+        """获取数据库文件及其WAL文件的状态
+        
+        Args:
+            db_path: 数据库文件路径
+            
+        Returns:
+            tuple: (数据库文件inode, 数据库文件大小和修改时间, WAL文件大小和修改时间)，文件不存在时为None
+        """
+        try:
+            stat = os.stat(db_path)
+        except OSError:
+            return None
+        try:
+            wal = os.stat(db_path + "-wal")
+            wal_state = (wal.st_size, wal.st_mtime_ns)
+        except OSError:
+            wal_state = None
+        return (stat.st_ino, (stat.st_size, stat.st_mtime_ns), wal_state)
+        
+    @staticmethod
+    def _close_conn(state):
+        """关闭监视连接（调用方需持有state.lock）
+        
+        Args:
+            state: 数据库状态
+        """
+        if state.conn is not None:
+            try:
+                state.conn.close()
+            except sqlite3.Error:
+                pass
+            state.conn = None
@@ -0,0 +1,144 @@
+import json
+import threading
+from collections import OrderedDict
+
+
+class DecodedValueCache:
+    """已解析JSON值的LRU缓存
+    
+    以 (键, 原始字符串哈希) 作为缓存键，命中时再比较原始字符串，避免哈希碰撞。
+    缓存中的对象会被多个调用方共享，调用方不应修改返回的对象。
+    """
+    
+    def __init__(self, maxsize=256):
+        """初始化缓存
+        
+        Args:
+            maxsize: 最多缓存的解析结果数量
+        """
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        
+    def get(self, key, raw):
+        """获取原始字符串对应的解析结果，未缓存时解析并缓存
+        
+        Args:
+            key: 值所属的键
+            raw: 原始JSON字符串
+            
+        Returns:
+            Any: 解析后的对象
+            
+        Raises:
+            ValueError: 原始字符串不是合法的JSON
+        """
+        cache_key = (key, hash(raw))
+        with self._lock:
+            entry = self._items.get(cache_key)
+            if entry is not None and entry[0] == raw:
+                self._items.move_to_end(cache_key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            
+        # 在锁外解析，避免大值阻塞其他线程
+        decoded = json.loads(raw)
+        with self._lock:
+            self._items[cache_key] = (raw, decoded)
+            self._items.move_to_end(cache_key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return decoded
+        
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._items.clear()
+            
+    def get_stats(self):
+        """获取缓存统计信息
+        
+        Returns:
+            dict: 命中次数、未命中次数和当前缓存数量
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._items)}
+
+
+# 进程内共享的解析缓存
+decoded_cache = DecodedValueCache()
+
+
+class LazyJsonValue:
+    """延迟解析的JSON值
+    
+    保留数据库中的原始字符串，只有访问value属性时才解析JSON。
+    显示时直接使用原始字符串，无需先解析再序列化。
+    """
+    
+    __slots__ = ("key", "raw")
+    
+    def __init__(self, key, raw):
+        """初始化延迟解析值
+        
+        Args:
+            key: 值所属的键
+            raw: 原始JSON字符串
+        """
+        self.key = key
+        self.raw = raw
+        
+    @property
+    def value(self):
+        """解析后的对象，解析失败时返回原始字符串"""
+        try:
+            return decoded_cache.get(self.key, self.raw)
+        except ValueError:
+            return self.raw
+            
+    def __str__(self):
+        return self.raw
+        
+    def __repr__(self):
+        preview = self.raw if len(self.raw) <= 60 else self.raw[:57] + "..."
+        return f"LazyJsonValue({self.key!r}, {preview!r})"
+        
+    def __eq__(self, other):
+        # 只比较原始字符串，与__hash__一致，比较时不触发解析
+        if isinstance(other, LazyJsonValue):
+            return self.raw == other.raw
+        return NotImplemented
+        
+    def __hash__(self):
+        return hash(self.raw)
+
+
+def looks_like_json(value):
+    """判断值是否为JSON对象或数组形式的字符串
+    
+    Args:
+        value: 数据库中的原始值
+        
+    Returns:
+        bool: 是否以 { 或 [ 开头
+    """
+    return isinstance(value, str) and value.startswith(("{", "["))
+
+
+def wrap_value(key, value):
+    """将JSON形式的字符串包装为延迟解析值，其他值原样返回
+    
+    Args:
+        key: 值所属的键
+        value: 数据库中的原始值
+        
+    Returns:
+        Any: LazyJsonValue或原始值
+    """
+    if looks_like_json(value):
+        return LazyJsonValue(key, value)
+    return value
+
@@ -0,0 +1,399 @@
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from core.db_pool import SqliteConnectionPool
+from core.lazy_value import looks_like_json
+
+
+class KeyValueSearchIndex:
+    """键值对全文索引
+    
+    在独立的缓存数据库中为Cursor数据库的键和解析后的JSON值建立FTS5索引，
+    从不修改Cursor自己的state.vscdb。源数据库的文件状态或data_version变化时，
+    按每个键的原始值摘要增量更新索引。SQLite不支持FTS5时available为False，
+    调用方应退回LIKE查询。
+    
+    unicode61分词只能按词和词的前缀匹配，键另外写入一张trigram分词的表，
+    按子串匹配键时与 LIKE '%关键字%' 的结果一致。SQLite不支持trigram分词时
+    在索引的entries表上执行LIKE查询。
+    """
+    
+    # 每个值写入索引的最大字符数
+    TEXT_LIMIT = 65536
+    
+    def __init__(self, index_path="db/search_index.db"):
+        """初始化全文索引
+        
+        Args:
+            index_path: 索引数据库文件路径
+        """
+        self.index_path = index_path
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        self.pool = SqliteConnectionPool(index_path)
+        
+        # 保护源数据库监视连接和内存中的data_version
+        self._lock = threading.Lock()
+        # (源数据库路径, 表名) -> 监视连接，用于读取data_version
+        self._monitors = {}
+        # (源数据库路径, 表名) -> 上次索引时的data_version
+        self._data_versions = {}
+        
+        # 是否有trigram分词的键索引
+        self.key_index_available = False
+        self.available = self._create_schema()
+        
+    def _create_schema(self):
+        """创建索引表
+        
+        Returns:
+            bool: FTS5是否可用
+        """
+        with self.pool.writer() as conn:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sources (
+                    id INTEGER PRIMARY KEY,
+                    db_path TEXT NOT NULL,
+                    table_name TEXT NOT NULL,
+                    fingerprint TEXT,
+                    UNIQUE (db_path, table_name)
+                );
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    id INTEGER PRIMARY KEY,
+                    source_id INTEGER NOT NULL,
+                    key TEXT NOT NULL,
+                    digest BLOB NOT NULL,
+                    UNIQUE (source_id, key)
+                );
+            """)
+            try:
+                # 行号与entries.id一致，键和值分列索引，支持前缀查询
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+                        key, text, source_id UNINDEXED,
+                        tokenize = 'unicode61', prefix = '2 3'
+                    );
+                """)
+            except sqlite3.OperationalError:
+                return False
+                
+            try:
+                # 行号与entries.id一致，键按子串匹配
+                conn.execute("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS entries_keys USING fts5(
+                        key, source_id UNINDEXED, tokenize = 'trigram'
+                    );
+                """)
+            except sqlite3.OperationalError:
+                # SQLite 3.34之前不支持trigram分词
+                return True
+            self.key_index_available = True
+            # 旧版本创建的索引中还没有键索引，从entries补齐
+            if conn.execute("SELECT 1 FROM entries_keys LIMIT 1;").fetchone() is None:
+                conn.execute("INSERT INTO entries_keys (rowid, key, source_id) SELECT id, key, source_id FROM entries;")
+        return True
+        
+    def _source_id(self, conn, db_path, table_name):
+        """获取源数据库表在索引中的编号，不存在时创建
+        
+        Args:
+            conn: 索引数据库连接
+            db_path: 源数据库路径
+            table_name: 表名
+            
+        Returns:
+            tuple: (编号, 上次索引时的文件指纹)
+        """
+        row = conn.execute(
+            "SELECT id, fingerprint FROM sources WHERE db_path = ? AND table_name = ?;",
+            (db_path, table_name)
+        ).fetchone()
+        if row:
+            return row[0], row[1]
+        cursor = conn.execute("INSERT INTO sources (db_path, table_name) VALUES (?, ?);", (db_path, table_name))
+        return cursor.lastrowid, None
+        
+    @staticmethod
+    def _fingerprint(db_path):
+        """根据数据库文件及其WAL文件的大小和修改时间生成指纹
+        
+        Args:
+            db_path: 源数据库路径
+            
+        Returns:
+            str: 文件指纹
+        """
+        parts = []
+        for path in (db_path, db_path + "-wal"):
+            try:
+                stat = os.stat(path)
+                parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+            except OSError:
+                parts.append("-")
+        return "|".join(parts)
+        
+    def _data_version(self, db_path, table_name):
+        """读取源数据库的data_version
+        
+        data_version只在同一个连接上有意义，因此每个源表使用一个固定的监视连接。
+        
+        Args:
+            db_path: 源数据库路径
+            table_name: 表名
+            
+        Returns:
+            int: data_version，无法读取时为None
+        """
+        with self._lock:
+            conn = self._monitors.get((db_path, table_name))
+            try:
+                if conn is None:
+                    uri = Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+                    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                    self._monitors[(db_path, table_name)] = conn
+                return conn.execute("PRAGMA data_version;").fetchone()[0]
+            except sqlite3.Error:
+                return None
+                
+    def is_stale(self, db_path, table_name="ItemTable"):
+        """判断索引是否需要更新
+        
+        Args:
+            db_path: 源数据库路径
+            table_name: 表名
+            
+        Returns:
+            bool: 源数据库自上次索引以来是否可能有变化
+        """
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT fingerprint FROM sources WHERE db_path = ? AND table_name = ?;",
+                (db_path, table_name)
+            ).fetchone()
+        if not row or row[0] != self._fingerprint(db_path):
+            return True
+        with self._lock:
+            last_version = self._data_versions.get((db_path, table_name))
+        return last_version is not None and last_version != self._data_version(db_path, table_name)
+        
+    def refresh(self, db_path, rows, table_name="ItemTable"):
+        """根据源数据增量更新索引
+        
+        比较原始值的摘要，只为新增和发生变化的键提取文本并重建索引，
+        并删除源数据中已不存在的键。
+        
+        Args:
+            db_path: 源数据库路径
+            rows: 产出源数据库中所有 (键, 值) 的可迭代对象
+            table_name: 表名
+            
+        Returns:
+            dict: 新增、更新、删除的键数量
+        """
+        # 先记录版本再读取数据，读取期间发生的修改会在下次检查时被发现
+        fingerprint = self._fingerprint(db_path)
+        version = self._data_version(db_path, table_name)
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        
+        with self.pool.writer() as conn:
+            source_id, _ = self._source_id(conn, db_path, table_name)
+            existing = {
+                key: (entry_id, digest)
+                for entry_id, key, digest in conn.execute(
+                    "SELECT id, key, digest FROM entries WHERE source_id = ?;", (source_id,)
+                )
+            }
+            
+            for key, value in rows:
+                if not isinstance(key, str):
+                    continue
+                digest = self._digest(value)
+                entry = existing.pop(key, None)
+                if entry is not None and entry[1] == digest:
+                    continue
+                    
+                text = self._value_text(value)
+                if entry is not None:
+                    conn.execute("UPDATE entries SET digest = ? WHERE id = ?;", (digest, entry[0]))
+                    if self.available:
+                        conn.execute("UPDATE entries_fts SET text = ? WHERE rowid = ?;", (text, entry[0]))
+                    stats["updated"] += 1
+                else:
+                    cursor = conn.execute(
+                        "INSERT INTO entries (source_id, key, digest) VALUES (?, ?, ?);",
+                        (source_id, key, digest)
+                    )
+                    if self.available:
+                        conn.execute(
+                            "INSERT INTO entries_fts (rowid, key, text, source_id) VALUES (?, ?, ?, ?);",
+                            (cursor.lastrowid, key, text, source_id)
+                        )
+                    if self.key_index_available:
+                        conn.execute(
+                            "INSERT INTO entries_keys (rowid, key, source_id) VALUES (?, ?, ?);",
+                            (cursor.lastrowid, key, source_id)
+                        )
+                    stats["added"] += 1
+                    
+            # 剩下的键在源数据中已不存在
+            removed_ids = [(entry_id,) for entry_id, _ in existing.values()]
+            conn.executemany("DELETE FROM entries WHERE id = ?;", removed_ids)
+            if self.available:
+                conn.executemany("DELETE FROM entries_fts WHERE rowid = ?;", removed_ids)
+            if self.key_index_available:
+                conn.executemany("DELETE FROM entries_keys WHERE rowid = ?;", removed_ids)
+            stats["removed"] = len(removed_ids)
+            
+            conn.execute("UPDATE sources SET fingerprint = ? WHERE id = ?;", (fingerprint, source_id))
+            
+        with self._lock:
+            self._data_versions[(db_path, table_name)] = version
+        return stats
+        
+    def search(self, db_path, query, table_name="ItemTable", limit=100):
+        """在索引中搜索键和值
+        
+        结果为全文匹配的键与包含整个查询文本的键的并集，后者与 LIKE '%查询文本%' 一致。
+        
+        Args:
+            db_path: 源数据库路径
+            query: 查询文本，双引号括起的部分按短语匹配，其余每个词按前缀匹配
+            table_name: 表名
+            limit: 最多返回的键数量
+            
+        Returns:
+            list: 按键排序的键列表
+            
+        Raises:
+            sqlite3.OperationalError: FTS5不可用
+        """
+        if not self.available:
+            raise sqlite3.OperationalError("SQLite不支持FTS5")
+            
+        match = self.build_match_query(query)
+        if not match:
+            return []
+            
+        with self.pool.reader() as conn:
+            row = conn.execute(
+                "SELECT id FROM sources WHERE db_path = ? AND table_name = ?;",
+                (db_path, table_name)
+            ).fetchone()
+            if not row:
+                return []
+            # 不按rank排序：匹配很多时排序需要先取出全部匹配行，取到limit条即停止更快
+            keys = {key for key, in conn.execute(
+                "SELECT key FROM entries_fts WHERE entries_fts MATCH ? AND source_id = ? LIMIT ?;",
+                (match, row[0], limit)
+            )}
+            # trigram索引只能查找包含连续3个以上非通配字符的模式，较短时在entries表上扫描键
+            longest = max(len(part) for part in re.split(r"[%_]", query))
+            key_table = "entries_keys" if self.key_index_available and longest >= 3 else "entries"
+            keys.update(key for key, in conn.execute(
+                f"SELECT key FROM {key_table} WHERE key LIKE ? AND source_id = ? LIMIT ?;",
+                (f"%{query}%", row[0], limit)
+            ))
+        return sorted(keys)[:limit]
+            
+    @staticmethod
+    def build_match_query(query):
+        """将搜索框中的文本转换为FTS5查询
+        
+        双引号括起的部分作为短语，其余部分拆分为词并按前缀匹配，各部分之间为AND关系。
+        
+        Args:
+            query: 查询文本
+            
+        Returns:
+            str: FTS5查询表达式，没有可搜索的词时为空字符串
+        """
+        terms = []
+        for phrase, bare in re.findall(r'"([^"]*)"|([^"\s]+)', query):
+            if phrase:
+                words = re.findall(r"\w+", phrase)
+                if words:
+                    terms.append('"' + " ".join(words) + '"')
+            else:
+                for word in re.findall(r"\w+", bare):
+                    terms.append(f'"{word}"*')
+        return " AND ".join(terms)
+        
+    @staticmethod
+    def _digest(value):
+        """计算原始值的摘要，不解析JSON
+        
+        Args:
+            value: 数据库中的原始值
+            
+        Returns:
+            bytes: 8字节摘要
+        """
+        if isinstance(value, str):
+            data = value.encode("utf-8", errors="surrogatepass")
+        elif isinstance(value, bytes):
+            data = value
+        else:
+            data = repr(value).encode("utf-8")
+        return hashlib.blake2b(data, digest_size=8).digest()
+        
+    @classmethod
+    def _value_text(cls, value):
+        """提取值中可搜索的文本，JSON值只保留其中的键和标量值
+        
+        Args:
+            value: 数据库中的原始值
+            
+        Returns:
+            str: 写入索引的文本
+        """
+        if value is None:
+            return ""
+        if isinstance(value, bytes):
+            value = value.decode("utf-8", errors="ignore")
+        elif not isinstance(value, str):
+            return str(value)
+            
+        if looks_like_json(value):
+            try:
+                parts = []
+                cls._collect_text(json.loads(value), parts)
+                value = " ".join(parts)
+            except ValueError:
+                pass
+        return value[:cls.TEXT_LIMIT]
+        
+    @classmethod
+    def _collect_text(cls, value, parts):
+        """递归收集JSON对象中的键和标量值
+        
+        Args:
+            value: 解析后的JSON对象
+            parts: 收集结果列表
+        """
+        if isinstance(value, dict):
+            for key, item in value.items():
+                parts.append(str(key))
+                cls._collect_text(item, parts)
+        elif isinstance(value, list):
+            for item in value:
+                cls._collect_text(item, parts)
+        elif value is not None:
+            parts.append(str(value))
+            
+    def close(self):
+        """关闭索引数据库和所有监视连接"""
+        with self._lock:
+            for conn in self._monitors.values():
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            self._monitors = {}
+            self._data_versions = {}
+        self.pool.close()
@@ -2,15 +2,18 @@ import sys
 import os
 import logging
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QIcon
 from core.browser import BrowserManager
 from core.automation import AutomationManager
-from core.process_manager import CursorProcessManager
+from utils.config_manager import ConfigManager
 from utils.system_config import SystemConfigManager
+from utils.config_watcher import ConfigWatcher
 from core.db_manager import DbManager
 from core.account_manager_db import AccountManagerDb
 from ui.main_window import MainWindow
 from utils.logger import LoggerManager
+from utils.startup import StartupTimeline, StartupOrchestrator
 
 # 初始化日志管理器
 log_manager = LoggerManager()
@@ -27,8 +30,40 @@ for handler in root_logger.handlers[:]:
 # 添加日志管理器作为处理器
 root_logger.addHandler(log_manager.get_handler())
 
+def configure_logging(system_config):
+    """按系统配置启用结构化日志、日志限流和日志保留策略
+    
+    Args:
+        system_config: 系统配置管理器实例
+    """
+    # 启用结构化日志（JSON Lines格式，支持按时间和级别快速查找）
+    if system_config.get_config("logging", "jsonl", False):
+        log_manager.enable_jsonl()
+        logger.info(f"结构化日志已启用: {log_manager.jsonl_file}")
+    
+    # 日志限流和重复折叠（高频日志按来源和消息模板限流，连续重复的日志汇总为一条）
+    rate_limit = system_config.get_config("logging", "rate_limit", None)
+    if isinstance(rate_limit, dict):
+        log_manager.configure_rate_limit(**rate_limit)
+    
+    # 启动日志压缩和保留策略（后台压缩已关闭的日志，删除过期或超出总大小预算的日志）
+    if system_config.get_config("logging", "retention", True):
+        log_manager.start_retention(
+            max_age_days=system_config.get_config("logging", "retention_days", 30),
+            max_total_mb=system_config.get_config("logging", "max_total_mb", 200),
+            compression=system_config.get_config("logging", "compression", "gzip")
+        )
+
 def main():
-    """主程序入口函数"""
+    """主程序入口函数
+    
+    先创建并显示主窗口，其余组件在窗口显示之后由启动编排器初始化：
+    不涉及界面的初始化（系统配置和路径查找、数据库连接）在后台线程池中执行，
+    各选项卡在第一次切换到时才创建。每个组件的耗时记录在启动时间线中，
+    启动完成后写入日志，也可以在状态栏的“启动耗时”中查看。
+    """
+    timeline = StartupTimeline()
+    timeline.begin()
     logger.info("程序启动")
     
     # 确保应用程序可以正确找到资源文件
@@ -37,79 +72,117 @@ def main():
     logger.info(f"工作目录: {base_dir}")
     
     # 创建Qt应用
-    app = QApplication(sys.argv)
-    app.setApplicationName("Cursor自动化管理工具")
+    with timeline.measure("Qt应用"):
+        app = QApplication(sys.argv)
+        app.setApplicationName("Cursor自动化管理工具")
     logger.info("Qt应用程序初始化完成")
     
     # 设置应用图标（如果有）
     # app.setWindowIcon(QIcon("resources/icons/app_icon.png"))
     
-    # 初始化系统配置管理器
-    system_config = SystemConfigManager()
-    logger.info("系统配置管理器初始化完成")
-    
-    # 初始化数据库管理器
-    db_manager = DbManager()
-    cursor_db_path = system_config.get_config("cursor", "db_file", "")
-    if cursor_db_path and os.path.exists(cursor_db_path):
-        db_manager.set_db_path(cursor_db_path)
-        logger.info(f"数据库路径设置为: {cursor_db_path}")
-    else:
-        logger.warning(f"数据库文件不存在: {cursor_db_path}")
-    
-    # 初始化进程管理器
-    process_manager = CursorProcessManager()
-    logger.info("进程管理器初始化完成")
-    
-    # 初始化浏览器管理器
-    browser_manager = BrowserManager(system_config)
+    # 初始化浏览器管理器（系统配置在后台初始化完成后再设置）
+    with timeline.measure("浏览器管理器"):
+        browser_manager = BrowserManager()
     logger.info("浏览器管理器初始化完成")
     
     # 初始化自动化管理器
-    automation_manager = AutomationManager(browser_manager)
+    with timeline.measure("自动化管理器"):
+        automation_manager = AutomationManager(browser_manager)
     logger.info("自动化管理器初始化完成")
     
-    # 初始化账号管理器 (使用数据库版本)
-    account_manager = AccountManagerDb()
+    # 初始化账号管理器 (使用数据库版本)，主窗口的授权登录页需要，在GUI线程中创建
+    with timeline.measure("账号管理器"):
+        account_manager = AccountManagerDb()
     logger.info("数据库版账号管理器初始化完成")
     
-    # 创建并显示主窗口
-    main_window = MainWindow(browser_manager, automation_manager)
-    # 设置账号管理器
-    main_window.account_manager = account_manager
+    # 启动编排器，主窗口显示之后初始化其余组件
+    startup = StartupOrchestrator()
+    
+    # 创建并显示主窗口（除授权登录页外的选项卡都在第一次切换到时创建）
+    with timeline.measure("主窗口"):
+        main_window = MainWindow(browser_manager, automation_manager, account_manager, startup)
     logger.info("主窗口创建完成")
     
-    # 将系统配置和数据库管理器传递给主窗口，用于后续设置各组件
-    try:
-        # 设置系统配置
+    main_window.show()
+    timeline.mark("主窗口显示")
+    logger.info("主窗口显示完成")
+    
+    db_manager = DbManager()
+    
+    def on_system_config_ready(system_config):
+        """系统配置初始化完成，传递给主窗口和浏览器管理器"""
         main_window.system_config = system_config
+        browser_manager.system_config = system_config
+        logger.info("系统配置管理器初始化完成")
         
-        # 设置配置相关组件
-        if hasattr(main_window, 'system_config_tab'):
-            main_window.system_config_tab.system_config = system_config
+    def init_db_manager():
+        """设置数据库路径并打开连接池（在后台线程中执行）"""
+        cursor_db_path = startup.result("系统配置").get_config("cursor", "db_file", "")
+        if cursor_db_path and os.path.exists(cursor_db_path):
+            db_manager.set_db_path(cursor_db_path)
+            logger.info(f"数据库路径设置为: {cursor_db_path}")
+        else:
+            logger.warning(f"数据库文件不存在: {cursor_db_path}")
+        return db_manager
         
-        # 尝试设置数据库相关组件
-        if hasattr(main_window, 'db_tab'):
-            # 确保db_tab可以访问数据库管理器和系统配置
-            main_window.db_tab.db_manager = db_manager
-            # 可选：设置父窗口引用
-            main_window.db_tab.parent_window = main_window
+    def init_config_watcher():
+        """监视系统配置文件，被外部编辑或被另一个实例修改后按路径合并并通知各组件"""
+        config_watcher = ConfigWatcher()
+        config_watcher.watch(startup.result("系统配置"))
+        config_watcher.config_changed.connect(browser_manager.on_config_changed)
+        return config_watcher
         
-        # 尝试连接信号
-        if hasattr(main_window, 'system_config_tab') and hasattr(main_window, 'db_tab'):
-            if hasattr(main_window.system_config_tab, 'config_updated') and hasattr(main_window.db_tab, 'load_db_info'):
-                main_window.system_config_tab.config_updated.connect(main_window.db_tab.load_db_info)
-                logger.info("组件信号连接完成")
-    except Exception as e:
-        logger.error(f"设置组件属性时出错: {e}")
-    
-    # 显示主窗口
-    main_window.show()
-    logger.info("主窗口显示完成")
+    # 系统配置初始化时并行查找Cursor和Chrome路径，放在后台执行
+    startup.add("系统配置", SystemConfigManager, on_ready=on_system_config_ready)
+    startup.add("日志配置", lambda: configure_logging(startup.result("系统配置")),
+                requires=("系统配置",), background=False)
+    startup.add("数据库管理器", init_db_manager, requires=("系统配置",))
+    # QObject需要在GUI线程中创建
+    startup.add("配置文件监视", init_config_watcher, requires=("系统配置",), background=False)
+    
+    def on_tab_created(name, tab):
+        """选项卡按需创建后设置系统配置和数据库管理器，并连接信号"""
+        try:
+            if name == "system_config_tab":
+                tab.system_config = startup.result("系统配置", tab.system_config)
+            elif name == "db_tab":
+                # 确保db_tab可以访问数据库管理器和系统配置
+                tab.db_manager = db_manager
+                tab.parent_window = main_window
+                
+            # 系统配置和数据库管理选项卡都创建后连接信号
+            if name in ("system_config_tab", "db_tab"):
+                system_config_tab = getattr(main_window, "system_config_tab", None)
+                db_tab = getattr(main_window, "db_tab", None)
+                if system_config_tab is not None and db_tab is not None:
+                    system_config_tab.config_updated.connect(db_tab.load_db_info)
+                    logger.info("组件信号连接完成")
+        except Exception as e:
+            logger.error(f"设置组件属性时出错: {e}")
+            
+    def on_startup_finished():
+        """所有组件初始化完成，记录启动时间线"""
+        timeline.log_summary()
+        main_window.on_startup_finished()
+        
+    main_window.tab_created.connect(on_tab_created)
+    startup.all_ready.connect(on_startup_finished)
+    # 等事件循环开始、窗口完成首次绘制后再开始初始化
+    QTimer.singleShot(0, startup.start)
     
     # 运行应用程序事件循环
     logger.info("开始运行事件循环")
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    
+    # 停止尚未开始的后台初始化
+    startup.shutdown(wait=True)
+    
+    # 写入尚未保存的配置修改
+    ConfigManager.flush_all()
+    
+    # 关闭数据库连接池
+    db_manager.close()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,14 +1,17 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                        QLabel, QTableWidget, QTableWidgetItem, QGroupBox, 
+                        QLabel, QTableView, QGroupBox, 
                         QFormLayout, QFileDialog, QLineEdit, QMessageBox,
                         QTabWidget, QTextEdit, QCheckBox, QComboBox, QDialog,
-                        QDialogButtonBox, QHeaderView, QFrame, QSplitter)
+                        QDialogButtonBox, QHeaderView, QFrame, QSplitter,
+                        QAbstractItemView)
 from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QIcon
 from core.db_manager import DbManager
+from core.db_watcher import DbWatcher
+from ui.key_value_model import KeyValueTableModel
+from ui.job_runner import JobRunner
 import os
 import json
-from PyQt5.QtWidgets import QApplication
 
 class DbTab(QWidget):
     """数据库管理选项卡"""
@@ -30,17 +33,23 @@ class DbTab(QWidget):
         # 父窗口引用，用于访问主窗口中的其他组件
         self.parent_window = parent
         
+        # 后台任务调度器，所有数据库操作都在工作线程中执行
+        self.job_runner = JobRunner(parent=self)
+        self.job_runner.queue_depth_changed.connect(self.on_queue_depth_changed)
+        
         # 创建UI
         self.setup_ui()
         
+        # 监视数据库变化，只在数据库真正被修改时刷新
+        self.db_watcher = DbWatcher()
+        self.db_watcher.changed.connect(self.on_db_changed)
+        self._watched_path = None
+        # 隐藏期间数据库发生变化，显示时需要刷新状态
+        self._status_dirty = False
+        
         # 延迟加载数据库信息，给UI更多时间初始化
         QTimer.singleShot(500, self.load_db_info)
         
-        # 创建定时器，定期刷新数据库状态
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.load_db_info)
-        self.refresh_timer.start(30000)  # 每30秒更新一次
-        
     def setup_ui(self):
         """设置UI"""
         self._show_only_item_table = True  # 标记只显示ItemTable表
@@ -90,10 +99,12 @@ class DbTab(QWidget):
         self.status_label = QLabel("未知")
         self.size_label = QLabel("未知")
         self.tables_label = QLabel("未知")
+        self.job_status_label = QLabel("空闲")
         
         status_layout.addRow("状态:", self.status_label)
         status_layout.addRow("大小:", self.size_label)
         status_layout.addRow("表数量:", self.tables_label)
+        status_layout.addRow("后台任务:", self.job_status_label)
         
         status_group.setLayout(status_layout)
         main_layout.addWidget(status_group)
@@ -111,9 +122,17 @@ class DbTab(QWidget):
         
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("输入关键字搜索ItemTable中的键...")
+        self.search_input.setToolTip("搜索键和值，每个词按前缀匹配，用双引号括起的内容按短语匹配")
         self.search_input.returnPressed.connect(self.search_keys)
         search_layout.addWidget(self.search_input)
         
+        # 输入停顿后自动搜索
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.search_keys)
+        self.search_input.textEdited.connect(self.search_timer.start)
+        
         self.table_combo = QComboBox()
         self.table_combo.currentIndexChanged.connect(self.on_table_changed)
         search_layout.addWidget(self.table_combo)
@@ -124,13 +143,23 @@ class DbTab(QWidget):
         
         key_value_layout.addLayout(search_layout)
         
-        # 创建键值对表格
-        self.key_value_table = QTableWidget(0, 2)
-        self.key_value_table.setHorizontalHeaderLabels(["键", "值"])
-        self.key_value_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        # 创建键值对表格，数据由模型按需分批加载
+        self.key_value_model = KeyValueTableModel(self)
+        self.key_value_model.set_runner(self.job_runner)
+        self.key_value_model.rowsInserted.connect(self.on_rows_loaded)
+        self.key_value_model.load_failed.connect(self.on_load_failed)
+        
+        self.key_value_table = QTableView()
+        self.key_value_table.setModel(self.key_value_model)
+        # 键列使用采样得到的宽度，不再逐行测量内容
+        self.key_value_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Interactive)
         self.key_value_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        self.key_value_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.key_value_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.key_value_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.key_value_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.key_value_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.key_value_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.key_value_table.setTextElideMode(Qt.ElideRight)
+        self.key_value_table.setWordWrap(False)
         self.key_value_table.doubleClicked.connect(self.on_table_double_clicked)
         
         key_value_layout.addWidget(self.key_value_table)
@@ -163,6 +192,12 @@ class DbTab(QWidget):
         self.import_btn.clicked.connect(self.import_data)
         buttons_layout.addWidget(self.import_btn)
         
+        self.cancel_job_btn = QPushButton("取消任务")
+        self.cancel_job_btn.setToolTip("取消正在进行的导入、导出等后台任务")
+        self.cancel_job_btn.setEnabled(False)
+        self.cancel_job_btn.clicked.connect(self.job_runner.cancel_all)
+        buttons_layout.addWidget(self.cancel_job_btn)
+        
         key_value_layout.addLayout(buttons_layout)
         
         # 添加选项卡 - 将标签修改为专注于ItemTable
@@ -225,50 +260,120 @@ class DbTab(QWidget):
             self.status_label.setStyleSheet("color: #dc3545;")  # 红色错误
             return
             
+        # 切换监视的数据库
+        if db_path != self._watched_path:
+            self.db_watcher.unwatch(self._watched_path)
+            self.db_watcher.watch(db_path)
+            self._watched_path = db_path
+            
+        # 在后台获取数据库信息，新的请求会取代尚未完成的旧请求
+        self.job_runner.submit(
+            lambda job: self.db_manager.get_db_info(),
+            channel="db_info",
+            on_result=self.on_db_info_loaded,
+            on_error=self.on_db_info_failed
+        )
+        
+    def on_db_info_loaded(self, info):
+        """数据库信息加载完成
+        
+        Args:
+            info: 数据库信息字典
+        """
         try:
-            # 获取数据库信息
-            info = self.db_manager.get_db_info()
-            
-            # 更新状态
-            if info["status"] == "正常":
-                self.status_label.setText("正常")
-                self.status_label.setStyleSheet("color: #28a745;")  # 绿色正常
-            elif "错误" in info["status"] or "失败" in info["status"]:
-                self.status_label.setText(info["status"])
-                self.status_label.setStyleSheet("color: #dc3545;")  # 红色错误
-            else:
-                self.status_label.setText(info["status"])
-                self.status_label.setStyleSheet("color: #ffc107;")  # 黄色警告
-                
-            self.size_label.setText(info["size"])
-            
-            # 筛选出ItemTable表
-            item_table_found = False
-            for table in info["tables"]:
-                table_name = table.split(" ")[0]
-                if table_name == "ItemTable":
-                    item_table_found = True
-                    break
-                    
+            item_table_found = self.update_db_status(info)
+            
             # 更新表格列表
             self.table_combo.clear()
             
             # 只添加ItemTable表或可选的默认表
             if item_table_found:
-                self.tables_label.setText("已找到")
-                self.tables_label.setStyleSheet("color: #28a745;")  # 绿色正常
                 self.table_combo.addItem("ItemTable")
                 
                 # 直接开始加载ItemTable的数据
                 self.load_key_value_data("ItemTable")
-            else:
-                self.tables_label.setText("未找到")
-                self.tables_label.setStyleSheet("color: #ffc107;")  # 黄色警告
                 
         except Exception as e:
             QMessageBox.warning(self, "错误", f"加载数据库信息失败: {str(e)}")
             print(f"加载数据库信息失败: {e}")
             
+    def update_db_status(self, info):
+        """根据数据库信息更新状态栏
+        
+        Args:
+            info: 数据库信息字典
+            
+        Returns:
+            bool: 是否找到ItemTable表
+        """
+        # 更新状态
+        if info["status"] == "正常":
+            self.status_label.setText("正常")
+            self.status_label.setStyleSheet("color: #28a745;")  # 绿色正常
+        elif "错误" in info["status"] or "失败" in info["status"]:
+            self.status_label.setText(info["status"])
+            self.status_label.setStyleSheet("color: #dc3545;")  # 红色错误
+        else:
+            self.status_label.setText(info["status"])
+            self.status_label.setStyleSheet("color: #ffc107;")  # 黄色警告
+            
+        self.size_label.setText(info["size"])
+        
+        # 筛选出ItemTable表
+        item_table_found = False
+        for table in info["tables"]:
+            table_name = table.split(" ")[0]
+            if table_name == "ItemTable":
+                item_table_found = True
+                break
+                
+        if item_table_found:
+            self.tables_label.setText("已找到")
+            self.tables_label.setStyleSheet("color: #28a745;")  # 绿色正常
+        else:
+            self.tables_label.setText("未找到")
+            self.tables_label.setStyleSheet("color: #ffc107;")  # 黄色警告
+            
+        return item_table_found
+        
+    def on_db_changed(self, db_path, diff):
+        """数据库被修改，只刷新状态栏和发生变化的行
+        
+        Args:
+            db_path: 被修改的数据库路径
+            diff: 变化内容
+        """
+        if db_path != os.path.abspath(self.db_manager.db_path or ""):
+            return
+            
+        if diff.get("table") == getattr(self, "_loaded_table", None):
+            self.key_value_model.apply_changes(diff)
+            
+        if self.isVisible():
+            self.refresh_db_status()
+        else:
+            self._status_dirty = True
+            
+    def refresh_db_status(self):
+        """在后台重新获取数据库信息，只更新状态栏，不重新加载表格"""
+        self._status_dirty = False
+        self.job_runner.submit(
+            lambda job: self.db_manager.get_db_info(),
+            channel="db_info",
+            on_result=self.update_db_status,
+            on_error=self.on_db_info_failed
+        )
+        
+    def on_db_info_failed(self, message):
+        """数据库信息加载失败
+        
+        Args:
+            message: 错误信息
+        """
+        self.status_label.setText(f"加载失败: {message}")
+        self.status_label.setStyleSheet("color: #dc3545;")  # 红色错误
+        print(f"加载数据库信息失败: {message}")
+            
     def load_key_value_data(self, table_name=None):
         """加载键值对数据
         
@@ -285,55 +390,19 @@ class DbTab(QWidget):
         if not table_name:
             return
             
-        try:
-            # 显示加载状态
-            self.search_input.setPlaceholderText("正在加载数据...")
-            QApplication.processEvents()  # 强制更新UI
-            
-            # 清空表格
-            self.key_value_table.setRowCount(0)
-            
-            # 获取键值对数据
-            result = self.db_manager.get_key_value_pairs(table_name)
-            if result["status"] != "正常":
-                print(f"加载键值对失败: {result['message']}")
-                self.search_input.setPlaceholderText(f"加载失败: {result['message']}")
-                return
-                
-            # 填充表格
-            for key, value in result["data"].items():
-                row = self.key_value_table.rowCount()
-                self.key_value_table.insertRow(row)
-                
-                # 添加键
-                key_item = QTableWidgetItem(key)
-                self.key_value_table.setItem(row, 0, key_item)
-                
-                # 添加值（可能是复杂对象，转换为字符串）
-                if isinstance(value, (dict, list)):
-                    try:
-                        value_str = json.dumps(value, ensure_ascii=False)
-                    except:
-                        value_str = str(value)
-                else:
-                    value_str = str(value)
-                    
-                value_item = QTableWidgetItem(value_str)
-                self.key_value_table.setItem(row, 1, value_item)
-            
-            # 调整列宽
-            self.key_value_table.resizeColumnsToContents()
-            
-            # 更新搜索框提示
-            self.search_input.setPlaceholderText(f"输入关键字搜索{table_name}中的键... (共{self.key_value_table.rowCount()}条记录)")
-            
-        except Exception as e:
-            print(f"加载键值对数据失败: {e}")
-            self.search_input.setPlaceholderText(f"加载失败: {str(e)}")
-            # 静默失败，不显示错误消息框，避免反复弹出
+        # 取代尚未完成的搜索，避免旧的搜索结果覆盖表格
+        self.job_runner.cancel("key_values")
+        
+        # 模型只保存迭代器，滚动到底部时再在后台分批读取
+        self.search_input.setPlaceholderText("正在加载数据...")
+        self._loaded_table = table_name
+        self.key_value_model.set_source(self.db_manager.iter_key_values(table_name=table_name), ordered=True)
+        self.fetch_first_batch()
             
     def search_keys(self):
-        """搜索键"""
+        """搜索键和值"""
+        self.search_timer.stop()
+        
         # 获取搜索关键字
         keyword = self.search_input.text().strip()
         if not keyword:
@@ -345,44 +414,138 @@ class DbTab(QWidget):
         if not table_name:
             return
             
-        try:
-            # 清空表格
-            self.key_value_table.setRowCount(0)
+        # 在后台搜索，新的搜索会取代尚未完成的旧搜索
+        self.search_input.setPlaceholderText("正在搜索...")
+        self.job_runner.submit(
+            lambda job: self.db_manager.search_keys(keyword, table_name),
+            channel="key_values",
+            on_result=lambda result: self.on_search_finished(table_name, result),
+            on_error=lambda message: QMessageBox.warning(self, "错误", f"搜索键失败: {message}")
+        )
+        
+    def on_search_finished(self, table_name, result):
+        """搜索完成
+        
+        Args:
+            table_name: 搜索的表名
+            result: 搜索结果
+        """
+        if result["status"] != "正常":
+            QMessageBox.warning(self, "错误", result["message"])
+            return
             
-            # 搜索键
-            result = self.db_manager.search_keys(keyword, table_name)
-            if result["status"] != "正常":
-                QMessageBox.warning(self, "错误", result["message"])
-                return
-                
-            # 填充表格
-            for key, value in result["data"].items():
-                row = self.key_value_table.rowCount()
-                self.key_value_table.insertRow(row)
-                
-                # 添加键
-                key_item = QTableWidgetItem(key)
-                self.key_value_table.setItem(row, 0, key_item)
-                
-                # 添加值（可能是复杂对象，转换为字符串）
-                if isinstance(value, (dict, list)):
-                    value_str = json.dumps(value, ensure_ascii=False)
-                else:
-                    value_str = str(value)
-                    
-                value_item = QTableWidgetItem(value_str)
-                self.key_value_table.setItem(row, 1, value_item)
+        # 填充表格，JSON值为延迟解析值，模型直接显示原始字符串
+        self._loaded_table = table_name
+        self.key_value_model.set_source(result["data"].items())
+        self.fetch_first_batch()
             
-            # 调整列宽
-            self.key_value_table.resizeColumnsToContents()
+    def fetch_first_batch(self):
+        """加载第一批数据，键列宽度在第一批数据到达后根据采样结果设置"""
+        self._column_sized = False
+        if self.key_value_model.canFetchMore():
+            self.key_value_model.fetchMore()
+        
+    def resize_key_column(self, sample_size=50):
+        """根据前若干行的键估算键列宽度
+        
+        Args:
+            sample_size: 采样的行数
+        """
+        keys = self.key_value_model.sample_keys(sample_size)
+        if not keys:
+            return
             
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"搜索键失败: {str(e)}")
+        metrics = self.key_value_table.fontMetrics()
+        width = max(metrics.horizontalAdvance(key) for key in keys) + 24
+        # 键列最多占表格宽度的一半，其余留给值列
+        max_width = max(self.key_value_table.viewport().width() // 2, 200)
+        self.key_value_table.setColumnWidth(0, min(width, max_width))
+        
+    def on_rows_loaded(self):
+        """模型加载新数据后更新搜索框提示"""
+        if not getattr(self, "_column_sized", True):
+            self._column_sized = True
+            self.resize_key_column()
             
+        count = self.key_value_model.rowCount()
+        table_name = getattr(self, "_loaded_table", "") or self.table_combo.currentText()
+        suffix = "" if self.key_value_model.is_exhausted() else "+"
+        self.search_input.setPlaceholderText(f"输入关键字搜索{table_name}中的键... (已加载{count}{suffix}条记录)")
+        
+    def on_load_failed(self, message):
+        """模型加载数据失败
+        
+        Args:
+            message: 错误信息
+        """
+        print(f"加载键值对数据失败: {message}")
+        self.search_input.setPlaceholderText(f"加载失败: {message}")
+        
+    def selected_row(self):
+        """获取当前选中的行号
+        
+        Returns:
+            int: 行号，没有选中时返回-1
+        """
+        rows = self.key_value_table.selectionModel().selectedRows()
+        if not rows:
+            return -1
+        return rows[0].row()
+        
     def on_table_changed(self):
         """表格选择改变事件"""
         self.load_key_value_data()
         
+    def on_queue_depth_changed(self, depth):
+        """后台任务数量变化
+        
+        Args:
+            depth: 未完成的任务数量
+        """
+        if depth:
+            self.job_status_label.setText(f"{depth}个任务进行中")
+        else:
+            self.job_status_label.setText("空闲")
+        self.cancel_job_btn.setEnabled(depth > 0)
+        
+    def on_job_progress(self, action, done, total):
+        """后台任务进度更新
+        
+        Args:
+            action: 任务名称
+            done: 已完成数量
+            total: 总数量，未知时为0
+        """
+        if total:
+            self.job_status_label.setText(f"{action}中: {done}/{total}")
+        else:
+            self.job_status_label.setText(f"{action}中: 已处理{done}条")
+            
+    def run_write(self, fn, *args):
+        """在后台执行写操作，完成后显示结果并刷新数据
+        
+        Args:
+            fn: 返回操作结果字典的数据库写操作
+            *args: 写操作参数
+        """
+        self.job_runner.submit(
+            lambda job: fn(*args),
+            on_result=self.on_write_finished,
+            on_error=lambda message: QMessageBox.warning(self, "错误", message)
+        )
+        
+    def on_write_finished(self, result):
+        """写操作完成
+        
+        Args:
+            result: 操作结果字典
+        """
+        if result["status"] == "正常":
+            QMessageBox.information(self, "成功", result["message"])
+            self.load_key_value_data()
+        else:
+            QMessageBox.warning(self, "错误", result["message"])
+        
     def add_key_value(self):
         """添加键值对"""
         # 获取当前选择的表
@@ -411,18 +574,13 @@ class DbTab(QWidget):
                 value = value_text
                 
             # 添加键值对
-            result = self.db_manager.set_key_value(key, value, table_name)
-            if result["status"] == "正常":
-                QMessageBox.information(self, "成功", result["message"])
-                self.load_key_value_data()
-            else:
-                QMessageBox.warning(self, "错误", result["message"])
+            self.run_write(self.db_manager.set_key_value, key, value, table_name)
                 
     def edit_key_value(self):
         """编辑键值对"""
         # 获取当前选择的行
-        selected_items = self.key_value_table.selectedItems()
-        if not selected_items:
+        row = self.selected_row()
+        if row < 0:
             QMessageBox.warning(self, "错误", "请先选择一项")
             return
             
@@ -431,10 +589,9 @@ class DbTab(QWidget):
         if not table_name:
             return
             
-        # 获取键和值
-        row = selected_items[0].row()
-        key = self.key_value_table.item(row, 0).text()
-        value_text = self.key_value_table.item(row, 1).text()
+        # 获取键和完整的值
+        key = self.key_value_model.row_key(row)
+        value_text = self.key_value_model.row_value(row)
         
         # 弹出编辑对话框
         dialog = KeyValueDialog(self, "编辑键值对", key, value_text)
@@ -446,10 +603,6 @@ class DbTab(QWidget):
                 QMessageBox.warning(self, "错误", "键不能为空")
                 return
                 
-            # 如果键改变了，先删除旧键
-            if new_key != key:
-                self.db_manager.delete_key(key, table_name)
-                
             # 尝试解析JSON
             if new_value_text.startswith('{') or new_value_text.startswith('['):
                 try:
@@ -459,19 +612,30 @@ class DbTab(QWidget):
             else:
                 new_value = new_value_text
                 
-            # 更新键值对
-            result = self.db_manager.set_key_value(new_key, new_value, table_name)
-            if result["status"] == "正常":
-                QMessageBox.information(self, "成功", result["message"])
-                self.load_key_value_data()
-            else:
-                QMessageBox.warning(self, "错误", result["message"])
+            # 更新键值对，如果键改变了，先删除旧键
+            self.run_write(self.replace_key_value, key, new_key, new_value, table_name)
+            
+    def replace_key_value(self, key, new_key, new_value, table_name):
+        """更新键值对，键改变时先删除旧键（在工作线程中执行）
+        
+        Args:
+            key: 原来的键
+            new_key: 新的键
+            new_value: 新的值
+            table_name: 表名
+            
+        Returns:
+            dict: 操作结果
+        """
+        if new_key != key:
+            self.db_manager.delete_key(key, table_name)
+        return self.db_manager.set_key_value(new_key, new_value, table_name)
                 
     def delete_key_value(self):
         """删除键值对"""
         # 获取当前选择的行
-        selected_items = self.key_value_table.selectedItems()
-        if not selected_items:
+        row = self.selected_row()
+        if row < 0:
             QMessageBox.warning(self, "错误", "请先选择一项")
             return
             
@@ -481,8 +645,7 @@ class DbTab(QWidget):
             return
             
         # 获取键
-        row = selected_items[0].row()
-        key = self.key_value_table.item(row, 0).text()
+        key = self.key_value_model.row_key(row)
         
         # 确认删除
         reply = QMessageBox.question(
@@ -495,12 +658,7 @@ class DbTab(QWidget):
         
         if reply == QMessageBox.Yes:
             # 删除键
-            result = self.db_manager.delete_key(key, table_name)
-            if result["status"] == "正常":
-                QMessageBox.information(self, "成功", result["message"])
-                self.load_key_value_data()
-            else:
-                QMessageBox.warning(self, "错误", result["message"])
+            self.run_write(self.db_manager.delete_key, key, table_name)
                 
     def on_table_double_clicked(self, index):
         """表格双击事件"""
@@ -524,12 +682,28 @@ class DbTab(QWidget):
         )
         
         if export_path:
-            # 导出数据
-            result = self.db_manager.export_to_json(export_path, table_name)
-            if result["status"] == "正常":
-                QMessageBox.information(self, "成功", result["message"])
-            else:
-                QMessageBox.warning(self, "错误", result["message"])
+            # 在后台导出数据
+            self.job_runner.submit(
+                lambda job: self.db_manager.export_to_json(
+                    export_path, table_name,
+                    progress_callback=lambda done: job.report_progress(done)
+                ),
+                channel="export",
+                on_result=self.on_export_finished,
+                on_error=lambda message: QMessageBox.warning(self, "错误", message),
+                on_progress=lambda done, total: self.on_job_progress("导出", done, total)
+            )
+            
+    def on_export_finished(self, result):
+        """导出完成
+        
+        Args:
+            result: 操作结果字典
+        """
+        if result["status"] == "正常":
+            QMessageBox.information(self, "成功", result["message"])
+        else:
+            QMessageBox.warning(self, "错误", result["message"])
                 
     def import_data(self):
         """导入数据"""
@@ -558,28 +732,30 @@ class DbTab(QWidget):
             )
             
             if reply == QMessageBox.Yes:
-                # 导入数据
-                result = self.db_manager.import_from_json(import_path, table_name)
-                if result["status"] == "正常":
-                    QMessageBox.information(self, "成功", result["message"])
-                    self.load_key_value_data()
-                else:
-                    QMessageBox.warning(self, "错误", result["message"])
+                # 在后台导入数据
+                self.job_runner.submit(
+                    lambda job: self.db_manager.import_from_json(
+                        import_path, table_name,
+                        progress_callback=lambda done, total: job.report_progress(done, total)
+                    ),
+                    channel="import",
+                    on_result=self.on_write_finished,
+                    on_error=lambda message: QMessageBox.warning(self, "错误", message),
+                    on_progress=lambda done, total: self.on_job_progress("导入", done, total)
+                )
                     
     def showEvent(self, event):
         """显示事件"""
         super().showEvent(event)
-        # 加载数据库信息
-        self.load_db_info()
-        # 启动定时器
-        if not self.refresh_timer.isActive():
-            self.refresh_timer.start(30000)
-        
-    def hideEvent(self, event):
-        """隐藏事件"""
-        super().hideEvent(event)
-        # 停止定时器
-        self.refresh_timer.stop()
+        # 隐藏期间数据库发生过变化时刷新状态
+        if self._status_dirty:
+            self.refresh_db_status()
+            
+    def shutdown(self):
+        """停止监视数据库，取消后台任务并等待工作线程结束，在程序退出前调用"""
+        self.db_watcher.unwatch(self._watched_path)
+        self._watched_path = None
+        self.job_runner.shutdown()
 
 
 class KeyValueDialog(QDialog):
@@ -0,0 +1,288 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class JobCancelled(Exception):
+    """任务已取消"""
+
+
+class JobSignals(QObject):
+    """后台任务信号，在GUI线程中创建，信号会被排队投递到GUI线程"""
+    
+    # 进度信号，参数为 (已完成数量, 总数量)，总数量未知时为0
+    progress = pyqtSignal(int, int)
+    # 完成信号，参数为任务函数的返回值
+    finished = pyqtSignal(object)
+    # 失败信号，参数为错误信息
+    failed = pyqtSignal(str)
+    # 取消信号
+    cancelled = pyqtSignal()
+
+
+class Job(QRunnable):
+    """在线程池中执行的后台任务
+    
+    任务函数的第一个参数是任务本身，可以通过它汇报进度和检查是否已取消。
+    """
+    
+    def __init__(self, fn, args=(), kwargs=None, channel=None):
+        """初始化后台任务
+        
+        Args:
+            fn: 任务函数，签名为 fn(job, *args, **kwargs)
+            args: 位置参数
+            kwargs: 关键字参数
+            channel: 任务通道，同一通道中新任务会取代旧任务
+        """
+        super().__init__()
+        # 由JobRunner持有引用，避免Qt在任务结束后删除仍被Python引用的对象
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.channel = channel
+        self.signals = JobSignals()
+        # 取消回调，由JobRunner在GUI线程中调用
+        self.on_cancelled = None
+        self._cancel_event = threading.Event()
+        
+    def cancel(self):
+        """请求取消任务，正在执行的任务会在下一次汇报进度时停止"""
+        self._cancel_event.set()
+        
+    def is_cancelled(self):
+        """任务是否已被取消
+        
+        Returns:
+            bool: 是否已取消
+        """
+        return self._cancel_event.is_set()
+        
+    def report_progress(self, done, total=0):
+        """汇报任务进度
+        
+        Args:
+            done: 已完成数量
+            total: 总数量，未知时为0
+            
+        Raises:
+            JobCancelled: 任务已被取消
+        """
+        if self.is_cancelled():
+            raise JobCancelled()
+        self.signals.progress.emit(done, total)
+        
+    def run(self):
+        """执行任务函数并通过信号返回结果"""
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+            return
+            
+        try:
+            result = self.fn(self, *self.args, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+            else:
+                self.signals.failed.emit(str(e))
+            return
+            
+        if self.is_cancelled():
+            self.signals.cancelled.emit()
+        else:
+            self.signals.finished.emit(result)
+
+
+class JobRunner(QObject):
+    """后台任务调度器
+    
+    在独立的线程池中执行任务，并在GUI线程中回调结果。
+    提交到同一通道的新任务会取消旧任务，旧任务的结果不会再回调。
+    """
+    
+    # 队列深度变化信号，参数为未完成的任务数量
+    queue_depth_changed = pyqtSignal(int)
+    
+    def __init__(self, max_threads=2, parent=None):
+        """初始化后台任务调度器
+        
+        Args:
+            max_threads: 最大工作线程数
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        # 工作线程常驻，线程内的数据库连接可以一直复用
+        self.pool.setExpiryTimeout(-1)
+        
+        # 未完成的任务
+        self._active = set()
+        # 每个通道中最新的任务
+        self._latest = {}
+        
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "superseded": 0,
+            "max_depth": 0
+        }
+        
+    def submit(self, fn, *args, channel=None, on_result=None, on_error=None, on_progress=None,
+               on_cancelled=None, **kwargs):
+        """提交后台任务
+        
+        Args:
+            fn: 任务函数，签名为 fn(job, *args, **kwargs)
+            *args: 位置参数
+            channel: 任务通道，为None时不与其他任务合并
+            on_result: 完成回调，参数为任务函数的返回值
+            on_error: 失败回调，参数为错误信息
+            on_progress: 进度回调，参数为 (已完成数量, 总数量)
+            on_cancelled: 取消回调，任务被取消、被取代或结果被丢弃时调用
+            **kwargs: 关键字参数
+            
+        Returns:
+            Job: 已提交的任务
+        """
+        if channel is not None:
+            previous = self._latest.get(channel)
+            if previous is not None and previous in self._active:
+                self._supersede(previous)
+                
+        job = Job(fn, args, kwargs, channel)
+        job.on_cancelled = on_cancelled
+        job.signals.finished.connect(lambda result: self._on_finished(job, result, on_result))
+        job.signals.failed.connect(lambda message: self._on_failed(job, message, on_error))
+        job.signals.cancelled.connect(lambda: self._on_cancelled(job))
+        if on_progress is not None:
+            job.signals.progress.connect(lambda done, total: self._on_progress(job, done, total, on_progress))
+            
+        self._active.add(job)
+        if channel is not None:
+            self._latest[channel] = job
+        self._stats["submitted"] += 1
+        self._stats["max_depth"] = max(self._stats["max_depth"], len(self._active))
+        self.queue_depth_changed.emit(len(self._active))
+        
+        self.pool.start(job)
+        return job
+        
+    def _supersede(self, job):
+        """取消被新任务取代的旧任务
+        
+        Args:
+            job: 旧任务
+        """
+        job.cancel()
+        self._stats["superseded"] += 1
+        # 尚未开始执行的任务直接从队列中移除
+        if self.pool.tryTake(job):
+            self._on_cancelled(job)
+            
+    def _is_current(self, job):
+        """任务的结果是否仍需要回调
+        
+        Args:
+            job: 任务
+            
+        Returns:
+            bool: 没有被取消且没有被同通道的新任务取代时返回True
+        """
+        if job.is_cancelled():
+            return False
+        return job.channel is None or self._latest.get(job.channel) is job
+        
+    def _finish(self, job):
+        """将任务从未完成集合中移除
+        
+        Args:
+            job: 任务
+        """
+        if job in self._active:
+            self._active.discard(job)
+            if job.channel is not None and self._latest.get(job.channel) is job:
+                del self._latest[job.channel]
+            self.queue_depth_changed.emit(len(self._active))
+            
+    def _on_finished(self, job, result, callback):
+        if not self._is_current(job):
+            self._on_cancelled(job)
+            return
+        self._finish(job)
+        self._stats["completed"] += 1
+        if callback is not None:
+            callback(result)
+            
+    def _on_failed(self, job, message, callback):
+        if not self._is_current(job):
+            self._on_cancelled(job)
+            return
+        self._finish(job)
+        self._stats["failed"] += 1
+        if callback is not None:
+            callback(message)
+            
+    def _on_cancelled(self, job):
+        if job not in self._active:
+            return
+        self._finish(job)
+        self._stats["cancelled"] += 1
+        if job.on_cancelled is not None:
+            job.on_cancelled()
+        
+    def _on_progress(self, job, done, total, callback):
+        if self._is_current(job):
+            callback(done, total)
+            
+    def cancel(self, channel):
+        """取消指定通道中的任务
+        
+        Args:
+            channel: 任务通道
+        """
+        job = self._latest.get(channel)
+        if job is not None and job in self._active:
+            job.cancel()
+            
+    def cancel_all(self):
+        """取消所有未完成的任务"""
+        for job in list(self._active):
+            job.cancel()
+            if self.pool.tryTake(job):
+                self._on_cancelled(job)
+                
+    def queue_depth(self):
+        """获取未完成的任务数量
+        
+        Returns:
+            int: 未完成的任务数量
+        """
+        return len(self._active)
+        
+    def get_stats(self):
+        """获取任务统计信息
+        
+        Returns:
+            dict: 提交、完成、失败、取消、被取代的任务数量及当前/最大队列深度
+        """
+        stats = dict(self._stats)
+        stats["depth"] = len(self._active)
+        return stats
+        
+    def shutdown(self, timeout_ms=3000):
+        """取消所有任务并等待工作线程结束
+        
+        Args:
+            timeout_ms: 最长等待时间（毫秒）
+            
+        Returns:
+            bool: 是否所有任务都已结束
+        """
+        self.cancel_all()
+        return self.pool.waitForDone(timeout_ms)
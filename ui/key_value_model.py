@@ -0,0 +1,291 @@
+from bisect import bisect_left
+from itertools import islice
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant, pyqtSignal
+
+
+class KeyValueTableModel(QAbstractTableModel):
+    """键值对表格模型
+    
+    数据来自一个按键顺序产出 (键, 值) 的迭代器，视图滚动到底部时
+    通过canFetchMore/fetchMore按批拉取，不会一次性加载整张表。
+    设置了后台任务调度器时，每一批数据都在工作线程中读取。
+    """
+    
+    # 数据加载失败信号，参数为错误信息
+    load_failed = pyqtSignal(str)
+    
+    HEADERS = ["键", "值"]
+    
+    # 每次拉取的行数
+    FETCH_BATCH = 500
+    # 单元格中显示的最大字符数，超出部分省略
+    DISPLAY_LIMIT = 200
+    # 提示框中显示的最大字符数
+    TOOLTIP_LIMIT = 2000
+    
+    def __init__(self, parent=None):
+        """初始化键值对表格模型
+        
+        Args:
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self._rows = []
+        self._source = None
+        self._exhausted = True
+        # 数据来源是否为按键排序的整张表，此时新增的键可以插入到对应位置
+        self._ordered = False
+        # 是否有一批数据正在后台读取
+        self._loading = False
+        # 读取任务被取消时已从数据来源取出的行，下次读取时先放回批次开头
+        self._carry = []
+        self._runner = None
+        
+    def set_runner(self, runner, channel="key_value_fetch"):
+        """设置后台任务调度器，之后的数据读取都在工作线程中进行
+        
+        Args:
+            runner: JobRunner实例
+            channel: 读取任务使用的通道
+        """
+        self._runner = runner
+        self._channel = channel
+        
+    def set_source(self, source, ordered=False):
+        """设置数据来源并清空已加载的行
+        
+        Args:
+            source: 产出 (键, 值) 的可迭代对象，为None时清空表格
+            ordered: 数据来源是否为按键排序的整张表
+        """
+        self.beginResetModel()
+        self._rows = []
+        self._source = iter(source) if source is not None else None
+        self._exhausted = source is None
+        self._ordered = ordered
+        # 旧数据来源仍在读取的批次会在返回时被丢弃
+        self._loading = False
+        self._carry = []
+        self.endResetModel()
+        
+    def clear(self):
+        """清空表格"""
+        self.set_source(None)
+        
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+        
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+        
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return not self._exhausted
+        
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._loading:
+            return
+            
+        source = self._source
+        batch, self._carry = self._carry, []
+        if self._runner is not None:
+            self._loading = True
+            self._runner.submit(
+                lambda job: self._read_batch(source, batch),
+                channel=self._channel,
+                on_result=lambda result: self._append_batch(source, result),
+                on_error=lambda message: self._fail(source, message),
+                on_cancelled=lambda: self._cancel_batch(source, batch)
+            )
+            return
+            
+        try:
+            batch = self._read_batch(source, batch)
+        except Exception as e:
+            self._fail(source, str(e))
+            return
+        self._append_batch(source, batch)
+        
+    def _read_batch(self, source, batch):
+        """从数据来源读取数据，补足一批
+        
+        读取到的行直接追加到batch中，任务被取消时已取出的行不会丢失。
+        
+        Args:
+            source: 数据来源迭代器
+            batch: 已有的 (键, 值文本) 列表
+            
+        Returns:
+            list: (键, 值文本) 列表
+        """
+        for key, value in islice(source, self.FETCH_BATCH - len(batch)):
+            batch.append((key, self._to_text(value)))
+        return batch
+        
+    def _cancel_batch(self, source, batch):
+        """读取任务被取消，保留已取出的行供下次读取
+        
+        Args:
+            source: 读取时的数据来源
+            batch: 已取出的 (键, 值文本) 列表
+        """
+        if source is not self._source:
+            return
+        self._loading = False
+        self._carry = batch
+        
+    def _fail(self, source, message):
+        """数据读取失败
+        
+        Args:
+            source: 读取时的数据来源
+            message: 错误信息
+        """
+        if source is not self._source:
+            return
+        self._loading = False
+        self._exhausted = True
+        self.load_failed.emit(message)
+        
+    def _append_batch(self, source, batch):
+        """将读取到的一批数据追加到表格末尾
+        
+        Args:
+            source: 读取时的数据来源，与当前来源不同时丢弃该批数据
+            batch: (键, 值文本) 列表
+        """
+        if source is not self._source:
+            return
+        self._loading = False
+        
+        if len(batch) < self.FETCH_BATCH:
+            self._exhausted = True
+        if not batch:
+            return
+            
+        start = len(self._rows)
+        self.beginInsertRows(QModelIndex(), start, start + len(batch) - 1)
+        self._rows.extend(batch)
+        self.endInsertRows()
+        
+    def apply_changes(self, diff):
+        """只更新发生变化的行
+        
+        修改和删除的键只影响已加载的行。新增的键只在数据来源为整张表时插入，
+        并且位于尚未加载的范围内的键留给后续的fetchMore读取。
+        
+        Args:
+            diff: 变化内容，包含 added {键: 值}、modified {键: 值}、removed [键]
+        """
+        positions = {row[0]: i for i, row in enumerate(self._rows)}
+        
+        for key, value in diff.get("modified", {}).items():
+            row = positions.get(key)
+            if row is None:
+                continue
+            self._rows[row] = (key, self._to_text(value))
+            self.dataChanged.emit(self.index(row, 0), self.index(row, 1))
+            
+        # 从后往前删除，前面的行号不受影响
+        removed = sorted((positions[key] for key in diff.get("removed", []) if key in positions), reverse=True)
+        for row in removed:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+            
+        if not self._ordered:
+            return
+        keys = [row[0] for row in self._rows]
+        for key in sorted(diff.get("added", {})):
+            if not self._exhausted and (not keys or key > keys[-1]):
+                break
+            row = bisect_left(keys, key)
+            if row < len(keys) and keys[row] == key:
+                continue
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.insert(row, (key, self._to_text(diff["added"][key])))
+            keys.insert(row, key)
+            self.endInsertRows()
+            
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+            
+        text = self._rows[index.row()][index.column()]
+        if role == Qt.DisplayRole:
+            # 只把前面一段交给视图绘制，长值在此处省略
+            if len(text) > self.DISPLAY_LIMIT:
+                return text[:self.DISPLAY_LIMIT] + "…"
+            return text
+        if role == Qt.ToolTipRole:
+            if len(text) > self.TOOLTIP_LIMIT:
+                return text[:self.TOOLTIP_LIMIT] + "…"
+            return text
+        return QVariant()
+        
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return QVariant()
+        
+    def row_key(self, row):
+        """获取指定行的键
+        
+        Args:
+            row: 行号
+            
+        Returns:
+            str: 键
+        """
+        return self._rows[row][0]
+        
+    def row_value(self, row):
+        """获取指定行完整的值文本
+        
+        Args:
+            row: 行号
+            
+        Returns:
+            str: 值
+        """
+        return self._rows[row][1]
+        
+    def sample_keys(self, count=50):
+        """取已加载的前若干个键，用于估算列宽
+        
+        Args:
+            count: 采样数量
+            
+        Returns:
+            list: 键列表
+        """
+        return [row[0] for row in self._rows[:count]]
+        
+    def is_exhausted(self):
+        """数据来源是否已全部加载
+        
+        Returns:
+            bool: 是否已全部加载
+        """
+        return self._exhausted
+        
+    @staticmethod
+    def _to_text(value):
+        """将数据库中的值转换为显示文本
+        
+        Args:
+            value: 原始值或LazyJsonValue
+            
+        Returns:
+            str: 显示文本
+        """
+        if isinstance(value, bytes):
+            return value.decode("utf-8", errors="replace")
+        if value is None:
+            return ""
+        return str(value)
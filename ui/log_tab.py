@@ -2,15 +2,23 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                         QLabel, QTableWidget, QTableWidgetItem, QGroupBox, 
                         QFormLayout, QLineEdit, QComboBox, QCheckBox, 
                         QTextEdit, QFileDialog, QMessageBox, QSpinBox,
-                        QSplitter, QTabWidget)
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QTextCursor
+                        QSplitter, QTabWidget, QDateTimeEdit)
+from PyQt5.QtCore import Qt, QTimer, QDateTime, pyqtSignal
+from PyQt5.QtGui import QColor, QTextCursor, QTextCharFormat
 from utils.logger import LoggerManager
+from utils.log_search import LogSearchEngine
+from ui.job_runner import JobRunner
 import os
+import re
 
 class LogTab(QWidget):
     """日志查看选项卡"""
     
+    # 搜索结果批次信号，参数为 (搜索编号, 搜索结果列表)，由搜索任务在工作线程中发出
+    search_batch = pyqtSignal(int, object)
+    # 日志文件批次信号，参数为 (加载编号, 从新到旧排列的日志列表)，由加载任务在工作线程中发出
+    file_batch = pyqtSignal(int, object)
+    
     # 日志级别对应的颜色
     LEVEL_COLORS = {
         "DEBUG": QColor(128, 191, 255),     # 浅蓝色
@@ -21,6 +29,18 @@ class LogTab(QWidget):
         "CRITICAL": QColor(255, 0, 0)       # 鲜红色
     }
     
+    # 未知级别使用的颜色
+    DEFAULT_COLOR = QColor(220, 220, 220)   # 浅灰色
+    
+    # INFO日志中包含这些词时按成功日志着色
+    SUCCESS_KEYWORDS = ["成功", "完成", "已创建", "已更新"]
+    
+    # 加载日志文件时每批显示的行数
+    FILE_BATCH_SIZE = 200
+    
+    # 搜索结果每批显示的条数
+    SEARCH_BATCH_SIZE = 200
+    
     def __init__(self, logger_manager=None, parent=None):
         """初始化日志选项卡
         
@@ -33,12 +53,27 @@ class LogTab(QWidget):
         # 获取日志管理器实例
         self.logger_manager = logger_manager or LoggerManager()
         
+        # 已显示到的日志序号和当前显示的日志条数
+        self._rendered_seq = 0
+        self._rendered_count = 0
+        
+        # 日志级别 -> 文本格式
+        self._formats = {}
+        
+        # 日志文件加载和跨文件日志搜索都在后台任务中执行，各占一个工作线程
+        self.search_engine = LogSearchEngine()
+        self.job_runner = JobRunner(max_threads=2, parent=self)
+        self._file_scan_id = 0
+        self.file_batch.connect(self.on_file_batch)
+        self._search_id = 0
+        self.search_batch.connect(self.on_search_batch)
+        
         # 创建UI
         self.setup_ui()
         
-        # 创建定时器，实时刷新日志
+        # 创建定时器，每秒追加新日志
         self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.refresh_log_display)
+        self.refresh_timer.timeout.connect(self.append_new_logs)
         self.refresh_timer.start(1000)  # 每秒刷新一次
         
         # 初始加载日志
@@ -138,20 +173,83 @@ class LogTab(QWidget):
         self.load_file_btn.clicked.connect(self.load_log_file)
         file_buttons.addWidget(self.load_file_btn)
         
+        # 日志文件列表，包括滚动产生的旧日志和压缩后的日志
+        self.file_combo = QComboBox()
+        self.file_combo.setMinimumWidth(220)
+        self.file_combo.activated.connect(self.on_file_selected)
+        file_buttons.addWidget(self.file_combo)
+        
         self.file_info_label = QLabel("当前日志文件: 无")
         file_buttons.addWidget(self.file_info_label)
         
         file_buttons.addStretch()
         
+        # 启用结构化日志后可以按块索引跳转到指定时间
+        self.jump_time_edit = QDateTimeEdit(QDateTime.currentDateTime().addSecs(-3600))
+        self.jump_time_edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+        self.jump_time_edit.setCalendarPopup(True)
+        file_buttons.addWidget(self.jump_time_edit)
+        
+        self.jump_btn = QPushButton("跳转到时间")
+        self.jump_btn.clicked.connect(self.jump_to_time)
+        file_buttons.addWidget(self.jump_btn)
+        
+        jsonl_enabled = bool(self.logger_manager.jsonl_file)
+        self.jump_time_edit.setEnabled(jsonl_enabled)
+        self.jump_btn.setEnabled(jsonl_enabled)
+        if not jsonl_enabled:
+            self.jump_btn.setToolTip("需要在系统配置中启用结构化日志（logging.jsonl）")
+        
         self.open_log_dir_btn = QPushButton("打开日志目录")
         self.open_log_dir_btn.clicked.connect(self.open_log_directory)
         file_buttons.addWidget(self.open_log_dir_btn)
         
         file_layout.addLayout(file_buttons)
         
+        # 创建日志搜索选项卡
+        self.search_tab = QWidget()
+        search_layout = QVBoxLayout(self.search_tab)
+        
+        search_bar = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("在所有日志文件中搜索，级别和来源使用上方的过滤条件")
+        self.search_edit.returnPressed.connect(self.start_search)
+        search_bar.addWidget(self.search_edit)
+        
+        self.regex_check = QCheckBox("正则表达式")
+        search_bar.addWidget(self.regex_check)
+        
+        self.case_check = QCheckBox("区分大小写")
+        search_bar.addWidget(self.case_check)
+        
+        self.search_btn = QPushButton("搜索")
+        self.search_btn.clicked.connect(self.start_search)
+        search_bar.addWidget(self.search_btn)
+        
+        self.stop_search_btn = QPushButton("停止")
+        self.stop_search_btn.setEnabled(False)
+        self.stop_search_btn.clicked.connect(self.stop_search)
+        search_bar.addWidget(self.stop_search_btn)
+        
+        search_layout.addLayout(search_bar)
+        
+        self.search_table = QTableWidget(0, 6)
+        self.search_table.setHorizontalHeaderLabels(["时间", "级别", "来源", "消息", "文件", "偏移"])
+        self.search_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.search_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.search_table.verticalHeader().setVisible(False)
+        self.search_table.horizontalHeader().setStretchLastSection(False)
+        self.search_table.setColumnWidth(0, 170)
+        self.search_table.setColumnWidth(3, 480)
+        search_layout.addWidget(self.search_table)
+        
+        self.search_status_label = QLabel("输入搜索内容后按回车")
+        search_layout.addWidget(self.search_status_label)
+        
         # 添加选项卡
         self.log_tabs.addTab(self.realtime_tab, "实时日志")
         self.log_tabs.addTab(self.file_tab, "文件日志")
+        self.log_tabs.addTab(self.search_tab, "日志搜索")
         
         layout.addWidget(self.log_tabs)
         
@@ -359,132 +457,396 @@ class LogTab(QWidget):
         self.log_text.setStyleSheet(log_text_style)
         self.file_log_text.setStyleSheet(log_text_style)
         
-    def refresh_log_display(self):
-        """刷新日志显示"""
-        # 获取过滤条件
-        level_idx = self.level_combo.currentIndex()
-        level_filter = self.level_combo.itemData(level_idx)
+    def get_filters(self):
+        """获取当前的过滤条件
         
-        source_filter = self.source_edit.text().strip()
-        source_filter = source_filter if source_filter else None
-        
-        keyword_filter = self.keyword_edit.text().strip()
+        Returns:
+            tuple: (日志级别, 日志来源, 小写的关键字)，未设置的条件为None
+        """
+        level_filter = self.level_combo.itemData(self.level_combo.currentIndex())
+        source_filter = self.source_edit.text().strip() or None
+        keyword_filter = self.keyword_edit.text().strip().lower() or None
+        return level_filter, source_filter, keyword_filter
         
-        max_lines = self.max_lines_spin.value()
+    def fetch_logs(self, since_seq=0):
+        """获取序号大于since_seq且符合过滤条件的日志
         
-        # 获取日志
-        logs = self.logger_manager.get_recent_logs(max_count=max_lines, level=level_filter, source=source_filter)
+        Args:
+            since_seq: 上次显示到的序号
+            
+        Returns:
+            tuple: (日志消息列表, 最新序号)
+        """
+        level_filter, source_filter, keyword_filter = self.get_filters()
+        logs, last_seq = self.logger_manager.get_logs_since(since_seq, level=level_filter, source=source_filter)
         
         # 应用关键字过滤
         if keyword_filter:
-            logs = [log for log in logs if keyword_filter.lower() in str(log).lower()]
-            
-        # 清空文本显示
+            logs = [log for log in logs if keyword_filter in str(log).lower()]
+        return logs, last_seq
+        
+    def refresh_log_display(self):
+        """按当前过滤条件重新显示全部日志，过滤条件变化或手动刷新时调用"""
+        max_lines = self.max_lines_spin.value()
+        logs, last_seq = self.fetch_logs()
+        logs = logs[-max_lines:]
+        
+        # 超过显示行数时由文档自动删除最旧的行
         self.log_text.clear()
+        self.log_text.document().setMaximumBlockCount(max_lines)
+        self._rendered_count = 0
+        self._rendered_seq = last_seq
+        self.insert_logs(logs)
+        
+    def append_new_logs(self):
+        """追加上次显示之后的新日志，没有新日志时直接返回"""
+        if self.logger_manager.get_last_seq() == self._rendered_seq:
+            return
+        logs, last_seq = self.fetch_logs(self._rendered_seq)
+        self._rendered_seq = last_seq
+        if logs:
+            self.insert_logs(logs)
             
-        # 定义显示格式
-        for log in logs:
-            # 设置颜色
-            if hasattr(log, 'level'):
-                # 检查是否包含"成功"或"完成"等关键词
-                if log.level == "INFO" and any(keyword in log.message.lower() for keyword in ["成功", "完成", "已创建", "已更新"]):
-                    self.log_text.setTextColor(self.LEVEL_COLORS["SUCCESS"])
-                elif log.level in self.LEVEL_COLORS:
-                    self.log_text.setTextColor(self.LEVEL_COLORS[log.level])
-                else:
-                    self.log_text.setTextColor(QColor(220, 220, 220))  # 默认浅灰色
-            else:
-                self.log_text.setTextColor(QColor(220, 220, 220))  # 默认浅灰色
+    def insert_logs(self, logs):
+        """在一次编辑中把日志追加到显示末尾
+        
+        Args:
+            logs: 日志消息列表
+        """
+        if logs:
+            cursor = QTextCursor(self.log_text.document())
+            cursor.movePosition(QTextCursor.End)
+            cursor.beginEditBlock()
+            for log in logs:
+                if self._rendered_count > 0:
+                    cursor.insertBlock()
+                cursor.insertText(str(log), self.get_log_format(log))
+                self._rendered_count += 1
+            cursor.endEditBlock()
+            self._rendered_count = min(self._rendered_count, self.max_lines_spin.value())
+            
+            # 如果启用了自动滚动，则滚动到底部
+            if self.auto_scroll_check.isChecked():
+                self.log_text.moveCursor(QTextCursor.End)
                 
-            self.log_text.append(str(log))
-            
         # 更新状态标签
-        self.status_label.setText(f"日志统计: {len(logs)}条日志")
+        self.status_label.setText(f"日志统计: {self._rendered_count}条日志")
+        
+    def get_log_format(self, log):
+        """获取日志对应的文本格式
         
-        # 如果启用了自动滚动，则滚动到底部
-        if self.auto_scroll_check.isChecked():
-            self.log_text.moveCursor(QTextCursor.End)
+        Args:
+            log: 日志消息
+            
+        Returns:
+            QTextCharFormat: 文本格式
+        """
+        level = getattr(log, "level", None)
+        # 检查是否包含"成功"或"完成"等关键词
+        if level == "INFO" and any(keyword in log.message.lower() for keyword in self.SUCCESS_KEYWORDS):
+            level = "SUCCESS"
+            
+        text_format = self._formats.get(level)
+        if text_format is None:
+            text_format = QTextCharFormat()
+            text_format.setForeground(self.LEVEL_COLORS.get(level, self.DEFAULT_COLOR))
+            self._formats[level] = text_format
+        return text_format
         
     def load_log_file(self):
-        """加载日志文件"""
+        """刷新日志文件列表并加载选中的日志文件"""
         log_files = self.logger_manager.get_log_files()
         if not log_files:
+            self.file_combo.clear()
             QMessageBox.information(self, "提示", "没有找到日志文件")
             return
             
-        # 默认加载最新的日志文件
-        current_file = log_files[0]
-        self.load_file_content(current_file)
+        # 保留之前选中的文件，否则默认加载最新的日志文件
+        selected = self.file_combo.currentData()
+        self.file_combo.blockSignals(True)
+        self.file_combo.clear()
+        for file_path in log_files:
+            self.file_combo.addItem(os.path.basename(file_path), file_path)
+        index = self.file_combo.findData(selected) if selected else -1
+        self.file_combo.setCurrentIndex(max(index, 0))
+        self.file_combo.blockSignals(False)
+        self.load_file_content(self.file_combo.currentData())
+        
+    def on_file_selected(self, index):
+        """选择日志文件后加载该文件"""
+        file_path = self.file_combo.itemData(index)
+        if file_path:
+            self.load_file_content(file_path)
         
     def load_file_content(self, file_path):
         """加载文件内容
         
+        在后台任务中从文件末尾向前查找符合过滤条件的日志，每找到一批就插入到显示的开头，
+        大文件也不需要读完整个文件，过滤条件很少匹配时界面在加载期间同样保持响应。
+        
         Args:
             file_path: 文件路径
         """
-        try:
-            # 获取过滤条件
-            level_idx = self.level_combo.currentIndex()
-            level_filter = self.level_combo.itemData(level_idx)
-            
-            source_filter = self.source_edit.text().strip()
-            source_filter = source_filter if source_filter else None
-            
-            keyword_filter = self.keyword_edit.text().strip()
-            
-            max_lines = self.max_lines_spin.value()
-            
-            # 清空文本显示
-            self.file_log_text.clear()
+        # 停止上一次尚未完成的加载
+        self.stop_file_scan()
+        
+        level_filter, source_filter, keyword_filter = self.get_filters()
+        self.file_log_text.clear()
+        scan_id = self._file_scan_id
+        self.file_info_label.setText(f"当前日志文件: {os.path.basename(file_path)} (加载中...)")
+        self.job_runner.submit(
+            self.run_file_scan, scan_id, file_path, level_filter, source_filter, keyword_filter,
+            self.max_lines_spin.value(),
+            channel="log_file_scan",
+            on_result=lambda count: self.on_file_scan_finished(scan_id, file_path),
+            on_error=lambda message: self.on_file_scan_failed(scan_id, message)
+        )
+        
+    def run_file_scan(self, job, scan_id, file_path, level, source, keyword, max_lines):
+        """读取日志文件并分批发出结果（在工作线程中执行）
+        
+        Args:
+            job: 后台任务
+            scan_id: 加载编号
+            file_path: 文件路径
+            level: 过滤的日志级别
+            source: 过滤的日志来源
+            keyword: 过滤的关键字
+            max_lines: 最多加载的行数
             
-            # 读取文件
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()[-max_lines:]
-                
-                for line in lines:
-                    # 应用关键字过滤
-                    if keyword_filter and keyword_filter.lower() not in line.lower():
-                        continue
-                        
-                    # 设置颜色
-                    color = QColor(220, 220, 220)  # 默认浅灰色
-                    for level, level_color in self.LEVEL_COLORS.items():
-                        if f" {level} " in line:
-                            color = level_color
-                            # 检查是否包含"成功"或"完成"等关键词
-                            if level == "INFO" and any(keyword in line.lower() for keyword in ["成功", "完成", "已创建", "已更新"]):
-                                color = self.LEVEL_COLORS["SUCCESS"]
-                            break
-                            
-                    # 应用过滤
-                    if level_filter and f" {level_filter} " not in line:
-                        continue
-                    if source_filter and f"[{source_filter}]" not in line:
-                        continue
-                        
-                    # 添加日志行
-                    self.file_log_text.setTextColor(color)
-                    self.file_log_text.append(line.strip())
-                    
-            # 更新文件信息
+        Returns:
+            int: 加载的行数
+        """
+        batch = []
+        count = 0
+        scan = self.logger_manager.iter_log_file(file_path, level=level, source=source, keyword=keyword)
+        try:
+            for log in scan:
+                if count >= max_lines:
+                    break
+                batch.append(log)
+                count += 1
+                if len(batch) >= self.FILE_BATCH_SIZE:
+                    self.file_batch.emit(scan_id, batch)
+                    job.report_progress(count)
+                    batch = []
+        finally:
+            scan.close()
+        if batch:
+            self.file_batch.emit(scan_id, batch)
+        return count
+        
+    def on_file_batch(self, scan_id, batch):
+        """将一批日志插入到已显示内容之前
+        
+        Args:
+            scan_id: 加载编号，不是最新的加载时忽略
+            batch: 从新到旧排列的日志列表
+        """
+        if scan_id != self._file_scan_id:
+            return
+        cursor = QTextCursor(self.file_log_text.document())
+        cursor.movePosition(QTextCursor.Start)
+        has_content = not self.file_log_text.document().isEmpty()
+        cursor.beginEditBlock()
+        for index, log in enumerate(reversed(batch)):
+            if index > 0:
+                cursor.insertBlock()
+            cursor.insertText(str(log), self.get_log_format(log))
+        if has_content:
+            cursor.insertBlock()
+        cursor.endEditBlock()
+        
+        # 自动滚动到底部
+        self.file_log_text.moveCursor(QTextCursor.End)
+        
+    def on_file_scan_finished(self, scan_id, file_path):
+        """加载完成，更新文件信息
+        
+        Args:
+            scan_id: 加载编号
+            file_path: 文件路径
+        """
+        if scan_id != self._file_scan_id:
+            return
+        try:
             file_size = os.path.getsize(file_path)
-            if file_size < 1024:
-                size_str = f"{file_size} B"
-            elif file_size < 1024 * 1024:
-                size_str = f"{file_size / 1024:.2f} KB"
-            else:
-                size_str = f"{file_size / (1024 * 1024):.2f} MB"
-                
-            self.file_info_label.setText(f"当前日志文件: {os.path.basename(file_path)} ({size_str})")
-            
-            # 自动滚动到底部
-            cursor = self.file_log_text.textCursor()
-            cursor.movePosition(QTextCursor.End)
-            self.file_log_text.setTextCursor(cursor)
-            
-        except Exception as e:
-            QMessageBox.warning(self, "错误", f"加载日志文件失败: {str(e)}")
+        except OSError:
+            file_size = 0
+        if file_size < 1024:
+            size_str = f"{file_size} B"
+        elif file_size < 1024 * 1024:
+            size_str = f"{file_size / 1024:.2f} KB"
+        else:
+            size_str = f"{file_size / (1024 * 1024):.2f} MB"
             
+        self.file_info_label.setText(f"当前日志文件: {os.path.basename(file_path)} ({size_str})")
+        
+    def on_file_scan_failed(self, scan_id, message):
+        """加载失败
+        
+        Args:
+            scan_id: 加载编号
+            message: 错误信息
+        """
+        if scan_id != self._file_scan_id:
+            return
+        QMessageBox.warning(self, "错误", f"加载日志文件失败: {message}")
+        
+    def stop_file_scan(self):
+        """停止正在进行的日志文件加载"""
+        self.job_runner.cancel("log_file_scan")
+        # 已在排队中的批次不再显示
+        self._file_scan_id += 1
+        
+    def jump_to_time(self):
+        """显示从指定时间开始、符合过滤条件的日志"""
+        self.stop_file_scan()
+        level_filter, source_filter, keyword_filter = self.get_filters()
+        start_ts = self.jump_time_edit.dateTime().toMSecsSinceEpoch() / 1000
+        logs = self.logger_manager.read_log_range(
+            start_ts, level=level_filter, source=source_filter, keyword=keyword_filter,
+            max_records=self.max_lines_spin.value()
+        )
+        
+        self.file_log_text.clear()
+        cursor = QTextCursor(self.file_log_text.document())
+        cursor.beginEditBlock()
+        for index, log in enumerate(logs):
+            if index > 0:
+                cursor.insertBlock()
+            cursor.insertText(str(log), self.get_log_format(log))
+        cursor.endEditBlock()
+        
+        # 从指定时间开始显示，滚动到顶部
+        self.file_log_text.moveCursor(QTextCursor.Start)
+        self.file_info_label.setText(
+            f"当前日志文件: {os.path.basename(self.logger_manager.jsonl_file)} "
+            f"({self.jump_time_edit.dateTime().toString('yyyy-MM-dd HH:mm:ss')} 起 {len(logs)} 条)"
+        )
+        
+    def start_search(self):
+        """在所有日志文件中搜索，结果按时间先后分批显示"""
+        pattern = self.search_edit.text()
+        regex = self.regex_check.isChecked()
+        if regex:
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                QMessageBox.warning(self, "错误", f"正则表达式不正确: {e}")
+                return
+                
+        level_filter, source_filter, _ = self.get_filters()
+        # 先写入队列中尚未写入的日志
+        self.logger_manager.flush(self.logger_manager.READ_FLUSH_TIMEOUT)
+        files = self.search_engine.list_log_files(self.logger_manager.log_dir)
+        
+        self._search_id += 1
+        self.search_table.setRowCount(0)
+        self.search_status_label.setText(f"正在搜索{len(files)}个日志文件...")
+        self.search_btn.setEnabled(False)
+        self.stop_search_btn.setEnabled(True)
+        
+        options = {
+            "regex": regex,
+            "case_sensitive": self.case_check.isChecked(),
+            "level": level_filter,
+            "source": source_filter
+        }
+        self.job_runner.submit(
+            self.run_search, self._search_id, files, pattern, options, self.max_lines_spin.value(),
+            channel="log_search",
+            on_result=self.on_search_finished,
+            on_error=self.on_search_failed,
+            on_progress=self.on_search_progress
+        )
+        
+    def run_search(self, job, search_id, files, pattern, options, max_results):
+        """执行搜索并分批发出结果（在工作线程中执行）
+        
+        Args:
+            job: 后台任务
+            search_id: 搜索编号
+            files: 日志文件列表
+            pattern: 搜索内容
+            options: 搜索选项
+            max_results: 最多返回的结果数
+            
+        Returns:
+            int: 结果数量
+        """
+        batch = []
+        count = 0
+        for match in self.search_engine.iter_search(files, pattern, cancelled=job.is_cancelled, **options):
+            batch.append(match)
+            count += 1
+            if len(batch) >= self.SEARCH_BATCH_SIZE or count >= max_results:
+                self.search_batch.emit(search_id, batch)
+                job.report_progress(count)
+                batch = []
+            if count >= max_results:
+                break
+        if batch:
+            self.search_batch.emit(search_id, batch)
+        return count
+        
+    def on_search_batch(self, search_id, batch):
+        """在结果表格末尾追加一批搜索结果
+        
+        Args:
+            search_id: 搜索编号，不是最新的搜索时忽略
+            batch: 搜索结果列表
+        """
+        if search_id != self._search_id:
+            return
+        table = self.search_table
+        table.setUpdatesEnabled(False)
+        row = table.rowCount()
+        table.setRowCount(row + len(batch))
+        for match in batch:
+            log = match.log
+            color = self.get_log_format(log).foreground()
+            values = [log.time_str, log.level, log.source, log.message,
+                      os.path.basename(match.file), str(match.offset)]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 1:
+                    item.setForeground(color)
+                if column == 4:
+                    item.setToolTip(match.file)
+                table.setItem(row, column, item)
+            row += 1
+        table.setUpdatesEnabled(True)
+        
+    def on_search_progress(self, done, total):
+        """搜索进度更新"""
+        self.search_status_label.setText(f"正在搜索... 已找到{done}条")
+        
+    def on_search_finished(self, count):
+        """搜索完成"""
+        self.search_btn.setEnabled(True)
+        self.stop_search_btn.setEnabled(False)
+        stats = self.search_engine.get_stats()
+        self.search_status_label.setText(
+            f"找到{count}条日志（最多显示{self.max_lines_spin.value()}条），"
+            f"累计扫描{stats['files_scanned']}个文件，缓存命中{stats['cache_hits']}次"
+        )
+        
+    def on_search_failed(self, message):
+        """搜索失败"""
+        self.search_btn.setEnabled(True)
+        self.stop_search_btn.setEnabled(False)
+        self.search_status_label.setText(f"搜索失败: {message}")
+        
+    def stop_search(self):
+        """停止正在进行的搜索"""
+        self.job_runner.cancel("log_search")
+        # 已在排队中的结果批次不再显示
+        self._search_id += 1
+        self.search_btn.setEnabled(True)
+        self.stop_search_btn.setEnabled(False)
+        self.search_status_label.setText(f"已停止，显示{self.search_table.rowCount()}条结果")
+        
     def apply_filter(self):
         """应用过滤条件"""
         # 刷新显示
@@ -495,8 +857,11 @@ class LogTab(QWidget):
             self.load_log_file()
             
     def clear_display(self):
-        """清空显示内容"""
+        """清空显示内容，之后只显示新产生的日志"""
         self.log_text.clear()
+        self._rendered_count = 0
+        self._rendered_seq = self.logger_manager.get_last_seq()
+        self.status_label.setText("日志统计: 0条日志")
         
     def open_log_directory(self):
         """打开日志目录"""
@@ -522,8 +887,8 @@ class LogTab(QWidget):
     def showEvent(self, event):
         """显示事件"""
         super().showEvent(event)
-        # 刷新显示
-        self.refresh_log_display()
+        # 追加隐藏期间产生的日志
+        self.append_new_logs()
         # 重新启动定时器
         if not self.refresh_timer.isActive():
             self.refresh_timer.start(1000)
@@ -537,4 +902,6 @@ class LogTab(QWidget):
     def closeEvent(self, event):
         """关闭事件"""
         self.refresh_timer.stop()
+        self.stop_file_scan()
+        self.job_runner.shutdown()
         super().closeEvent(event) 
\ No newline at end of file
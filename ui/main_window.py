@@ -2,7 +2,7 @@ from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QVBoxLayout, QPushButton,
                         QLabel, QStatusBar, QHBoxLayout, QListWidget, QListWidgetItem, 
                         QGroupBox, QFormLayout, QLineEdit, QCheckBox, QMessageBox, QFileDialog,
                         QApplication)
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QFont, QPalette, QColor
 from core.browser import BrowserManager
 from core.automation import AutomationManager
@@ -18,6 +18,8 @@ from ui.system_config_tab import SystemConfigTab
 from ui.db_tab import DbTab
 from ui.account_tab import AccountTab
 from ui.auth_dialog import AuthDialog
+from ui.startup_dialog import StartupDialog
+from utils.startup import StartupTimeline
 import os
 import platform
 import webbrowser
@@ -30,20 +32,27 @@ import subprocess
 class MainWindow(QMainWindow):
     """主窗口类"""
     
-    def __init__(self, browser_manager, automation_manager):
+    # 选项卡创建信号，参数为 (选项卡属性名, 选项卡)，用于在选项卡按需创建后连接各组件
+    tab_created = pyqtSignal(str, object)
+    
+    def __init__(self, browser_manager, automation_manager, account_manager=None, startup=None):
         """初始化主窗口
         
         Args:
             browser_manager: 浏览器管理器实例
             automation_manager: 自动化管理器实例
+            account_manager: 账号管理器实例，为None时自动创建
+            startup: 启动编排器，选项卡依赖的组件未初始化完成时等待其完成后再创建
         """
         super().__init__()
         
         self.browser_manager = browser_manager
         self.automation_manager = automation_manager
-        # 创建账号管理器（如果外部没有传入，后续会被覆盖）
-        self.account_manager = AccountManagerDb()
+        # 创建账号管理器（如果外部没有传入）
+        self.account_manager = account_manager or AccountManagerDb()
         self.logger_manager = LoggerManager()
+        self.startup = startup
+        self.timeline = StartupTimeline()
         
         # 加载配置
         self.config = self.load_config()
@@ -358,6 +367,12 @@ class MainWindow(QMainWindow):
         # 初始化状态栏
         self.statusBar().showMessage("就绪")
         
+        # 查看启动时间线
+        self.startup_btn = QPushButton("启动耗时")
+        self.startup_btn.setFlat(True)
+        self.startup_btn.clicked.connect(self.show_startup_timeline)
+        self.statusBar().addPermanentWidget(self.startup_btn)
+        
         # 设置状态栏样式
         self.statusBar().setStyleSheet("""
             QStatusBar {
@@ -371,26 +386,88 @@ class MainWindow(QMainWindow):
         self.load_auth_data()
     
     def setup_other_tabs(self):
-        """设置其他选项卡"""
-        # 创建账号管理选项卡
-        self.account_tab = AccountTab(self.account_manager)
-        self.tabs.addTab(self.account_tab, "账号管理")
-        
-        # 创建进程管理选项卡
-        self.process_tab = ProcessTab()
-        self.tabs.addTab(self.process_tab, "进程管理")
-        
-        # 创建日志管理选项卡
-        self.log_tab = LogTab(self.logger_manager)
-        self.tabs.addTab(self.log_tab, "日志管理")
-        
-        # 创建系统配置选项卡
-        self.system_config_tab = SystemConfigTab()
-        self.tabs.addTab(self.system_config_tab, "系统配置")
-        
-        # 创建数据库管理选项卡
-        self.db_tab = DbTab()
-        self.tabs.addTab(self.db_tab, "数据库管理")
+        """设置其他选项卡
+        
+        选项卡在第一次切换到时才创建（各选项卡创建时会启动定时器和扫描数据库），
+        创建之前显示占位页面。创建好的选项卡保存在同名属性中，例如self.db_tab。
+        """
+        # 选项卡属性名 -> (标题, 创建函数, 依赖的启动组件)
+        self._lazy_tabs = {
+            "account_tab": ("账号管理", lambda: AccountTab(self.account_manager), ()),
+            "process_tab": ("进程管理", ProcessTab, ("系统配置",)),
+            "log_tab": ("日志管理", lambda: LogTab(self.logger_manager), ()),
+            "system_config_tab": ("系统配置", SystemConfigTab, ("系统配置",)),
+            "db_tab": ("数据库管理", DbTab, ("系统配置", "数据库管理器")),
+        }
+        # 占位页面 -> 选项卡属性名
+        self._placeholders = {}
+        for name, (title, _, _) in self._lazy_tabs.items():
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout(placeholder)
+            placeholder_label = QLabel("正在加载...")
+            placeholder_label.setAlignment(Qt.AlignCenter)
+            placeholder_layout.addWidget(placeholder_label)
+            self._placeholders[placeholder] = name
+            self.tabs.addTab(placeholder, title)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+        
+    def on_tab_changed(self, index):
+        """切换选项卡时创建尚未创建的选项卡
+        
+        Args:
+            index: 当前选项卡索引
+        """
+        name = self._placeholders.get(self.tabs.widget(index))
+        if name is not None:
+            self.ensure_tab(name)
+            
+    def ensure_tab(self, name):
+        """创建指定的选项卡（已创建时直接返回）
+        
+        选项卡依赖的启动组件还没有初始化完成时，等待完成后再创建，期间显示占位页面。
+        
+        Args:
+            name: 选项卡属性名，如"db_tab"
+            
+        Returns:
+            QWidget: 选项卡，尚未创建时返回None
+        """
+        tab = getattr(self, name, None)
+        if tab is not None:
+            return tab
+        title, factory, requires = self._lazy_tabs[name]
+        if self.startup is not None and not self.startup.is_ready(*requires):
+            self.startup.when_ready(requires, lambda: self.ensure_tab(name))
+            return None
+            
+        placeholder = next(widget for widget, tab_name in self._placeholders.items() if tab_name == name)
+        with self.timeline.measure(f"选项卡: {title}"):
+            tab = factory()
+        setattr(self, name, tab)
+        
+        # 用选项卡替换占位页面，替换期间不触发切换事件
+        index = self.tabs.indexOf(placeholder)
+        was_current = self.tabs.currentIndex() == index
+        self.tabs.blockSignals(True)
+        self.tabs.insertTab(index, tab, title)
+        self.tabs.removeTab(index + 1)
+        if was_current:
+            self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        del self._placeholders[placeholder]
+        placeholder.deleteLater()
+        
+        self.tab_created.emit(name, tab)
+        return tab
+        
+    def show_startup_timeline(self):
+        """显示启动耗时对话框"""
+        dialog = StartupDialog(self.timeline, self)
+        dialog.exec_()
+        
+    def on_startup_finished(self):
+        """后台初始化全部完成，在状态栏显示启动耗时"""
+        self.statusBar().showMessage(f"启动完成，用时 {self.timeline.elapsed_ms():.0f} ms", 10000)
     
     def load_config(self):
         """加载配置文件"""
@@ -791,4 +868,8 @@ class MainWindow(QMainWindow):
         except Exception as e:
             print(f"保存配置失败: {e}")
             
+        # 停止数据库标签页的后台任务（选项卡创建过才需要停止）
+        if getattr(self, "db_tab", None) is not None:
+            self.db_tab.shutdown()
+            
         event.accept()
\ No newline at end of file
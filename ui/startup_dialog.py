@@ -0,0 +1,74 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                        QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView)
+from PyQt5.QtCore import Qt
+from utils.startup import StartupTimeline
+
+class StartupDialog(QDialog):
+    """启动耗时对话框，显示启动时间线中每个组件的开始时间和耗时"""
+    
+    def __init__(self, timeline=None, parent=None):
+        """初始化对话框
+        
+        Args:
+            timeline: 启动时间线，为None时使用StartupTimeline单例
+            parent: 父窗口
+        """
+        super().__init__(parent)
+        self.timeline = timeline or StartupTimeline()
+        self.setWindowTitle("启动耗时")
+        self.resize(640, 420)
+        self.setup_ui()
+        self.refresh()
+        
+    def setup_ui(self):
+        """设置界面元素"""
+        layout = QVBoxLayout(self)
+        
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        
+        self.table = QTableWidget()
+        self.table.setColumnCount(5)
+        self.table.setHorizontalHeaderLabels(["组件", "开始(ms)", "耗时(ms)", "线程", "结果"])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setAlternatingRowColors(True)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+        
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.refresh_btn = QPushButton("刷新")
+        self.refresh_btn.clicked.connect(self.refresh)
+        button_layout.addWidget(self.refresh_btn)
+        self.close_btn = QPushButton("关闭")
+        self.close_btn.clicked.connect(self.accept)
+        button_layout.addWidget(self.close_btn)
+        layout.addLayout(button_layout)
+        
+    def refresh(self):
+        """重新读取启动时间线"""
+        entries = self.timeline.entries()
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            values = [
+                entry.name,
+                f"{entry.start_ms:.1f}",
+                f"{entry.duration_ms:.1f}",
+                entry.thread,
+                entry.status
+            ]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column in (1, 2):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+        self.table.resizeColumnsToContents()
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        
+        slowest = max(entries, key=lambda entry: entry.duration_ms, default=None)
+        summary = f"共 {len(entries)} 项"
+        if slowest is not None:
+            summary += f"，耗时最长: {slowest.name} {slowest.duration_ms:.1f} ms"
+        self.summary_label.setText(summary)
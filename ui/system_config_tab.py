@@ -4,9 +4,11 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                         QFileDialog, QTextEdit, QListWidget, QListWidgetItem,
                         QCheckBox, QSpinBox, QDialog, QDialogButtonBox, QHeaderView,
                         QComboBox)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSize
+from PyQt5.QtCore import Qt, pyqtSignal, QSize
 from PyQt5.QtGui import QIcon, QFont
 from utils.system_config import SystemConfigManager
+from core.db_watcher import DbWatcher
+from utils.config_watcher import ConfigWatcher
 import os
 import platform
 import sqlite3
@@ -28,6 +30,17 @@ class SystemConfigTab(QWidget):
         # 获取系统配置管理器
         self.system_config = SystemConfigManager()
         
+        # 监视Cursor数据库变化，只在数据库真正被修改时刷新状态
+        self.db_watcher = DbWatcher()
+        self.db_watcher.changed.connect(self.on_db_changed)
+        self._watched_db = None
+        # 隐藏期间数据库发生变化，显示时需要刷新状态
+        self._db_status_dirty = False
+        
+        # 配置文件被外部修改后刷新显示
+        self.config_watcher = ConfigWatcher()
+        self.config_watcher.config_changed.connect(self.on_config_changed)
+        
         # 创建UI
         self.setup_ui()
         
@@ -37,11 +50,6 @@ class SystemConfigTab(QWidget):
         # 设置Cursor和Chrome路径的默认值
         self.set_default_paths()
         
-        # 创建定时器，定期刷新数据库状态
-        self.refresh_timer = QTimer()
-        self.refresh_timer.timeout.connect(self.check_db_status)
-        self.refresh_timer.start(30000)  # 每30秒更新一次
-        
         # 设置主窗口样式
         self.setStyleSheet("""
             QWidget {
@@ -1132,6 +1140,11 @@ class SystemConfigTab(QWidget):
         
         self.system_config.set_config("chrome", "automation", automation_config)
         
+        # 以上修改合并为一次写入，立即写入文件以便确认结果
+        if not self.system_config.flush():
+            QMessageBox.warning(self, "错误", "保存系统配置文件失败，请查看日志")
+            return
+            
         # 禁用保存按钮
         self.save_btn.setEnabled(False)
         
@@ -1139,6 +1152,15 @@ class SystemConfigTab(QWidget):
         
     def check_db_status(self):
         """检查数据库状态"""
+        self._db_status_dirty = False
+        
+        # 数据库路径变化时切换监视的数据库
+        db_file = self.system_config.get_config("cursor", "db_file", "")
+        if db_file != self._watched_db:
+            self.db_watcher.unwatch(self._watched_db)
+            self.db_watcher.watch(db_file)
+            self._watched_db = db_file
+            
         status = self.system_config.check_cursor_db_status()
         
         # 更新UI
@@ -1408,20 +1430,45 @@ class SystemConfigTab(QWidget):
             else:
                 QMessageBox.warning(self, "错误", result["message"])
                 
+    def on_db_changed(self, db_path, diff):
+        """数据库被修改时刷新状态
+        
+        Args:
+            db_path: 被修改的数据库路径
+            diff: 变化内容
+        """
+        if not self._watched_db or db_path != os.path.abspath(self._watched_db):
+            return
+        if self.isVisible():
+            self.check_db_status()
+        else:
+            self._db_status_dirty = True
+            
+    def on_config_changed(self, config_file, paths):
+        """系统配置文件被外部修改时刷新显示
+        
+        界面上有尚未保存的修改时不覆盖，保存时这些修改与文件中的新值按路径合并。
+        
+        Args:
+            config_file: 配置文件路径
+            paths: 采用了文件中新值的配置路径列表
+        """
+        if config_file != os.path.abspath(self.system_config.config_file):
+            return
+        if self.save_btn.isEnabled():
+            return
+        self.load_config_data()
+        # Cursor路径变化时通知数据库选项卡并更新数据库状态
+        if any(path.startswith("cursor.") for path in paths):
+            self.config_updated.emit()
+            self.check_db_status()
+            
     def showEvent(self, event):
         """显示事件处理"""
         super().showEvent(event)
-        # 检查数据库状态
-        self.check_db_status()
-        # 启动定时器
-        if not self.refresh_timer.isActive():
-            self.refresh_timer.start(30000)
-        
-    def hideEvent(self, event):
-        """隐藏事件处理"""
-        super().hideEvent(event)
-        # 停止定时器
-        self.refresh_timer.stop()
+        # 隐藏期间数据库发生过变化时检查数据库状态
+        if self._db_status_dirty:
+            self.check_db_status()
         
     def set_default_paths(self):
         """设置默认路径"""
@@ -1,23 +1,47 @@
 import json
 import os
-import platform
+import atexit
 import sqlite3
 import shutil
-import subprocess
-from typing import Dict, Any, Optional, List
+import tempfile
+import threading
+from typing import Dict, Any, Optional, List, Iterable, Union
 from utils.logger import LoggerManager
+from utils.path_discovery import PathDiscovery
 
 class ConfigManager:
-    """配置管理器类，用于管理应用程序的配置"""
+    """配置管理器类，用于管理应用程序的配置
+    
+    修改配置时只在内存中更新并标记为待保存，同一个保存窗口内的多次修改合并为一次写入。
+    写入时先写临时文件并刷到磁盘，再替换原文件，中途退出不会留下写了一半的配置文件。
+    退出前调用flush()或flush_all()立即写入尚未保存的修改。
+    
+    读取配置使用展开后的视图: 完整的点分路径到值的字典，每次修改配置后版本号加一，
+    下一次读取时才重新生成，读取时不需要切分键和逐级查找。
+    
+    配置文件可能被外部编辑或被另一个实例修改。每个本地修改的路径记录修改时的版本号，
+    重新加载时与上次加载或保存时的文件内容逐个路径比较，只有本地没有未保存修改的路径
+    才采用文件中的新值；保存前发现文件已被修改时先合并，不会覆盖外部的修改。
+    """
     
     # 单例模式
     _instances = {}
     
+    # 第一次修改之后等待多久再写入文件（秒），期间的修改合并为一次写入
+    SAVE_DELAY = 0.5
+    
+    # 保护实例字典，组件可能在启动线程和GUI线程中同时创建
+    _instances_lock = threading.Lock()
+    
     def __new__(cls, config_file: str = "config/config.json"):
-        if config_file not in cls._instances:
-            cls._instances[config_file] = super(ConfigManager, cls).__new__(cls)
-            cls._instances[config_file]._initialized = False
-        return cls._instances[config_file]
+        with cls._instances_lock:
+            if config_file not in cls._instances:
+                instance = super(ConfigManager, cls).__new__(cls)
+                instance._initialized = False
+                # 初始化锁，另一个线程同时创建时等待初始化完成，不会重复加载配置和查找路径
+                instance._init_lock = threading.RLock()
+                cls._instances[config_file] = instance
+            return cls._instances[config_file]
     
     def __init__(self, config_file: str = "config/config.json"):
         """初始化配置管理器
@@ -28,18 +52,80 @@ class ConfigManager:
         # 避免重复初始化
         if self._initialized:
             return
-            
-        self.config_file = config_file
-        self.logger = LoggerManager()
-        self.config: Dict[str, Any] = {}
-        self.load_config()
+        with self._init_lock:
+            if self._initialized:
+                return
+            
+            self.config_file = config_file
+            self.logger = LoggerManager()
+            
+            # 展开的配置视图及其对应的版本号
+            self._version = 0
+            self._flat: Optional[Dict[str, Any]] = None
+            self._flat_version = -1
+            self.config: Dict[str, Any] = {}
+            
+            # 延迟保存状态
+            self._lock = threading.RLock()
+            self._write_lock = threading.Lock()
+            self._dirty = False
+            self._save_timer: Optional[threading.Timer] = None
+            
+            # 与配置文件合并用的状态: 本地修改的路径及其版本号、最后一次保存时的版本号、
+            # 上次加载或保存时文件中的叶子值和文件状态
+            self._path_versions: Dict[str, int] = {}
+            self._saved_version = 0
+            self._base_leaves: Dict[str, Any] = {}
+            self._disk_fingerprint = None
+            self._change_listeners = []
+            
+            self.load_config()
+            
+            # 如果是系统配置文件，加载默认配置
+            if "system_config.json" in config_file and not self.has_config("cursor"):
+                self._create_default_config()
+            
+            # 初始化完成标记
+            self._initialized = True
         
-        # 如果是系统配置文件，加载默认配置
-        if "system_config.json" in config_file and not self.has_config("cursor"):
-            self._create_default_config()
-            
-        # 初始化完成标记
-        self._initialized = True
+    @property
+    def config(self) -> Dict[str, Any]:
+        """配置字典，修改请使用set_config等方法，直接修改其中的值不会更新展开的视图"""
+        return self._config
+        
+    @config.setter
+    def config(self, value: Dict[str, Any]):
+        self._config = value
+        self._version += 1
+        
+    @property
+    def version(self) -> int:
+        """配置版本号，每次修改配置后加一"""
+        return self._version
+        
+    def _flat_view(self) -> Dict[str, Any]:
+        """获取展开的配置视图，配置修改后第一次调用时重新生成
+        
+        Returns:
+            Dict[str, Any]: 完整的点分路径到值的字典，中间层级的路径对应嵌套字典
+        """
+        flat = self._flat
+        if flat is not None and self._flat_version == self._version:
+            return flat
+        with self._lock:
+            version = self._version
+            flat = {}
+            stack = [("", self._config)]
+            while stack:
+                prefix, node = stack.pop()
+                for k, v in node.items():
+                    path = f"{prefix}{k}"
+                    flat[path] = v
+                    if isinstance(v, dict):
+                        stack.append((path + ".", v))
+            self._flat = flat
+            self._flat_version = version
+        return flat
         
     def load_config(self) -> bool:
         """加载配置文件
@@ -49,12 +135,26 @@ class ConfigManager:
         """
         try:
             if os.path.exists(self.config_file):
+                fingerprint = self._fingerprint()
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self.config = json.load(f)
+                    text = f.read()
+                config = json.loads(text)
+                with self._lock:
+                    self.config = config
+                    self._path_versions.clear()
+                    self._saved_version = self._version
+                    # 单独解析一份作为比较基准，不受内存中配置的修改影响
+                    self._base_leaves = self._leaves(json.loads(text))
+                    self._disk_fingerprint = fingerprint
                 self.logger.info(f"成功加载配置文件: {self.config_file}")
                 return True
             else:
-                self.config = {}
+                with self._lock:
+                    self.config = {}
+                    self._path_versions.clear()
+                    self._saved_version = self._version
+                    self._base_leaves = {}
+                    self._disk_fingerprint = None
                 self.logger.warning(f"配置文件不存在: {self.config_file}")
                 return False
         except Exception as e:
@@ -62,20 +162,286 @@ class ConfigManager:
             return False
             
     def save_config(self) -> bool:
-        """保存配置到文件
+        """立即保存配置到文件
+        
+        Returns:
+            bool: 是否成功保存
+        """
+        with self._lock:
+            self._dirty = True
+        return self.flush()
+        
+    def flush(self) -> bool:
+        """立即写入尚未保存的修改，没有待保存的修改时直接返回
         
         Returns:
             bool: 是否成功保存
         """
+        merged = []
+        with self._write_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                if not self._dirty:
+                    return True
+                # 文件在上次加载或保存之后被修改过，先合并外部的修改再保存
+                if self.is_stale():
+                    merged = self._merge_from_disk()
+                try:
+                    data = json.dumps(self.config, indent=4, ensure_ascii=False)
+                except Exception as e:
+                    self.logger.error(f"保存配置文件失败: {str(e)}")
+                    return False
+                version = self._version
+                self._dirty = False
+                
+            try:
+                self._write_atomic(data)
+                success = True
+            except Exception as e:
+                # 写入失败时保留待保存标记，下次修改或退出时重试
+                with self._lock:
+                    self._dirty = True
+                self.logger.error(f"保存配置文件失败: {str(e)}")
+                success = False
+                
+            if success:
+                with self._lock:
+                    self._saved_version = version
+                    self._path_versions = {
+                        path: path_version for path, path_version in self._path_versions.items()
+                        if path_version > version
+                    }
+                    self._base_leaves = self._leaves(json.loads(data))
+                    self._disk_fingerprint = self._fingerprint()
+                self.logger.info(f"成功保存配置文件: {self.config_file}")
+                
+        self._notify_changed(merged)
+        return success
+        
+    def reload_config(self) -> List[str]:
+        """重新加载被外部修改的配置文件，并与本地尚未保存的修改合并
+        
+        文件中相对上次加载或保存时变化的路径，本地没有未保存修改的采用文件中的值，
+        本地也修改过的保留本地的值，之后保存时写回文件。
+        
+        Returns:
+            List[str]: 采用了文件中新值的配置路径
+        """
+        with self._lock:
+            paths = self._merge_from_disk()
+        self._notify_changed(paths)
+        return paths
+        
+    def is_stale(self) -> bool:
+        """配置文件在上次加载或保存之后是否被修改过
+        
+        Returns:
+            bool: 文件存在并且状态与上次加载或保存时不同
+        """
+        fingerprint = self._fingerprint()
+        return fingerprint is not None and fingerprint != self._disk_fingerprint
+        
+    def add_change_listener(self, callback):
+        """添加配置文件被外部修改后的回调
+        
+        Args:
+            callback: 回调函数，参数为采用了文件中新值的配置路径列表，可能在非GUI线程中调用
+        """
+        self._change_listeners.append(callback)
+        
+    def remove_change_listener(self, callback):
+        """移除配置文件被外部修改后的回调
+        
+        Args:
+            callback: 回调函数
+        """
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+            
+    def _notify_changed(self, paths: List[str]):
+        """通知配置路径被外部修改"""
+        if not paths:
+            return
+        for callback in list(self._change_listeners):
+            try:
+                callback(paths)
+            except Exception as e:
+                self.logger.error(f"配置变化回调失败: {str(e)}")
+                
+    def _merge_from_disk(self) -> List[str]:
+        """读取配置文件并合并到内存中的配置（调用方需持有self._lock）
+        
+        Returns:
+            List[str]: 采用了文件中新值的配置路径
+        """
+        fingerprint = self._fingerprint()
+        if fingerprint is None:
+            return []
         try:
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
-            self.logger.info(f"成功保存配置文件: {self.config_file}")
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                disk_leaves = self._leaves(json.load(f))
+        except (OSError, ValueError) as e:
+            # 文件可能正在被其他程序写入，下次变化时再读取
+            self.logger.warning(f"重新加载配置文件失败: {str(e)}")
+            return []
+            
+        missing = object()
+        base = self._base_leaves
+        local = [path for path, version in self._path_versions.items() if version > self._saved_version]
+        applied = []
+        conflicts = []
+        for path in sorted(set(base) | set(disk_leaves)):
+            value = disk_leaves.get(path, missing)
+            if value == base.get(path, missing):
+                continue
+            if any(self._paths_overlap(path, local_path) for local_path in local):
+                conflicts.append(path)
+                continue
+            if value is missing:
+                self._delete_value(path)
+            else:
+                self._set_value(path, value, local=False)
+            applied.append(path)
+            
+        self._base_leaves = disk_leaves
+        self._disk_fingerprint = fingerprint
+        if applied:
+            self._version += 1
+            self.logger.info(f"配置文件已被外部修改，重新加载{len(applied)}项: {self.config_file}")
+        if conflicts:
+            self.logger.warning(f"以下配置本地有未保存的修改，保留本地的值: {', '.join(conflicts)}")
+        return applied
+        
+    @staticmethod
+    def _paths_overlap(path: str, other: str) -> bool:
+        """两个配置路径是否相同或一个是另一个的上级，空路径表示整个配置"""
+        if not other or path == other:
+            return True
+        return path.startswith(other + ".") or other.startswith(path + ".")
+        
+    @staticmethod
+    def _leaves(config: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+        """展开配置字典，只保留叶子值（非字典的值和空字典）
+        
+        Args:
+            config: 配置字典
+            prefix: 路径前缀
+            
+        Returns:
+            Dict[str, Any]: 点分路径到叶子值的字典
+        """
+        leaves = {}
+        for k, v in config.items():
+            path = f"{prefix}{k}"
+            if isinstance(v, dict) and v:
+                leaves.update(ConfigManager._leaves(v, path + "."))
+            else:
+                leaves[path] = v
+        return leaves
+        
+    def _fingerprint(self):
+        """获取配置文件的状态
+        
+        Returns:
+            tuple: (inode, 大小, 修改时间)，文件不存在时为None
+        """
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+                
+    @classmethod
+    def flush_all(cls) -> bool:
+        """写入所有配置管理器尚未保存的修改，退出程序前调用
+        
+        Returns:
+            bool: 是否全部成功保存
+        """
+        success = True
+        for instance in list(cls._instances.values()):
+            # 只创建了实例但还没有初始化完成的跳过
+            if hasattr(instance, "_dirty"):
+                success = instance.flush() and success
+        return success
+        
+    def _write_atomic(self, data: str):
+        """把配置内容写入临时文件并刷到磁盘，再替换原配置文件
+        
+        Args:
+            data: 配置文件内容
+        """
+        directory = os.path.dirname(self.config_file) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(
+            prefix=os.path.basename(self.config_file) + ".", suffix=".tmp", dir=directory
+        )
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.config_file)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+            
+    def _mark_dirty(self):
+        """标记配置有待保存的修改，保存窗口结束时统一写入"""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self.flush)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+                
+    def _set_value(self, key: str, value: Any, local: bool = True):
+        """在内存中设置配置值，不写入文件
+        
+        Args:
+            key: 配置键，支持点号分隔的多级键
+            value: 配置值
+            local: 是否为本地修改，从配置文件合并的值为False
+        """
+        with self._lock:
+            keys = key.split('.')
+            current = self.config
+            for k in keys[:-1]:
+                if not isinstance(current.get(k), dict):
+                    current[k] = {}
+                current = current[k]
+            current[keys[-1]] = value
+            self._version += 1
+            if local:
+                self._path_versions[key] = self._version
+                
+    def _delete_value(self, key: str, local: bool = False) -> bool:
+        """在内存中删除配置项，不写入文件
+        
+        Args:
+            key: 配置键，支持点号分隔的多级键
+            local: 是否为本地修改
+            
+        Returns:
+            bool: 配置项是否存在
+        """
+        with self._lock:
+            keys = key.split('.')
+            current = self.config
+            for k in keys[:-1]:
+                current = current.get(k)
+                if not isinstance(current, dict):
+                    return False
+            if keys[-1] not in current:
+                return False
+            del current[keys[-1]]
+            self._version += 1
+            if local:
+                self._path_versions[key] = self._version
             return True
-        except Exception as e:
-            self.logger.error(f"保存配置文件失败: {str(e)}")
-            return False
             
     def get_config(self, key: str, default: Any = None) -> Any:
         """获取配置值
@@ -85,17 +451,25 @@ class ConfigManager:
             default: 默认值
             
         Returns:
-            Any: 配置值
+            Any: 配置值，字典类型的值不要直接修改
         """
-        try:
-            keys = key.split('.')
-            value = self.config
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._flat_view().get(key, default)
+        
+    def get_many(self, paths: Union[Iterable[str], Dict[str, Any]], default: Any = None) -> Dict[str, Any]:
+        """一次获取多个配置值
+        
+        Args:
+            paths: 配置键列表，或配置键到各自默认值的字典
+            default: paths为列表时使用的默认值
             
+        Returns:
+            Dict[str, Any]: 配置键到配置值的字典
+        """
+        flat = self._flat_view()
+        if isinstance(paths, dict):
+            return {path: flat.get(path, path_default) for path, path_default in paths.items()}
+        return {path: flat.get(path, default) for path in paths}
+        
     def set_config(self, key: str, value: Any) -> bool:
         """设置配置值
         
@@ -104,35 +478,34 @@ class ConfigManager:
             value: 配置值
             
         Returns:
-            bool: 是否成功设置
+            bool: 是否成功设置，文件在保存窗口结束时写入
         """
         try:
-            keys = key.split('.')
-            current = self.config
-            for k in keys[:-1]:
-                if k not in current:
-                    current[k] = {}
-                current = current[k]
-            current[keys[-1]] = value
+            self._set_value(key, value)
             self.logger.info(f"设置配置 {key} = {value}")
-            return self.save_config()
+            self._mark_dirty()
+            return True
         except Exception as e:
             self.logger.error(f"设置配置失败: {str(e)}")
             return False
             
     def update_config(self, updates: Dict[str, Any]) -> bool:
-        """批量更新配置
+        """批量更新配置，所有修改只写入一次文件
         
         Args:
-            updates: 要更新的配置字典
+            updates: 要更新的配置字典，键支持点号分隔的多级键
             
         Returns:
             bool: 是否成功更新
         """
         try:
-            for key, value in updates.items():
-                self.set_config(key, value)
-            self.logger.info("批量更新配置成功")
+            with self._lock:
+                for key, value in updates.items():
+                    self._set_value(key, value)
+                self._dirty = True
+            if not self.flush():
+                return False
+            self.logger.info(f"批量更新配置成功: {len(updates)}项")
             return True
         except Exception as e:
             self.logger.error(f"批量更新配置失败: {str(e)}")
@@ -145,19 +518,13 @@ class ConfigManager:
             key: 要删除的配置键
             
         Returns:
-            bool: 是否成功删除
+            bool: 是否成功删除，文件在保存窗口结束时写入
         """
         try:
-            keys = key.split('.')
-            current = self.config
-            for k in keys[:-1]:
-                if k not in current:
-                    return True
-                current = current[k]
-            if keys[-1] in current:
-                del current[keys[-1]]
-                self.logger.info(f"删除配置项: {key}")
-                return self.save_config()
+            if not self._delete_value(key, local=True):
+                return True
+            self.logger.info(f"删除配置项: {key}")
+            self._mark_dirty()
             return True
         except Exception as e:
             self.logger.error(f"删除配置项失败: {str(e)}")
@@ -178,7 +545,10 @@ class ConfigManager:
             bool: 是否成功重置
         """
         try:
-            self.config = {}
+            with self._lock:
+                self.config = {}
+                # 空路径表示整个配置都被本地修改
+                self._path_versions[""] = self._version
             self.logger.info("配置已重置")
             return self.save_config()
         except Exception as e:
@@ -194,17 +564,8 @@ class ConfigManager:
         Returns:
             bool: 是否存在
         """
-        try:
-            keys = key.split('.')
-            current = self.config
-            for k in keys:
-                if k not in current:
-                    return False
-                current = current[k]
-            return True
-        except Exception:
-            return False
-            
+        return key in self._flat_view()
+        
     def get_config_keys(self, prefix: str = "") -> List[str]:
         """获取所有配置键
         
@@ -229,17 +590,21 @@ class ConfigManager:
     def _create_default_config(self):
         """创建默认配置"""
         try:
-            # 创建默认配置
+            # 并行查找各项路径，创建默认配置
+            paths = PathDiscovery().discover([
+                "cursor_exe", "cursor_data_dir", "cursor_config_file", "cursor_db_file",
+                "chrome_exe", "chrome_user_data_dir"
+            ])
             default_config = {
                 "cursor": {
-                    "executable_path": self._find_cursor_exe() or "",
-                    "data_dir": self._find_cursor_data_dir() or "",
-                    "config_file": self._find_cursor_config_file() or "",
-                    "db_file": self._find_cursor_db_file() or ""
+                    "executable_path": paths["cursor_exe"],
+                    "data_dir": paths["cursor_data_dir"],
+                    "config_file": paths["cursor_config_file"],
+                    "db_file": paths["cursor_db_file"]
                 },
                 "chrome": {
-                    "executable_path": self._find_chrome_exe() or "",
-                    "user_data_dir": self._find_chrome_user_data_dir() or ""
+                    "executable_path": paths["chrome_exe"],
+                    "user_data_dir": paths["chrome_user_data_dir"]
                 },
                 "backup": {
                     "enabled": True,
@@ -250,8 +615,12 @@ class ConfigManager:
             }
             
             # 更新配置
-            self.config.update(default_config)
-            self.save_config()
+            with self._lock:
+                self.config.update(default_config)
+                self._version += 1
+                for key in default_config:
+                    self._path_versions[key] = self._version
+            self._mark_dirty()
             self.logger.info("已创建默认配置")
             
         except Exception as e:
@@ -259,210 +628,34 @@ class ConfigManager:
         
     def _find_cursor_exe(self):
         """查找Cursor可执行文件路径"""
-        try:
-            if platform.system() == "Windows":
-                possible_paths = [
-                    os.path.expandvars("%LOCALAPPDATA%\\Programs\\cursor\\Cursor.exe"),
-                    os.path.expandvars("%LOCALAPPDATA%\\Programs\\Cursor\\Cursor.exe"),
-                    os.path.expandvars("%USERPROFILE%\\AppData\\Local\\Programs\\cursor\\Cursor.exe"),
-                    os.path.expandvars("%USERPROFILE%\\AppData\\Local\\Programs\\Cursor\\Cursor.exe"),
-                    "C:\\Users\\Administrator\\AppData\\Local\\Programs\\cursor\\Cursor.exe",
-                    "C:\\Program Files\\Cursor\\Cursor.exe",
-                    "C:\\Program Files (x86)\\Cursor\\Cursor.exe"
-                ]
-            elif platform.system() == "Darwin":
-                possible_paths = [
-                    "/Applications/Cursor.app/Contents/MacOS/Cursor",
-                    os.path.expanduser("~/Applications/Cursor.app/Contents/MacOS/Cursor")
-                ]
-            else:
-                possible_paths = [
-                    "/usr/bin/cursor",
-                    "/usr/local/bin/cursor",
-                    os.path.expanduser("~/.local/bin/cursor")
-                ]
-                
-            for path in possible_paths:
-                if os.path.exists(path):
-                    self.logger.info(f"找到Cursor可执行文件: {path}")
-                    return path
-                    
-            self.logger.warning("未找到Cursor可执行文件")
-            return ""
-        except Exception as e:
-            self.logger.error(f"查找Cursor可执行文件失败: {str(e)}")
-            return ""
+        return PathDiscovery().get("cursor_exe")
         
     def _find_cursor_data_dir(self):
         """查找Cursor数据目录"""
-        if platform.system() == "Windows":
-            possible_paths = [
-                os.path.expandvars("%APPDATA%\\Cursor"),
-                os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor")
-            ]
-        elif platform.system() == "Darwin":
-            possible_paths = [
-                os.path.expanduser("~/Library/Application Support/Cursor")
-            ]
-        else:
-            possible_paths = [
-                os.path.expanduser("~/.config/Cursor")
-            ]
-            
-        for path in possible_paths:
-            if os.path.exists(path) and os.path.isdir(path):
-                self.logger.info(f"找到Cursor数据目录: {path}")
-                return path
-                
-        self.logger.warning("未找到Cursor数据目录")
-        return ""
+        return PathDiscovery().get("cursor_data_dir")
         
     def _find_cursor_config_file(self):
         """查找Cursor配置文件"""
-        data_dir = self._find_cursor_data_dir()
-        if not data_dir:
-            return ""
-            
-        specific_paths = [
-            os.path.expandvars("%APPDATA%\\Cursor\\User\\globalStorage\\storage.json"),
-            os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor\\User\\globalStorage\\storage.json"),
-            os.path.join(data_dir, "User", "globalStorage", "storage.json")
-        ]
-        
-        for path in specific_paths:
-            if os.path.exists(path) and os.path.isfile(path):
-                self.logger.info(f"找到Cursor配置文件: {path}")
-                return path
-                
-        possible_files = ["Config", "config.json", "settings.json", "preferences.json", "storage.json"]
-        for file_name in possible_files:
-            file_path = os.path.join(data_dir, file_name)
-            if os.path.exists(file_path) and os.path.isfile(file_path):
-                self.logger.info(f"找到Cursor配置文件: {file_path}")
-                return file_path
-                
-        user_storage_dir = os.path.join(data_dir, "User", "globalStorage")
-        if os.path.exists(user_storage_dir) and os.path.isdir(user_storage_dir):
-            for file_name in os.listdir(user_storage_dir):
-                if file_name.endswith(".json"):
-                    file_path = os.path.join(user_storage_dir, file_name)
-                    self.logger.info(f"找到Cursor配置文件: {file_path}")
-                    return file_path
-                    
-        self.logger.warning("未找到Cursor配置文件")
-        return ""
+        return PathDiscovery().get("cursor_config_file")
         
     def _find_cursor_db_file(self):
         """查找Cursor数据库文件"""
-        data_dir = self._find_cursor_data_dir()
-        if not data_dir:
-            return ""
-            
-        specific_paths = [
-            os.path.expandvars("%APPDATA%\\Cursor\\User\\globalStorage\\state.vscdb"),
-            os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor\\User\\globalStorage\\state.vscdb"),
-            os.path.join(data_dir, "User", "globalStorage", "state.vscdb")
-        ]
-        
-        for path in specific_paths:
-            if os.path.exists(path) and os.path.isfile(path):
-                self.logger.info(f"找到Cursor数据库文件: {path}")
-                return path
-                
-        possible_dirs = [
-            os.path.join(data_dir, "Local Storage", "leveldb"),
-            os.path.join(data_dir, "databases"),
-            os.path.join(data_dir, "IndexedDB"),
-            os.path.join(data_dir, "User", "globalStorage")
-        ]
-        
-        for path in possible_dirs:
-            if os.path.exists(path) and os.path.isdir(path):
-                for root, _, files in os.walk(path):
-                    for file in files:
-                        if file.endswith((".sqlite", ".db", ".vscdb")):
-                            file_path = os.path.join(root, file)
-                            self.logger.info(f"找到Cursor数据库文件: {file_path}")
-                            return file_path
-                            
-        self.logger.warning("未找到Cursor数据库文件")
-        return ""
+        return PathDiscovery().get("cursor_db_file")
         
     def _find_chrome_exe(self):
         """查找Chrome浏览器可执行文件"""
-        if platform.system() == "Windows":
-            possible_paths = [
-                "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
-                os.path.expandvars("%ProgramFiles%\\Google\\Chrome\\Application\\chrome.exe"),
-                os.path.expandvars("%ProgramFiles(x86)%\\Google\\Chrome\\Application\\chrome.exe"),
-                os.path.expandvars("%LOCALAPPDATA%\\Google\\Chrome\\Application\\chrome.exe")
-            ]
-        elif platform.system() == "Darwin":
-            possible_paths = [
-                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
-                os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
-            ]
-        else:
-            try:
-                chrome_path = subprocess.check_output(['which', 'google-chrome'], universal_newlines=True).strip()
-                if chrome_path:
-                    return chrome_path
-            except:
-                pass
-                
-            possible_paths = [
-                "/usr/bin/google-chrome",
-                "/usr/bin/google-chrome-stable",
-                "/usr/bin/chromium",
-                "/usr/bin/chromium-browser"
-            ]
-            
-        for path in possible_paths:
-            if os.path.exists(path):
-                self.logger.info(f"找到Chrome浏览器: {path}")
-                return path
-                
-        self.logger.warning("未找到Chrome浏览器")
-        return ""
+        return PathDiscovery().get("chrome_exe")
         
     def _find_chrome_user_data_dir(self):
         """查找Chrome用户数据目录"""
-        if platform.system() == "Windows":
-            possible_paths = [
-                os.path.expandvars("%LOCALAPPDATA%\\Google\\Chrome\\User Data")
-            ]
-        elif platform.system() == "Darwin":
-            possible_paths = [
-                os.path.expanduser("~/Library/Application Support/Google/Chrome")
-            ]
-        else:
-            possible_paths = [
-                os.path.expanduser("~/.config/google-chrome"),
-                os.path.expanduser("~/.config/chromium")
-            ]
-            
-        for path in possible_paths:
-            if os.path.exists(path) and os.path.isdir(path):
-                self.logger.info(f"找到Chrome用户数据目录: {path}")
-                return path
-                
-        self.logger.warning("未找到Chrome用户数据目录")
-        return ""
+        return PathDiscovery().get("chrome_user_data_dir")
         
     def _find_backup_dir(self):
         """查找备份目录路径"""
-        cursor_data_dir = self._find_cursor_data_dir()
-        specific_paths = [
-            os.path.expandvars("%APPDATA%\\Cursor\\User\\globalStorage\\backups"),
-            os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor\\User\\globalStorage\\backups"),
-            os.path.join(cursor_data_dir, "User", "globalStorage", "backups") if cursor_data_dir else None
-        ]
-        
-        for path in specific_paths:
-            if path and os.path.exists(path) and os.path.isdir(path):
-                self.logger.info(f"找到备份目录: {path}")
-                return path
-                
+        backup_dir = PathDiscovery().get("backup_dir")
+        if backup_dir:
+            return backup_dir
+            
         backup_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backups")
         if not os.path.exists(backup_dir):
             try:
@@ -527,9 +720,26 @@ class ConfigManager:
                 "valid": False
             }
             
+    def get_backup_store(self):
+        """获取备份目录对应的增量备份仓库
+        
+        Returns:
+            BackupStore: 备份仓库
+        """
+        from core.backup_store import BackupStore
+        # 子类可能重写了get_config的参数形式，这里统一按点号分隔的键读取
+        backup_dir = ConfigManager.get_config(self, "backup.backup_dir", "backups")
+        store = getattr(self, "_backup_store", None)
+        if store is None or store.root != backup_dir:
+            store = BackupStore(backup_dir)
+            self._backup_store = store
+        return store
+        
     def create_backup(self, backup_name=None):
         """创建数据库和配置文件备份
         
+        备份保存在增量备份仓库中，与已有快照相同的内容块不会重复保存。
+        
         Args:
             backup_name: 备份名称，如果为None则使用时间戳
             
@@ -537,33 +747,35 @@ class ConfigManager:
             dict: 备份结果
         """
         try:
-            backup_dir = self.get_config("backup.backup_dir", "backups")
-            if not os.path.exists(backup_dir):
-                os.makedirs(backup_dir, exist_ok=True)
-                
-            if not backup_name:
-                import datetime
-                backup_name = f"backup_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                
-            backup_path = os.path.join(backup_dir, backup_name)
-            if not os.path.exists(backup_path):
-                os.makedirs(backup_path, exist_ok=True)
+            store = self.get_backup_store()
+            
+            files = {}
+            config_file = ConfigManager.get_config(self, "cursor.config_file", "")
+            if config_file:
+                files[os.path.basename(config_file)] = config_file
                 
-            config_file = self.get_config("cursor.config_file", "")
-            if config_file and os.path.exists(config_file):
-                config_backup = os.path.join(backup_path, os.path.basename(config_file))
-                shutil.copy2(config_file, config_backup)
+            # 数据库可能正在被Cursor写入，先通过备份API取得一致的副本
+            databases = []
+            db_file = ConfigManager.get_config(self, "cursor.db_file", "")
+            if db_file:
+                files[os.path.basename(db_file)] = db_file
+                databases.append(os.path.basename(db_file))
                 
-            db_file = self.get_config("cursor.db_file", "")
-            if db_file and os.path.exists(db_file):
-                db_backup = os.path.join(backup_path, os.path.basename(db_file))
-                shutil.copy2(db_file, db_backup)
+            summary = store.create_snapshot(files, backup_name, databases)
+            
+            # 超过最大备份数时删除最旧的快照
+            max_backups = ConfigManager.get_config(self, "backup.max_backups", 0)
+            if max_backups:
+                store.prune(max_backups)
                 
-            self.logger.info(f"已创建备份: {backup_path}")
+            message = (f"已创建备份: {summary['name']} "
+                       f"(新增 {self._format_size(summary['new_bytes'])}, 共 {self._format_size(summary['total_bytes'])})")
+            self.logger.info(message)
             return {
                 "success": True,
-                "backup_path": backup_path,
-                "message": f"已创建备份: {backup_path}"
+                "backup_path": os.path.join(store.root, summary["name"]),
+                "message": message,
+                "stats": summary
             }
         except Exception as e:
             self.logger.error(f"创建备份失败: {e}")
@@ -572,53 +784,62 @@ class ConfigManager:
                 "message": f"创建备份失败: {str(e)}"
             }
             
+    @staticmethod
+    def _format_size(size):
+        """格式化文件大小
+        
+        Args:
+            size: 字节数
+            
+        Returns:
+            str: 带单位的大小
+        """
+        if size < 1024:
+            return f"{size} B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.2f} KB"
+        else:
+            return f"{size / (1024 * 1024):.2f} MB"
+            
     def get_backups(self):
         """获取所有备份列表
         
+        增量备份仓库中的快照从索引文件读取，旧版本创建的备份目录只读取一层文件大小。
+        
         Returns:
             list: 备份列表
         """
-        backup_dir = self.get_config("backup.backup_dir", "backups")
-        if not os.path.exists(backup_dir):
-            return []
-            
+        import datetime
         backups = []
         try:
-            for item in os.listdir(backup_dir):
-                item_path = os.path.join(backup_dir, item)
-                if os.path.isdir(item_path):
-                    has_backup_files = False
-                    for root, _, files in os.walk(item_path):
-                        if files:
-                            has_backup_files = True
-                            break
-                            
-                    if has_backup_files:
-                        mtime = os.path.getmtime(item_path)
-                        import datetime
-                        mtime_str = datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-                        
-                        total_size = 0
-                        for root, _, files in os.walk(item_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                total_size += os.path.getsize(file_path)
-                                
-                        if total_size < 1024:
-                            size_str = f"{total_size} B"
-                        elif total_size < 1024 * 1024:
-                            size_str = f"{total_size / 1024:.2f} KB"
-                        else:
-                            size_str = f"{total_size / (1024 * 1024):.2f} MB"
-                            
-                        backups.append({
-                            "name": item,
-                            "path": item_path,
-                            "time": mtime_str,
-                            "size": size_str
-                        })
-                        
-            backups.sort(key=lambda x: os.path.getmtime(x["path"]), reverse=True)
+            store = self.get_backup_store()
+            for snapshot in store.list_snapshots():
+                backups.append({
+                    "name": snapshot["name"],
+                    "path": os.path.join(store.root, snapshot["name"]),
+                    "time": datetime.datetime.fromtimestamp(snapshot["time"]).strftime("%Y-%m-%d %H:%M:%S"),
+                    "size": self._format_size(snapshot["total_bytes"]),
+                    "timestamp": snapshot["time"]
+                })
+                
+            # 旧版本每个备份是一个包含完整文件副本的目录
+            if os.path.exists(store.root):
+                for entry in os.scandir(store.root):
+                    if not entry.is_dir() or entry.name in ("chunks", "snapshots"):
+                        continue
+                    total_size = sum(f.stat().st_size for f in os.scandir(entry.path) if f.is_file())
+                    if not total_size:
+                        continue
+                    mtime = entry.stat().st_mtime
+                    backups.append({
+                        "name": entry.name,
+                        "path": entry.path,
+                        "time": datetime.datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S"),
+                        "size": self._format_size(total_size),
+                        "timestamp": mtime
+                    })
+                    
+            backups.sort(key=lambda x: x["timestamp"], reverse=True)
             return backups
         except Exception as e:
             self.logger.error(f"获取备份列表失败: {e}")
@@ -628,12 +849,29 @@ class ConfigManager:
         """还原备份
         
         Args:
-            backup_path: 备份路径
+            backup_path: 备份路径，为增量备份仓库中的快照时按快照名称还原
             
         Returns:
             dict: 还原结果
         """
         try:
+            config_file = ConfigManager.get_config(self, "cursor.config_file", "")
+            db_file = ConfigManager.get_config(self, "cursor.db_file", "")
+            
+            store = self.get_backup_store()
+            name = os.path.basename(os.path.normpath(backup_path))
+            if store.has_snapshot(name):
+                targets = {}
+                if config_file:
+                    targets[os.path.basename(config_file)] = config_file
+                if db_file:
+                    targets[os.path.basename(db_file)] = db_file
+                store.restore_snapshot(name, targets)
+                return {
+                    "success": True,
+                    "message": "备份还原成功"
+                }
+                
             if not os.path.exists(backup_path) or not os.path.isdir(backup_path):
                 return {
                     "success": False,
@@ -645,21 +883,21 @@ class ConfigManager:
             
             for root, _, files in os.walk(backup_path):
                 for file in files:
-                    if file.endswith((".sqlite", ".db")):
+                    if file.endswith((".sqlite", ".db", ".vscdb", ".vscdb.gz", ".vscdb.zst")):
                         db_backup = os.path.join(root, file)
                     elif file in ["Config", "config.json", "settings.json", "preferences.json"]:
                         config_backup = os.path.join(root, file)
                         
             if config_backup:
-                config_file = self.get_config("cursor.config_file", "")
                 if config_file and os.path.exists(os.path.dirname(config_file)):
                     shutil.copy2(config_backup, config_file)
                     self.logger.info(f"已还原配置文件: {config_file}")
                     
             if db_backup:
-                db_file = self.get_config("cursor.db_file", "")
                 if db_file and os.path.exists(os.path.dirname(db_file)):
-                    shutil.copy2(db_backup, db_file)
+                    # 通过备份API写回，压缩的备份会先解压
+                    from core.backup_engine import backup_engine
+                    backup_engine.restore(db_backup, db_file)
                     self.logger.info(f"已还原数据库文件: {db_file}")
                     
             return {
@@ -671,4 +909,8 @@ class ConfigManager:
             return {
                 "success": False,
                 "message": f"还原备份失败: {str(e)}"
-            } 
\ No newline at end of file
+            } 
+
+
+# 退出时写入尚未保存的配置修改
+atexit.register(ConfigManager.flush_all)
@@ -0,0 +1,131 @@
+import os
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+from utils.logger import LoggerManager
+
+
+class ConfigWatcher(QObject):
+    """配置文件变化监视器
+    
+    通过QFileSystemWatcher监视配置文件及其所在目录（原子替换会使文件监视失效，
+    由目录监视发现），文件事件经过防抖后比较文件的inode、大小和修改时间，
+    确认被外部修改时调用ConfigManager.reload_config按路径合并，并发出变化的路径。
+    文件系统不支持变化通知时，由定时检查修改时间兜底。
+    """
+    
+    # 配置变化信号，参数为 (配置文件路径, 采用了文件中新值的配置路径列表)
+    config_changed = pyqtSignal(str, object)
+    
+    # 单例模式
+    _instance = None
+    
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(ConfigWatcher, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+        
+    def __init__(self, debounce_ms=300, poll_ms=5000):
+        """初始化配置文件变化监视器
+        
+        Args:
+            debounce_ms: 文件事件的防抖时间（毫秒）
+            poll_ms: 定时检查修改时间的间隔（毫秒），为0时不定时检查
+        """
+        if self._initialized:
+            return
+        super().__init__()
+        
+        self.logger = LoggerManager()
+        # 配置文件绝对路径 -> (配置管理器, 变化回调)
+        self._watched = {}
+        
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.fileChanged.connect(self._on_fs_event)
+        self._fs_watcher.directoryChanged.connect(self._on_fs_event)
+        
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self.check_now)
+        
+        self._poll = QTimer(self)
+        self._poll.setInterval(poll_ms)
+        self._poll.timeout.connect(self.check_now)
+        
+        self._stats = {"events": 0, "checks": 0, "reloads": 0}
+        self._initialized = True
+        
+    def watch(self, manager):
+        """开始监视配置管理器对应的配置文件
+        
+        Args:
+            manager: 配置管理器
+        """
+        path = os.path.abspath(manager.config_file)
+        if path in self._watched:
+            return
+        # 回调可能在保存配置的线程中调用，信号会排队到GUI线程
+        callback = lambda paths: self.config_changed.emit(path, paths)
+        manager.add_change_listener(callback)
+        self._watched[path] = (manager, callback)
+        self._add_fs_paths(path)
+        if self._poll.interval() > 0 and not self._poll.isActive():
+            self._poll.start()
+            
+    def unwatch(self, manager):
+        """停止监视配置管理器对应的配置文件
+        
+        Args:
+            manager: 配置管理器
+        """
+        path = os.path.abspath(manager.config_file)
+        entry = self._watched.pop(path, None)
+        if entry is None:
+            return
+        manager.remove_change_listener(entry[1])
+        if path in self._fs_watcher.files():
+            self._fs_watcher.removePath(path)
+        # 其他被监视的配置文件不在同一目录时才移除目录监视
+        directory = os.path.dirname(path)
+        if not any(os.path.dirname(p) == directory for p in self._watched):
+            if directory in self._fs_watcher.directories():
+                self._fs_watcher.removePath(directory)
+        if not self._watched:
+            self._poll.stop()
+            
+    def check_now(self):
+        """立即检查所有被监视的配置文件，被外部修改时重新加载"""
+        for path, (manager, _) in list(self._watched.items()):
+            self._stats["checks"] += 1
+            if manager.is_stale():
+                self._stats["reloads"] += 1
+                # 变化的路径由配置管理器的回调通过信号发出
+                manager.reload_config()
+            # 文件被替换或新建后需要重新加入监视
+            self._add_fs_paths(path)
+            
+    def get_stats(self):
+        """获取监视统计信息
+        
+        Returns:
+            dict: 文件事件、检查和重新加载的次数
+        """
+        stats = dict(self._stats)
+        stats["watched"] = len(self._watched)
+        return stats
+        
+    def _add_fs_paths(self, path):
+        """将配置文件和所在目录加入文件监视
+        
+        Args:
+            path: 配置文件绝对路径
+        """
+        existing = set(self._fs_watcher.files()) | set(self._fs_watcher.directories())
+        paths = [p for p in (path, os.path.dirname(path)) if p not in existing and os.path.exists(p)]
+        if paths:
+            self._fs_watcher.addPaths(paths)
+            
+    def _on_fs_event(self, path):
+        """文件或目录变化，重新开始防抖计时"""
+        self._stats["events"] += 1
+        self._debounce.start()
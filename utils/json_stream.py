@@ -0,0 +1,108 @@
+import json
+
+
+class JsonStreamError(ValueError):
+    """JSON流格式错误"""
+
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789.eE+-"
+
+
+def iter_json_object_items(fp, chunk_size=65536):
+    """逐项读取顶层为JSON对象的文件
+    
+    每次只读取一块文本，解析出一个键值对就立即产出，
+    内存中只保留当前正在解析的键值对，不会一次性加载整个文件。
+    
+    Args:
+        fp: 以文本模式打开的文件对象
+        chunk_size: 每次读取的字符数
+        
+    Yields:
+        tuple: (键, 值)，值为解析后的Python对象
+        
+    Raises:
+        JsonStreamError: 文件不是JSON对象或格式不正确
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    
+    def fill(size=chunk_size):
+        """读取更多文本到缓冲区，返回是否读到了数据"""
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(size)
+        if not chunk:
+            eof = True
+            return False
+        # 丢弃已解析的部分，避免缓冲区无限增长
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+        
+    def skip_whitespace():
+        """跳过空白字符，返回下一个非空白字符，文件结束时返回空字符串"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+                
+    def decode_next():
+        """解析缓冲区中的下一个JSON值，数据不完整时继续读取"""
+        nonlocal pos
+        size = chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # 数字可能在缓冲区末尾被截断（如 1.5e 被解析为 1.5），需要读到后续字符才能确定
+                truncated = (isinstance(value, (int, float)) and not isinstance(value, bool)
+                             and not eof and (end == len(buffer) or buffer[end] in _NUMBER_CHARS))
+                if not truncated:
+                    pos = end
+                    return value
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise JsonStreamError(f"JSON格式不正确: {e}") from None
+            # 大值需要多次读取时逐步加大读取量，避免反复从头解析
+            if not fill(size):
+                continue
+            size *= 2
+            
+    if skip_whitespace() != "{":
+        raise JsonStreamError("导入文件格式不正确，应为JSON对象")
+    pos += 1
+    
+    first = True
+    while True:
+        char = skip_whitespace()
+        if char == "}":
+            pos += 1
+            break
+        if not first:
+            if char != ",":
+                raise JsonStreamError(f"JSON格式不正确: 缺少逗号（位置 {pos}）")
+            pos += 1
+            char = skip_whitespace()
+        if char != '"':
+            raise JsonStreamError("JSON格式不正确: 键必须是字符串")
+        key = decode_next()
+        
+        if skip_whitespace() != ":":
+            raise JsonStreamError(f"JSON格式不正确: 键 '{key}' 后缺少冒号")
+        pos += 1
+        skip_whitespace()
+        value = decode_next()
+        
+        first = False
+        yield key, value
+        
+    if skip_whitespace():
+        raise JsonStreamError("JSON格式不正确: 对象结束后还有多余内容")
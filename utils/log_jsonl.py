@@ -0,0 +1,227 @@
+import os
+import json
+import bisect
+
+
+class JsonLinesLogSink:
+    """JSON Lines格式的日志文件及其块索引
+    
+    每条日志写为一行JSON对象，字段为 ts、level、source、logger、msg（以及异常时的exc）。
+    每写满block_records条日志，向旁边的 .idx 文件追加一条块索引:
+    {"offset", "length", "count", "start", "end", "levels"}，
+    读取时先在索引中二分查找时间，再只读取需要的块；按级别过滤时可以跳过
+    不包含该级别的整个块。最后一个尚未写满的块不在索引中，读取时作为级别未知的块处理。
+    """
+    
+    def __init__(self, path, block_records=256):
+        """打开日志文件，文件已存在时继续追加
+        
+        Args:
+            path: 日志文件路径
+            block_records: 每个索引块包含的日志条数
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        self.block_records = block_records
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "ab")
+        self._index_file = None
+        self._offset = self._file.tell()
+        self._block = None
+        self._recover()
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+        
+    def _recover(self):
+        """根据已有的索引恢复最后一个未写满块的状态
+        
+        索引中记录的范围超出文件（如日志文件被截断）时重建索引。
+        """
+        blocks = read_index(self.index_path)
+        indexed_end = blocks[-1]["offset"] + blocks[-1]["length"] if blocks else 0
+        if indexed_end > self._offset:
+            blocks = []
+            indexed_end = 0
+            with open(self.index_path, "w", encoding="utf-8"):
+                pass
+                
+        if indexed_end == self._offset:
+            return
+        # 重新扫描索引之后的部分，写满的块补写到索引中
+        entries = []
+        offset = indexed_end
+        with open(self.path, "rb") as f:
+            f.seek(indexed_end)
+            for line in f:
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    item = {}
+                self._add_to_block(offset, len(line), item.get("ts", 0.0), item.get("level", "INFO"))
+                offset += len(line)
+                if self._block["count"] >= self.block_records:
+                    entries.append(self._block)
+                    self._block = None
+        if entries:
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+                    
+    def _add_to_block(self, offset, length, timestamp, level):
+        """把一条日志计入当前块"""
+        block = self._block
+        if block is None:
+            block = self._block = {
+                "offset": offset, "length": 0, "count": 0,
+                "start": timestamp, "end": timestamp, "levels": []
+            }
+        block["length"] += length
+        block["count"] += 1
+        block["end"] = timestamp
+        if level not in block["levels"]:
+            block["levels"].append(level)
+            
+    def write_batch(self, records):
+        """写入一批日志记录，由后台写入线程调用
+        
+        先写日志再写索引，索引不会指向尚未写入的内容。
+        
+        Args:
+            records: 日志记录列表
+        """
+        lines = []
+        entries = []
+        for record in records:
+            item = {
+                "ts": record.created,
+                "level": record.levelname,
+                "source": getattr(record, "source", None) or record.name,
+                "logger": record.name,
+                "msg": record.getMessage()
+            }
+            if record.exc_text:
+                item["exc"] = record.exc_text
+            line = (json.dumps(item, ensure_ascii=False) + "\n").encode("utf-8")
+            lines.append(line)
+            self._add_to_block(self._offset, len(line), record.created, record.levelname)
+            self._offset += len(line)
+            if self._block["count"] >= self.block_records:
+                entries.append(self._block)
+                self._block = None
+                
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        if entries:
+            self._index_file.write("".join(json.dumps(entry) + "\n" for entry in entries))
+            self._index_file.flush()
+            
+    def close(self):
+        """关闭日志文件和索引文件"""
+        for f in (self._file, self._index_file):
+            if f is not None and not f.closed:
+                f.close()
+
+
+def read_index(index_path):
+    """读取块索引
+    
+    Args:
+        index_path: 索引文件路径
+        
+    Returns:
+        list: 块索引列表，按文件偏移排列
+    """
+    blocks = []
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    blocks.append(json.loads(line))
+                except ValueError:
+                    # 最后一行可能只写了一半
+                    break
+    except FileNotFoundError:
+        pass
+    return blocks
+
+
+class JsonLinesLogReader:
+    """借助块索引读取JSON Lines日志文件"""
+    
+    def __init__(self, path):
+        """初始化读取器
+        
+        Args:
+            path: 日志文件路径
+        """
+        self.path = path
+        self.index_path = path + ".idx"
+        
+    def load_blocks(self):
+        """读取块索引，并把索引之后尚未写满的部分作为级别未知的最后一块
+        
+        Returns:
+            list: 块列表，级别未知的块levels为None
+        """
+        blocks = read_index(self.index_path)
+        size = os.path.getsize(self.path)
+        indexed_end = blocks[-1]["offset"] + blocks[-1]["length"] if blocks else 0
+        if indexed_end > size:
+            # 索引与文件不一致，不使用索引
+            blocks = []
+            indexed_end = 0
+        if size > indexed_end:
+            blocks.append({
+                "offset": indexed_end, "length": size - indexed_end,
+                "start": blocks[-1]["end"] if blocks else 0.0, "levels": None
+            })
+        return blocks
+        
+    def iter_range(self, start=None, end=None, levels=None, reverse=False):
+        """按时间范围读取日志
+        
+        在块索引中二分查找起始时间所在的块，只读取时间范围内、
+        并且可能包含所需级别的块。
+        
+        Args:
+            start: 起始时间戳，为None时从头开始
+            end: 结束时间戳，为None时到文件末尾
+            levels: 需要的级别集合，为None时不过滤
+            reverse: 是否从最新的日志开始产出
+            
+        Yields:
+            dict: 日志条目
+        """
+        blocks = self.load_blocks()
+        starts = [block["start"] for block in blocks]
+        first = max(bisect.bisect_right(starts, start) - 1, 0) if start is not None else 0
+        last = bisect.bisect_right(starts, end) if end is not None else len(blocks)
+        selected = blocks[first:last]
+        if levels is not None:
+            selected = [
+                block for block in selected
+                if block["levels"] is None or not levels.isdisjoint(block["levels"])
+            ]
+        if reverse:
+            selected.reverse()
+            
+        with open(self.path, "rb") as f:
+            for block in selected:
+                f.seek(block["offset"])
+                items = []
+                for line in f.read(block["length"]).splitlines():
+                    try:
+                        item = json.loads(line)
+                    except ValueError:
+                        continue
+                    ts = item.get("ts", 0.0)
+                    if start is not None and ts < start:
+                        continue
+                    if end is not None and ts > end:
+                        continue
+                    if levels is not None and item.get("level") not in levels:
+                        continue
+                    items.append(item)
+                if reverse:
+                    items.reverse()
+                yield from items
+
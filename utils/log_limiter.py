@@ -0,0 +1,218 @@
+import re
+import time
+import logging
+import threading
+from collections import OrderedDict
+
+
+# 消息中的可变部分: 引号内的内容、“ = ”之后的值、含数字或路径分隔符的ASCII词（数字、路径、文件名、点分配置键等）
+_VARIABLE_PATTERN = re.compile(
+    r"'[^']*'|\"[^\"]*\"|(?<= = ).*$|[^\s:,\u0080-\uffff]*[0-9/\\.@][^\s,\u0080-\uffff]*"
+)
+
+
+class _TokenBucket:
+    """单个 (来源, 消息模板) 的令牌桶"""
+    
+    __slots__ = ("tokens", "updated", "dropped")
+    
+    def __init__(self, tokens, updated):
+        self.tokens = tokens
+        self.updated = updated
+        # 上次放行之后被限流的条数
+        self.dropped = 0
+
+
+class _LastMessage:
+    """某个来源最近一条日志及其被折叠的重复次数"""
+    
+    __slots__ = ("level", "message", "repeats", "since")
+    
+    def __init__(self, level, message, since):
+        self.level = level
+        self.message = message
+        self.repeats = 0
+        self.since = since
+
+
+class LogRateLimiter:
+    """日志限流和重复折叠
+    
+    1. 同一来源连续记录完全相同的日志时只保留第一条，之后的重复在出现不同的日志、
+       或者距离上次报告超过report_interval秒时汇总为一条“重复了N次”的日志；
+    2. 每个 (来源, 消息模板) 有一个令牌桶，每秒补充rate个令牌，最多积累burst个，
+       令牌用完后的日志被丢弃，下一次放行时先汇总为一条“已限流N条”的日志。
+    消息模板把数字、路径、引号内容等可变部分替换为“*”，同一处代码产生的日志共用一个桶。
+    级别不低于exempt_level的日志不限流，但仍会折叠重复。
+    """
+    
+    # 未单独设置的来源使用的默认值
+    DEFAULT_RATE = 5.0
+    DEFAULT_BURST = 20
+    
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, report_interval=60.0,
+                 exempt_level=logging.ERROR, max_keys=4096):
+        """初始化限流器
+        
+        Args:
+            rate: 每个消息模板每秒允许的日志条数
+            burst: 每个消息模板允许的突发条数
+            report_interval: 重复日志的最长汇总间隔（秒）
+            exempt_level: 不限流的最低级别
+            max_keys: 最多保留的令牌桶数量，超出时丢弃最久未使用的
+        """
+        self.rate = rate
+        self.burst = burst
+        self.report_interval = report_interval
+        self.exempt_level = exempt_level
+        self.max_keys = max_keys
+        
+        self._lock = threading.Lock()
+        self._source_limits = {}
+        self._buckets = OrderedDict()
+        self._last = {}
+        self._stats = {
+            "checked": 0, "passed": 0, "rate_limited": 0, "repeats_collapsed": 0,
+            "suppressed_bytes": 0, "notices": 0
+        }
+        self._suppressed_by_source = {}
+        
+    def set_source_limit(self, source, rate=None, burst=None, enabled=True):
+        """单独设置某个来源的限流参数
+        
+        Args:
+            source: 日志来源
+            rate: 每个消息模板每秒允许的日志条数，为None时使用默认值
+            burst: 每个消息模板允许的突发条数，为None时使用默认值
+            enabled: 为False时该来源不限流（仍会折叠重复）
+        """
+        with self._lock:
+            self._source_limits[source] = (
+                self.rate if rate is None else rate,
+                self.burst if burst is None else burst,
+                enabled
+            )
+            # 已有的令牌桶按新参数重新计算
+            for key in [key for key in self._buckets if key[0] == source]:
+                del self._buckets[key]
+                
+    @staticmethod
+    def template(message):
+        """生成消息模板，可变部分替换为“*”
+        
+        Args:
+            message: 日志消息
+            
+        Returns:
+            str: 消息模板
+        """
+        return _VARIABLE_PATTERN.sub("*", message)
+        
+    def check(self, level, message, source, now=None):
+        """判断一条日志是否放行
+        
+        Args:
+            level: 日志级别（整数）
+            message: 日志消息
+            source: 日志来源
+            now: 当前时间，为None时使用time.monotonic()
+            
+        Returns:
+            tuple: (是否放行, 放行之前需要先记录的汇总日志列表)，
+                汇总日志为 (级别, 消息, 来源) 元组
+        """
+        now = time.monotonic() if now is None else now
+        notices = []
+        with self._lock:
+            self._stats["checked"] += 1
+            
+            # 折叠同一来源连续的相同日志
+            last = self._last.get(source)
+            if last is not None and last.message == message and last.level == level:
+                last.repeats += 1
+                self._suppress(source, message, "repeats_collapsed")
+                if now - last.since >= self.report_interval:
+                    notices.append(self._repeat_notice(source, last))
+                    last.repeats = 0
+                    last.since = now
+                self._stats["notices"] += len(notices)
+                return False, notices
+            if last is not None and last.repeats:
+                notices.append(self._repeat_notice(source, last))
+                
+            # 令牌桶限流
+            if level < self.exempt_level:
+                rate, burst, enabled = self._source_limits.get(source, (self.rate, self.burst, True))
+                if enabled:
+                    pattern = self.template(message)
+                    key = (source, pattern)
+                    bucket = self._buckets.get(key)
+                    if bucket is None:
+                        bucket = self._buckets[key] = _TokenBucket(burst, now)
+                        if len(self._buckets) > self.max_keys:
+                            self._buckets.popitem(last=False)
+                    else:
+                        self._buckets.move_to_end(key)
+                        bucket.tokens = min(burst, bucket.tokens + (now - bucket.updated) * rate)
+                        bucket.updated = now
+                    if bucket.tokens < 1:
+                        bucket.dropped += 1
+                        self._suppress(source, message, "rate_limited")
+                        # 被限流的日志不参与重复折叠，之前的重复已经汇总
+                        self._last.pop(source, None)
+                        self._stats["notices"] += len(notices)
+                        return False, notices
+                    bucket.tokens -= 1
+                    if bucket.dropped:
+                        notices.append((level, f"已限流{bucket.dropped}条类似日志: {pattern}", source))
+                        bucket.dropped = 0
+                        
+            self._last[source] = _LastMessage(level, message, now)
+            self._stats["passed"] += 1
+            self._stats["notices"] += len(notices)
+        return True, notices
+        
+    def drain(self):
+        """取出所有尚未汇总的重复日志和限流条数，用于退出或写入文件之前
+        
+        Returns:
+            list: 汇总日志列表，元素为 (级别, 消息, 来源) 元组
+        """
+        now = time.monotonic()
+        notices = []
+        with self._lock:
+            for source, last in self._last.items():
+                if last.repeats:
+                    notices.append(self._repeat_notice(source, last))
+                    last.repeats = 0
+                    last.since = now
+            for (source, pattern), bucket in self._buckets.items():
+                if bucket.dropped:
+                    notices.append((logging.INFO, f"已限流{bucket.dropped}条类似日志: {pattern}", source))
+                    bucket.dropped = 0
+            self._stats["notices"] += len(notices)
+        return notices
+        
+    def get_stats(self):
+        """获取限流统计
+        
+        Returns:
+            dict: 检查、放行、被限流、被折叠的日志条数，被抑制的字节数，
+                汇总日志条数，以及按来源统计的被抑制条数
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["suppressed"] = stats["rate_limited"] + stats["repeats_collapsed"]
+            stats["sources"] = dict(self._suppressed_by_source)
+        return stats
+        
+    def _suppress(self, source, message, reason):
+        """记录一条被抑制的日志（调用时已持有锁）"""
+        self._stats[reason] += 1
+        self._stats["suppressed_bytes"] += len(message.encode("utf-8"))
+        self._suppressed_by_source[source] = self._suppressed_by_source.get(source, 0) + 1
+        
+    @staticmethod
+    def _repeat_notice(source, last):
+        """生成重复日志的汇总"""
+        return last.level, f"上一条消息重复了{last.repeats}次: {last.message}", source
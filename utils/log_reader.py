@@ -0,0 +1,93 @@
+import io
+import os
+import gzip
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def is_compressed(path):
+    """是否为压缩后的日志文件
+    
+    Args:
+        path: 文件路径
+        
+    Returns:
+        bool: 文件名以 .gz 或 .zst 结尾时为True
+    """
+    return path.endswith((".gz", ".zst"))
+
+
+def open_log_file(path):
+    """以二进制模式打开日志文件，压缩文件在读取时流式解压
+    
+    Args:
+        path: 文件路径
+        
+    Returns:
+        file: 可逐行迭代的二进制文件对象，压缩文件不支持seek到末尾
+        
+    Raises:
+        RuntimeError: 读取zstd压缩的日志需要安装zstandard
+    """
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("读取zstd压缩的日志需要安装zstandard")
+        raw = open(path, "rb")
+        # 解压流不支持逐行读取，套一层缓冲读取器
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return open(path, "rb")
+
+
+def iter_lines_reverse(path, chunk_size=65536, encoding="utf-8"):
+    """从文件末尾开始逐行向前读取
+    
+    未压缩的文件每次从末尾向前读取一块，按换行符切分后倒序产出，
+    只需读到找够所需的行为止，不会把整个文件读入内存。
+    UTF-8编码中换行符不会出现在多字节字符内部，按字节切分是安全的。
+    
+    Args:
+        path: 文件路径
+        chunk_size: 每次读取的字节数
+        encoding: 文件编码
+        
+    Yields:
+        str: 去掉行尾换行符的一行文本，从最后一行开始
+    """
+    if is_compressed(path):
+        # 压缩文件无法从末尾定位，流式解压后倒序产出；压缩的都是已关闭的旧日志，大小有上限
+        with open_log_file(path) as f:
+            lines = f.read().split(b"\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        for line in reversed(lines):
+            yield line.rstrip(b"\r").decode(encoding, errors="replace")
+        return
+        
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        remainder = b""
+        first = True
+        while pos > 0:
+            size = min(chunk_size, pos)
+            pos -= size
+            f.seek(pos)
+            lines = (f.read(size) + remainder).split(b"\n")
+            # 第一段可能是被截断的行，与前一块拼接后再处理
+            remainder = lines[0]
+            rest = lines[1:]
+            if first:
+                first = False
+                # 文件以换行符结尾时最后一段为空
+                if rest and not rest[-1]:
+                    rest.pop()
+            for line in reversed(rest):
+                yield line.rstrip(b"\r").decode(encoding, errors="replace")
+        if remainder or not first:
+            yield remainder.rstrip(b"\r").decode(encoding, errors="replace")
+
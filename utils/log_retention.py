@@ -0,0 +1,256 @@
+import os
+import re
+import gzip
+import time
+import shutil
+import threading
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# 滚动产生的旧日志，如 app_20250412.log.1
+_ROTATED_PATTERN = re.compile(r"^(?P<stem>.+)\.log\.\d+$")
+
+
+class LogRetentionManager:
+    """日志压缩和保留策略
+    
+    在后台线程中定期处理日志目录:
+    1. 把滚动产生的 .log.N 文件改为带时间戳的唯一名称，之后不再参与滚动;
+    2. 把不再写入的日志文件（前几天的日志、上一步改名后的文件）流式压缩为gzip或zstd;
+    3. 删除超过保留天数的日志，总大小超过预算时从最旧的日志开始删除。
+    正在写入的日志文件不会被压缩或删除。
+    """
+    
+    # 压缩格式对应的文件后缀
+    SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+    
+    # 日志目录中由本管理器处理的文件后缀
+    LOG_SUFFIXES = (".log", ".jsonl")
+    
+    # 流式压缩时每次读写的字节数
+    CHUNK_SIZE = 1024 * 1024
+    
+    def __init__(self, log_dir, max_age_days=30, max_total_bytes=200 * 1024 * 1024, compression="gzip",
+                 active_files=None, rotation_lock=None, logger=None):
+        """初始化日志保留管理器
+        
+        Args:
+            log_dir: 日志目录
+            max_age_days: 日志保留天数，为0时不按时间删除
+            max_total_bytes: 日志目录总大小预算（字节），为0时不限制
+            compression: 压缩格式，gzip、zstd或None，未安装zstandard时zstd退回gzip
+            active_files: 返回正在写入的文件路径集合的函数
+            rotation_lock: 日志滚动时持有的锁，改名滚动文件时需要持有，避免与滚动同时进行
+            logger: 日志管理器，用于记录处理结果
+        """
+        self.log_dir = log_dir
+        self.max_age_days = max_age_days
+        self.max_total_bytes = max_total_bytes
+        if compression == "zstd" and zstandard is None:
+            compression = "gzip"
+        self.compression = compression or None
+        self.active_files = active_files or (lambda: set())
+        self.rotation_lock = rotation_lock or threading.RLock()
+        self.logger = logger
+        
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._stats = {"runs": 0, "compressed": 0, "deleted": 0, "bytes_saved": 0, "bytes_deleted": 0}
+        
+    def start(self, interval=3600):
+        """启动后台线程，立即处理一次，之后每隔interval秒处理一次
+        
+        Args:
+            interval: 处理间隔（秒）
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, args=(interval,), name="LogRetention", daemon=True)
+        self._thread.start()
+        
+    def stop(self):
+        """停止后台线程"""
+        self._stop_event.set()
+        
+    def _loop(self, interval):
+        """后台线程主循环"""
+        while not self._stop_event.is_set():
+            try:
+                self.run()
+            except Exception as e:
+                self._log(f"日志保留处理失败: {e}", error=True)
+            self._stop_event.wait(interval)
+            
+    def run(self):
+        """处理一次日志目录
+        
+        Returns:
+            dict: 本次压缩和删除的文件数量以及节省和删除的字节数
+        """
+        with self._run_lock:
+            result = {"compressed": 0, "deleted": 0, "bytes_saved": 0, "bytes_deleted": 0}
+            if not os.path.isdir(self.log_dir):
+                return result
+            active = {os.path.abspath(path) for path in self.active_files() if path}
+            
+            self._archive_rotated_files()
+            if self.compression:
+                for _, _, path in self._closed_files(active, compressed=False):
+                    result["bytes_saved"] += self._compress_file(path)
+                    result["compressed"] += 1
+            deleted, deleted_bytes = self._enforce_budgets(active)
+            result["deleted"] = deleted
+            result["bytes_deleted"] = deleted_bytes
+            
+            self._stats["runs"] += 1
+            for key, value in result.items():
+                self._stats[key] += value
+            if result["compressed"] or result["deleted"]:
+                self._log(
+                    f"日志保留: 压缩{result['compressed']}个文件（节省{result['bytes_saved'] / 1024:.1f} KB），"
+                    f"删除{result['deleted']}个文件（{result['bytes_deleted'] / 1024:.1f} KB）"
+                )
+            return result
+            
+    def get_stats(self):
+        """获取累计处理统计
+        
+        Returns:
+            dict: 处理次数、压缩和删除的文件数量、节省和删除的字节数
+        """
+        return dict(self._stats)
+        
+    def _archive_rotated_files(self):
+        """把滚动产生的 .log.N 文件改为带修改时间的唯一名称
+        
+        改名在滚动锁内进行，不会与日志处理器的滚动改名同时发生。
+        """
+        with self.rotation_lock:
+            for entry in list(os.scandir(self.log_dir)):
+                match = _ROTATED_PATTERN.match(entry.name)
+                if not match or not entry.is_file():
+                    continue
+                stamp = datetime.fromtimestamp(entry.stat().st_mtime).strftime("%Y%m%d%H%M%S")
+                target = self._unique_path(os.path.join(self.log_dir, f"{match.group('stem')}-{stamp}.log"))
+                os.replace(entry.path, target)
+                
+    def _closed_files(self, active, compressed):
+        """列出不再写入的日志文件
+        
+        Args:
+            active: 正在写入的文件路径集合
+            compressed: True时列出已压缩的文件，False时列出未压缩的文件
+            
+        Returns:
+            list: (修改时间, 大小, 路径) 列表，按修改时间从旧到新排列
+        """
+        files = []
+        for entry in os.scandir(self.log_dir):
+            if not entry.is_file() or os.path.abspath(entry.path) in active:
+                continue
+            name = entry.name
+            is_compressed = name.endswith(tuple(self.SUFFIXES.values()))
+            base = os.path.splitext(name)[0] if is_compressed else name
+            if not base.endswith(self.LOG_SUFFIXES) or is_compressed != compressed:
+                continue
+            stat = entry.stat()
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+        files.sort()
+        return files
+        
+    def _compress_file(self, path):
+        """流式压缩单个文件，保留原来的修改时间，完成后删除原文件
+        
+        JSON Lines日志的块索引只对未压缩的文件有效，压缩后一并删除。
+        
+        Args:
+            path: 文件路径
+            
+        Returns:
+            int: 节省的字节数
+        """
+        stat = os.stat(path)
+        target = path + self.SUFFIXES[self.compression]
+        partial = target + ".part"
+        try:
+            with open(path, "rb") as src:
+                if self.compression == "zstd":
+                    with open(partial, "wb") as raw:
+                        with zstandard.ZstdCompressor(level=3).stream_writer(raw) as writer:
+                            shutil.copyfileobj(src, writer, self.CHUNK_SIZE)
+                else:
+                    with gzip.open(partial, "wb", compresslevel=6) as writer:
+                        shutil.copyfileobj(src, writer, self.CHUNK_SIZE)
+            # 保留修改时间，按时间排序的文件列表和搜索结果顺序不变
+            os.utime(partial, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(partial, target)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+        os.remove(path)
+        if path.endswith(".jsonl") and os.path.exists(path + ".idx"):
+            os.remove(path + ".idx")
+        return stat.st_size - os.path.getsize(target)
+        
+    def _enforce_budgets(self, active):
+        """删除超过保留天数的日志，总大小超出预算时从最旧的日志开始删除
+        
+        Args:
+            active: 正在写入的文件路径集合
+            
+        Returns:
+            tuple: (删除的文件数量, 删除的字节数)
+        """
+        files = self._closed_files(active, compressed=True) + self._closed_files(active, compressed=False)
+        files.sort()
+        
+        total = sum(size for _, size, _ in files)
+        for path in active:
+            if os.path.exists(path):
+                total += os.path.getsize(path)
+                
+        cutoff = time.time() - self.max_age_days * 86400 if self.max_age_days else None
+        deleted = 0
+        deleted_bytes = 0
+        for mtime, size, path in files:
+            expired = cutoff is not None and mtime < cutoff
+            over_budget = self.max_total_bytes and total > self.max_total_bytes
+            if not expired and not over_budget:
+                # 文件按时间排列，后面的文件更新
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            if path.endswith(".jsonl") and os.path.exists(path + ".idx"):
+                os.remove(path + ".idx")
+            total -= size
+            deleted += 1
+            deleted_bytes += size
+        return deleted, deleted_bytes
+        
+    @staticmethod
+    def _unique_path(path):
+        """文件已存在时在扩展名前追加序号"""
+        if not os.path.exists(path):
+            return path
+        root, ext = os.path.splitext(path)
+        index = 2
+        while os.path.exists(f"{root}_{index}{ext}"):
+            index += 1
+        return f"{root}_{index}{ext}"
+        
+    def _log(self, message, error=False):
+        if self.logger is None:
+            return
+        if error:
+            self.logger.error(message, "LogRetention")
+        else:
+            self.logger.info(message, "LogRetention")
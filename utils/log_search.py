@@ -0,0 +1,298 @@
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import LoggerManager, LogMessage
+from utils.log_reader import is_compressed, open_log_file
+
+
+# 一条搜索结果: 所在文件、行首的字节偏移和解析后的日志消息
+SearchMatch = namedtuple("SearchMatch", ["file", "offset", "log"])
+
+
+class LogSearchCancelled(Exception):
+    """日志搜索已取消"""
+
+
+class _CachedScan:
+    """单个文件在某个查询下的扫描结果"""
+    
+    __slots__ = ("inode", "size", "mtime_ns", "matches", "context")
+    
+    def __init__(self, inode, size, mtime_ns, matches, context):
+        self.inode = inode
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.matches = matches
+        # 扫描结束时最后一条日志的首行，追加扫描时续接多行日志
+        self.context = context
+
+
+class LogSearchEngine:
+    """跨文件日志搜索
+    
+    在多个工作线程中并行扫描当天的日志、滚动产生的旧日志和历史日志，
+    结果按文件的时间先后、文件内按行的先后依次产出，每条结果带有文件和字节偏移。
+    每个文件的扫描结果按 (文件, 查询) 缓存，文件大小和修改时间不变时直接复用；
+    文件只是追加了内容时只扫描新增的部分。
+    """
+    
+    # 扫描时每隔多少行检查一次是否已取消
+    CANCEL_CHECK_LINES = 4096
+    
+    def __init__(self, max_workers=4, cache_size=128):
+        """初始化搜索引擎
+        
+        Args:
+            max_workers: 并行扫描的线程数
+            cache_size: 缓存的 (文件, 查询) 扫描结果数量
+        """
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._stats = {"searches": 0, "files_scanned": 0, "cache_hits": 0, "bytes_scanned": 0}
+        
+    @staticmethod
+    def list_log_files(log_dir):
+        """列出目录中的日志文件，包括滚动产生的 .log.1 等文件和压缩后的 .log.gz/.log.zst 文件
+        
+        Args:
+            log_dir: 日志目录
+            
+        Returns:
+            list: 日志文件路径列表，按修改时间从旧到新排列
+        """
+        if not os.path.isdir(log_dir):
+            return []
+        files = []
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_file() and re.search(r"\.log(\.\d+|\.gz|\.zst)?$", name):
+                    files.append((entry.stat().st_mtime_ns, entry.path))
+        files.sort()
+        return [path for _, path in files]
+        
+    def iter_search(self, files, pattern, regex=False, case_sensitive=False, level=None, source=None,
+                    cancelled=None):
+        """搜索日志文件
+        
+        所有文件同时开始扫描，按文件修改时间从旧到新依次产出结果，
+        前面的文件扫描完成后即可开始产出，不需要等待所有文件。
+        
+        Args:
+            files: 日志文件路径列表
+            pattern: 搜索内容，为空时匹配所有日志
+            regex: pattern是否为正则表达式
+            case_sensitive: 是否区分大小写
+            level: 过滤的日志级别
+            source: 过滤的日志来源
+            cancelled: 返回是否已取消的函数，为None时不能取消
+            
+        Yields:
+            SearchMatch: 搜索结果，按时间先后排列
+            
+        Raises:
+            re.error: 正则表达式不正确
+            LogSearchCancelled: 搜索已取消
+        """
+        query = (pattern or "", bool(regex), bool(case_sensitive), level or None, source or None)
+        matcher = self._build_matcher(*query[:3])
+        self._count("searches")
+        
+        ordered = []
+        for path in files:
+            try:
+                ordered.append((os.stat(path).st_mtime_ns, path))
+            except OSError:
+                continue
+        ordered.sort()
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="LogSearch")
+        futures = []
+        try:
+            futures = [
+                executor.submit(self._scan_file, path, query, matcher, cancelled)
+                for _, path in ordered
+            ]
+            for future in futures:
+                yield from future.result()
+                if cancelled is not None and cancelled():
+                    raise LogSearchCancelled()
+        finally:
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+            
+    def search(self, files, pattern, max_results=1000, **options):
+        """搜索日志文件并返回最早的若干条结果
+        
+        Args:
+            files: 日志文件路径列表
+            pattern: 搜索内容
+            max_results: 最多返回的结果数
+            **options: 传给iter_search的其他参数
+            
+        Returns:
+            list: 搜索结果列表
+        """
+        results = []
+        for match in self.iter_search(files, pattern, **options):
+            results.append(match)
+            if len(results) >= max_results:
+                break
+        return results
+        
+    def clear_cache(self):
+        """清空扫描结果缓存"""
+        with self._cache_lock:
+            self._cache.clear()
+            
+    def _count(self, name, amount=1):
+        """增加统计计数，扫描在多个工作线程中进行"""
+        with self._cache_lock:
+            self._stats[name] += amount
+            
+    def get_stats(self):
+        """获取搜索统计信息
+        
+        Returns:
+            dict: 搜索次数、扫描的文件数、缓存命中次数、扫描的字节数和缓存条目数
+        """
+        with self._cache_lock:
+            stats = dict(self._stats)
+            stats["cache_entries"] = len(self._cache)
+        return stats
+        
+    @staticmethod
+    def _build_matcher(pattern, regex, case_sensitive):
+        """生成判断一行是否匹配的函数
+        
+        Returns:
+            function: 参数为一行文本，返回是否匹配；pattern为空时为None
+        """
+        if not pattern:
+            return None
+        if regex:
+            compiled = re.compile(pattern, 0 if case_sensitive else re.IGNORECASE)
+            return lambda line: compiled.search(line) is not None
+        if case_sensitive:
+            return lambda line: pattern in line
+        needle = pattern.lower()
+        return lambda line: needle in line.lower()
+        
+    def _scan_file(self, path, query, matcher, cancelled):
+        """扫描单个文件，优先使用缓存（在工作线程中执行）
+        
+        Args:
+            path: 文件路径
+            query: 查询条件元组，用作缓存键的一部分
+            matcher: 判断一行是否匹配的函数
+            cancelled: 返回是否已取消的函数
+            
+        Returns:
+            list: 该文件中的搜索结果
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return []
+        key = (path, query)
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                
+        if cached is not None and cached.size == stat.st_size and cached.mtime_ns == stat.st_mtime_ns:
+            self._count("cache_hits")
+            return cached.matches
+            
+        start, matches, context = 0, [], None
+        if (cached is not None and cached.inode == stat.st_ino and cached.size < stat.st_size
+                and not is_compressed(path)):
+            # 同一个文件只是追加了内容，从上次扫描结束的位置继续
+            start, matches, context = cached.size, list(cached.matches), cached.context
+            
+        end, new_matches, context = self._scan_range(path, start, query, matcher, cancelled, context)
+        matches.extend(new_matches)
+        self._count("files_scanned")
+        self._count("bytes_scanned", end - start)
+        
+        if is_compressed(path) or end == stat.st_size:
+            cached = _CachedScan(stat.st_ino, stat.st_size, stat.st_mtime_ns, matches, context)
+        else:
+            # 最后一行还没有写完，只记录已扫描的位置，下次从这里继续
+            cached = _CachedScan(stat.st_ino, end, 0, matches, context)
+        with self._cache_lock:
+            self._cache[key] = cached
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return matches
+        
+    def _scan_range(self, path, start, query, matcher, cancelled, header):
+        """从start开始逐行扫描文件
+        
+        不是日志记录开头的行（如异常堆栈）归属于上一条日志，使用上一条日志的时间、级别和来源。
+        只有匹配的行才解析为日志消息，不匹配的行只做一次切分。
+        
+        Args:
+            path: 文件路径
+            start: 开始扫描的字节偏移
+            query: 查询条件元组
+            matcher: 判断一行是否匹配的函数
+            cancelled: 返回是否已取消的函数
+            header: 上一条日志的首行
+            
+        Returns:
+            tuple: (扫描结束的字节偏移, 搜索结果列表, 最后一条日志的首行)
+        """
+        level, source = query[3], query[4]
+        levels = LoggerManager.LEVEL_COLORS
+        matches = []
+        offset = start
+        header_level = header.split(" - ", 2)[1] if header else None
+        header_log = None
+        # 压缩文件流式解压，偏移为解压后的偏移；压缩的都是已关闭的文件，总是从头扫描
+        compressed = is_compressed(path)
+        with open_log_file(path) as f:
+            if start:
+                f.seek(start)
+            for line_no, raw in enumerate(f):
+                if not raw.endswith(b"\n") and not compressed:
+                    # 最后一行还没有写完，下次再扫描
+                    break
+                line_offset = offset
+                offset += len(raw)
+                if line_no % self.CANCEL_CHECK_LINES == 0 and cancelled is not None and cancelled():
+                    raise LogSearchCancelled()
+                    
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                parts = line.split(" - ", 2)
+                if len(parts) == 3 and parts[1] in levels:
+                    header, header_level, header_log = line, parts[1], None
+                    is_header = True
+                elif header is not None:
+                    is_header = False
+                else:
+                    continue
+                    
+                if level and header_level != level:
+                    continue
+                if matcher is not None and not matcher(line):
+                    continue
+                    
+                if header_log is None:
+                    header_log = LoggerManager.parse_log_line(header)
+                if header_log is None:
+                    continue
+                if source and header_log.source != source:
+                    continue
+                if is_header:
+                    log = header_log
+                else:
+                    log = LogMessage(header_log.level, line, header_log.time_str, header_log.source)
+                matches.append(SearchMatch(path, line_offset, log))
+        return offset, matches, header
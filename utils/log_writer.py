@@ -0,0 +1,263 @@
+import queue
+import atexit
+import logging
+import threading
+import time
+from logging.handlers import QueueHandler
+
+
+class _FlushRequest:
+    """刷新请求，写入线程处理到它时说明之前的日志都已写入"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+
+
+# 停止写入线程的标记
+_STOP = object()
+
+
+class _BufferedQueueHandler(QueueHandler):
+    """把日志记录放入后台写入器的队列
+    
+    标准库的QueueHandler会在调用方线程中格式化消息，这里只合并参数，
+    格式化留给写入线程完成。
+    """
+    
+    def __init__(self, writer):
+        super().__init__(None)
+        self.writer = writer
+        
+    def prepare(self, record):
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            # 异常信息需要在原线程中转换为文本，traceback对象不能跨线程保留
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+        
+    def enqueue(self, record):
+        self.writer.enqueue(record)
+
+
+class AsyncLogWriter:
+    """后台批量日志写入器
+    
+    调用方线程只把日志记录放入有界队列，写入线程按批取出后格式化，
+    写入目标处理器后只刷新一次文件。每批在达到batch_size条或距第一条日志
+    超过flush_interval秒时写入。队列满时按overflow_policy处理:
+    "drop" 丢弃INFO及以下级别的新日志，WARNING及以上级别仍等待写入;
+    "block" 所有日志都等待队列有空位。
+    """
+    
+    # 支持的队列满处理策略
+    POLICIES = ("drop", "block")
+    
+    def __init__(self, target, capacity=10000, batch_size=256, flush_interval=0.2,
+                 overflow_policy="drop", block_timeout=1.0):
+        """初始化后台写入器
+        
+        Args:
+            target: 实际写入的文件处理器，FileHandler或其子类（如RotatingFileHandler）
+            capacity: 队列容量
+            batch_size: 每批最多写入的日志条数
+            flush_interval: 一批日志最长等待时间（秒）
+            overflow_policy: 队列满时的处理策略，drop或block
+            block_timeout: 等待队列空位的最长时间（秒），超时后丢弃
+        """
+        if overflow_policy not in self.POLICIES:
+            raise ValueError(f"不支持的队列满处理策略: {overflow_policy}")
+        self.target = target
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        
+        self._queue = queue.Queue(maxsize=capacity)
+        self._stats_lock = threading.Lock()
+        self._stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "errors": 0}
+        
+        # 额外的输出，每个输出需要提供write_batch(records)和close()方法
+        self._sinks = []
+        
+        # 挂到日志记录器上的处理器
+        self.handler = _BufferedQueueHandler(self)
+        
+        self._thread = threading.Thread(target=self._run, name="AsyncLogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        
+    def add_sink(self, sink):
+        """添加额外的输出，每批日志写入文件后也写入该输出
+        
+        Args:
+            sink: 提供write_batch(records)和close()方法的对象
+        """
+        # 写入线程遍历的是旧列表，替换列表而不是原地修改
+        self._sinks = self._sinks + [sink]
+        
+    def enqueue(self, record):
+        """把日志记录放入队列
+        
+        Args:
+            record: 日志记录
+            
+        Returns:
+            bool: 是否已放入队列，被丢弃时为False
+        """
+        if not self._thread.is_alive():
+            # 写入线程已停止（如程序退出阶段），直接同步写入
+            self._write_batch([record])
+            return True
+        try:
+            if self.overflow_policy == "block" or record.levelno >= logging.WARNING:
+                self._queue.put(record, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            with self._stats_lock:
+                self._stats["dropped"] += 1
+            return False
+        with self._stats_lock:
+            self._stats["queued"] += 1
+        return True
+        
+    def flush(self, timeout=5.0):
+        """等待已放入队列的日志全部写入文件
+        
+        Args:
+            timeout: 最长等待时间（秒）
+            
+        Returns:
+            bool: 是否在超时前写入完成
+        """
+        if not self._thread.is_alive():
+            return True
+        # 放入队列和等待写入共用同一个截止时间，总等待时间不超过timeout
+        deadline = time.monotonic() + timeout
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(max(0.0, deadline - time.monotonic()))
+        
+    def stop(self, timeout=5.0):
+        """写完队列中剩余的日志后停止写入线程
+        
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        for sink in self._sinks:
+            sink.close()
+        
+    def get_stats(self):
+        """获取写入统计信息
+        
+        Returns:
+            dict: 放入队列、已写入、被丢弃的日志条数，写入批次、写入错误次数和当前队列长度
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+        
+    def _run(self):
+        """写入线程主循环"""
+        while True:
+            item = self._queue.get()
+            batch = []
+            requests = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    # 刷新请求需要立即写入当前批次
+                    requests.append(item)
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get_nowait() if remaining <= 0 else self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                    
+            if batch:
+                self._write_batch(batch)
+            for request in requests:
+                request.done.set()
+            if stop:
+                self._drain()
+                return
+                
+    def _drain(self):
+        """写入停止标记之后剩余的日志"""
+        batch = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, _FlushRequest):
+                item.done.set()
+            elif item is not _STOP:
+                batch.append(item)
+        if batch:
+            self._write_batch(batch)
+            
+    def _write_batch(self, batch):
+        """格式化并写入一批日志，最后只刷新一次
+        
+        Args:
+            batch: 日志记录列表
+        """
+        target = self.target
+        written = 0
+        target.acquire()
+        try:
+            for record in batch:
+                if record.levelno < target.level:
+                    continue
+                try:
+                    should_rollover = getattr(target, "shouldRollover", None)
+                    if should_rollover is not None and should_rollover(record):
+                        target.doRollover()
+                    if target.stream is None:
+                        target.stream = target._open()
+                    target.stream.write(target.format(record) + target.terminator)
+                    written += 1
+                except Exception:
+                    with self._stats_lock:
+                        self._stats["errors"] += 1
+            try:
+                target.flush()
+            except Exception:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+        finally:
+            target.release()
+            
+        for sink in self._sinks:
+            try:
+                sink.write_batch(batch)
+            except Exception:
+                with self._stats_lock:
+                    self._stats["errors"] += 1
+                    
+        with self._stats_lock:
+            self._stats["written"] += written
+            self._stats["batches"] += 1
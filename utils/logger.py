@@ -1,39 +1,181 @@
 import logging
 import os
+import re
+import sys
 import time
-import queue
+import threading
 from logging.handlers import RotatingFileHandler
 from datetime import datetime
 from PyQt5.QtCore import QObject, pyqtSignal
 from PyQt5.QtGui import QColor
+from utils.log_writer import AsyncLogWriter
+from utils.log_reader import iter_lines_reverse
+from utils.log_jsonl import JsonLinesLogSink, JsonLinesLogReader
+from utils.log_retention import LogRetentionManager
+from utils.log_limiter import LogRateLimiter
 
 class LogMessage:
-    """日志消息类，用于存储日志信息"""
+    """日志消息类，用于存储日志信息
     
-    def __init__(self, level, message, time_str=None, source=None):
+    使用__slots__减少每条日志的内存占用。创建时只记录浮点时间戳，
+    时间字符串在第一次访问time_str时才格式化；级别和来源字符串经过驻留，
+    大量日志共用同一个字符串对象。
+    """
+    
+    __slots__ = ("level", "message", "source", "timestamp", "seq", "_time_str")
+    
+    # 最近格式化过的整秒及其字符串，同一秒内的日志只需补上毫秒
+    _second_cache = (None, "")
+    
+    def __init__(self, level, message, time_str=None, source=None, timestamp=None):
         """初始化日志消息
         
         Args:
             level: 日志级别
             message: 日志消息内容
-            time_str: 日志时间字符串，如果为None则使用当前时间
+            time_str: 日志时间字符串，如果为None则根据timestamp格式化
             source: 日志来源
+            timestamp: 日志时间戳，如果为None则使用当前时间
         """
-        self.level = level
+        self.level = sys.intern(level)
         self.message = message
-        self.time_str = time_str or datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        self.source = source or "app"
+        self.source = sys.intern(source) if source else "app"
+        self.timestamp = time.time() if timestamp is None else timestamp
+        # 内存日志缓冲区分配的序号，未进入缓冲区时为0
+        self.seq = 0
+        self._time_str = time_str
+        
+    @property
+    def time_str(self):
+        """日志时间字符串，格式为 年-月-日 时:分:秒.毫秒"""
+        if self._time_str is None:
+            second = int(self.timestamp)
+            cached_second, prefix = LogMessage._second_cache
+            if cached_second != second:
+                prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+                LogMessage._second_cache = (second, prefix)
+            self._time_str = f"{prefix}.{int((self.timestamp - second) * 1000):03d}"
+        return self._time_str
         
     def __str__(self):
         """返回日志消息的字符串表示形式"""
         return f"[{self.time_str}] [{self.level}] [{self.source}] {self.message}"
 
+class SourceFormatter(logging.Formatter):
+    """在消息前加上日志来源的格式化器
+    
+    LoggerManager记录的日志带有source属性，写入文件时格式为 "[来源] 消息"；
+    其他模块通过根日志记录器写入的日志没有来源前缀。
+    """
+    
+    def formatMessage(self, record):
+        source = getattr(record, "source", None)
+        record.source_prefix = f"[{source}] " if source else ""
+        return super().formatMessage(record)
+
+class LogRing:
+    """固定容量的日志环形缓冲区
+    
+    每条日志分配一个单调递增的序号，写满后覆盖最旧的日志。
+    写入方之间用锁互斥；读取方不加锁，按序号直接定位槽位，
+    读到已被覆盖的槽位（槽位中的序号与期望不符）时跳过，
+    因此 get_since 的耗时只与新日志的数量有关。
+    """
+    
+    def __init__(self, capacity=1000):
+        """初始化环形缓冲区
+        
+        Args:
+            capacity: 容量
+        """
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._write_lock = threading.Lock()
+        # 最近一条日志的序号，序号从1开始
+        self._last_seq = 0
+        # 清空时的序号，读取时忽略不大于它的日志
+        self._cleared_seq = 0
+        
+    @property
+    def last_seq(self):
+        """最近一条日志的序号"""
+        return self._last_seq
+        
+    def append(self, item):
+        """添加一条日志
+        
+        Args:
+            item: 日志消息，会被设置seq属性
+            
+        Returns:
+            int: 分配的序号
+        """
+        with self._write_lock:
+            seq = self._last_seq + 1
+            item.seq = seq
+            self._slots[seq % self.capacity] = item
+            # 先写槽位再发布序号，读取方看到新序号时槽位已经写好
+            self._last_seq = seq
+        return seq
+        
+    def get_since(self, since_seq=0, max_count=None):
+        """获取序号大于since_seq的日志
+        
+        Args:
+            since_seq: 上次读取到的序号，为0时返回缓冲区中的全部日志
+            max_count: 最多返回的条数，超过时只返回最新的部分
+            
+        Returns:
+            tuple: (按序号排列的日志列表, 本次读取到的最新序号)
+        """
+        last_seq = self._last_seq
+        start = max(since_seq, self._cleared_seq, last_seq - self.capacity) + 1
+        if max_count is not None:
+            start = max(start, last_seq - max_count + 1)
+            
+        slots = self._slots
+        capacity = self.capacity
+        items = []
+        for seq in range(start, last_seq + 1):
+            item = slots[seq % capacity]
+            # 读取期间槽位可能已被新日志覆盖
+            if item is not None and item.seq == seq:
+                items.append(item)
+        return items, last_seq
+        
+    def clear(self):
+        """清空缓冲区，序号继续递增"""
+        with self._write_lock:
+            self._cleared_seq = self._last_seq
+
 class LoggerManager(QObject):
-    """日志管理器类"""
+    """日志管理器类
+    
+    进程内唯一的日志中心，各模块调用 LoggerManager() 得到的是同一个实例，
+    所有日志共用一个滚动文件处理器和一个内存日志缓冲区。
+    写入文件由后台线程按批完成，调用方线程只把日志放入队列。
+    """
     
     # 定义信号
     log_message = pyqtSignal(str)
     
+    # 内存中保留的最近日志条数
+    MEMORY_CAPACITY = 1000
+    
+    # 读取日志文件前等待队列写入的最长时间（秒），读取通常发生在GUI线程中，不能长时间阻塞
+    READ_FLUSH_TIMEOUT = 0.2
+    
+    # 单例模式
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls, *args, **kwargs):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(LoggerManager, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+    
     # 日志级别对应的颜色
     LEVEL_COLORS = {
         "DEBUG": QColor(23, 162, 184),      # 蓝色 #17a2b8
@@ -45,9 +187,19 @@ class LoggerManager(QObject):
     }
     
     def __init__(self):
-        """初始化日志管理器"""
-        super().__init__()
+        """初始化日志管理器，只在第一次创建实例时执行"""
+        with self._instance_lock:
+            if self._initialized:
+                return
+            super().__init__()
+            self._setup()
+            self._initialized = True
+            
+        # 记录初始化日志
+        self.info("日志管理器初始化完成")
         
+    def _setup(self):
+        """创建日志文件处理器和内存日志缓冲区"""
         # 创建日志目录
         self.log_dir = "logs"
         if not os.path.exists(self.log_dir):
@@ -65,61 +217,194 @@ class LoggerManager(QObject):
         )
         
         # 设置日志格式
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+        formatter = SourceFormatter('%(asctime)s - %(levelname)s - %(name)s - %(source_prefix)s%(message)s')
         self.handler.setFormatter(formatter)
         
-        # 创建日志记录器
+        # 结构化日志文件，调用enable_jsonl后启用
+        self.jsonl_file = None
+        
+        # 日志压缩和保留策略，调用start_retention后启用
+        self.retention = None
+        
+        # 日志限流和重复折叠，调用configure_rate_limit可以调整或关闭
+        self.rate_limiter = LogRateLimiter()
+        
+        # 后台批量写入器，文件处理器只在写入线程中使用
+        self.writer = AsyncLogWriter(self.handler)
+        
+        # 创建日志记录器，只保留写入器这一个处理器
         self.logger = logging.getLogger("LoggerManager")
         self.logger.setLevel(logging.INFO)
-        self.logger.addHandler(self.handler)
+        for handler in self.logger.handlers[:]:
+            self.logger.removeHandler(handler)
+        self.logger.addHandler(self.writer.handler)
+        # 根日志记录器也会挂上同一个写入器（见main.py），不向上传递以免同一条日志写两次
+        self.logger.propagate = False
         
-        # 创建日志队列
-        self.log_queue = queue.Queue(maxsize=1000)
+        # 内存日志缓冲区，满了以后自动丢弃最旧的日志
+        self._memory_logs = LogRing(self.MEMORY_CAPACITY)
         
-        # 添加一个自定义处理器来处理所有日志
-        class QueueHandler(logging.Handler):
-            def __init__(self, queue_manager):
-                super().__init__()
-                self.queue_manager = queue_manager
+    def enable_jsonl(self, block_records=256):
+        """启用JSON Lines格式的结构化日志文件
+        
+        与文本日志并行写入 logs/app_YYYYMMDD.jsonl，并维护按时间和级别查找用的块索引。
+        
+        Args:
+            block_records: 每个索引块包含的日志条数
+            
+        Returns:
+            str: JSON Lines日志文件路径
+        """
+        if self.jsonl_file is None:
+            self.jsonl_file = os.path.splitext(self.log_file)[0] + ".jsonl"
+            self.writer.add_sink(JsonLinesLogSink(self.jsonl_file, block_records))
+        return self.jsonl_file
+        
+    def start_retention(self, max_age_days=30, max_total_mb=200, compression="gzip", interval=3600):
+        """启动日志压缩和保留策略
+        
+        在后台定期压缩已关闭的日志文件，并删除超过保留天数或超出总大小预算的旧日志。
+        
+        Args:
+            max_age_days: 日志保留天数，为0时不按时间删除
+            max_total_mb: 日志目录总大小预算（MB），为0时不限制
+            compression: 压缩格式，gzip、zstd或None
+            interval: 处理间隔（秒）
+            
+        Returns:
+            LogRetentionManager: 日志保留管理器
+        """
+        if self.retention is None:
+            self.retention = LogRetentionManager(
+                self.log_dir,
+                max_age_days=max_age_days,
+                max_total_bytes=int(max_total_mb * 1024 * 1024),
+                compression=compression,
+                active_files=self._active_log_files,
+                rotation_lock=self.handler.lock,
+                logger=self
+            )
+            self.retention.start(interval)
+        return self.retention
+        
+    def _active_log_files(self):
+        """正在写入的日志文件，不参与压缩和删除"""
+        files = {self.log_file}
+        if self.jsonl_file:
+            files.update((self.jsonl_file, self.jsonl_file + ".idx"))
+        return files
+        
+    def configure_rate_limit(self, enabled=True, rate=LogRateLimiter.DEFAULT_RATE,
+                             burst=LogRateLimiter.DEFAULT_BURST, report_interval=60.0, sources=None):
+        """设置日志限流和重复折叠
+        
+        Args:
+            enabled: 是否启用，为False时所有日志都直接记录
+            rate: 每个消息模板每秒允许的日志条数
+            burst: 每个消息模板允许的突发条数
+            report_interval: 重复日志的最长汇总间隔（秒）
+            sources: 按来源单独设置的参数，如 {"CursorProcessManager": {"rate": 0.1, "burst": 3}}，
+                设置 "enabled": false 时该来源不限流
                 
-            def emit(self, record):
-                try:
-                    level = record.levelname
-                    message = self.format(record)
-                    source = record.name
-                    self.queue_manager._add_to_queue(level, message, source)
-                except Exception:
-                    self.handleError(record)
-                    
-        # 创建并添加队列处理器
-        queue_handler = QueueHandler(self)
-        queue_handler.setFormatter(formatter)
-        self.logger.addHandler(queue_handler)
+        Returns:
+            LogRateLimiter: 日志限流器，未启用时为None
+        """
+        # 先汇总旧限流器中尚未报告的重复日志
+        self._log_notices()
+        if not enabled:
+            self.rate_limiter = None
+            return None
+        limiter = LogRateLimiter(rate, burst, report_interval)
+        for source, options in (sources or {}).items():
+            limiter.set_source_limit(
+                source,
+                rate=options.get("rate"),
+                burst=options.get("burst"),
+                enabled=options.get("enabled", True)
+            )
+        self.rate_limiter = limiter
+        return limiter
         
-        # 记录初始化日志
-        self.info("日志管理器初始化完成")
+    def get_rate_limit_stats(self):
+        """获取日志限流统计
+        
+        Returns:
+            dict: 被限流、被折叠的日志条数和字节数等，未启用限流时为空字典
+        """
+        limiter = self.rate_limiter
+        return limiter.get_stats() if limiter is not None else {}
         
     def get_handler(self):
-        """获取日志处理器"""
-        return self.handler
+        """获取日志处理器
+        
+        返回后台写入器的队列处理器，挂到其他日志记录器上后日志同样在后台批量写入文件。
+        """
+        return self.writer.handler
+        
+    def flush(self, timeout=5.0):
+        """等待已记录的日志全部写入文件
+        
+        Args:
+            timeout: 最长等待时间（秒）
+            
+        Returns:
+            bool: 是否在超时前写入完成
+        """
+        # 尚未报告的重复日志先汇总写入
+        self._log_notices()
+        return self.writer.flush(timeout)
+        
+    def get_writer_stats(self):
+        """获取后台写入器的统计信息
+        
+        Returns:
+            dict: 放入队列、已写入、被丢弃的日志条数等
+        """
+        return self.writer.get_stats()
         
     def log(self, message, level=logging.INFO, source="app"):
         """记录日志
         
+        经过限流器检查，被限流或与上一条重复的日志不记录，由限流器汇总后再记录。
+        
         Args:
             message: 日志消息
             level: 日志级别
             source: 日志来源
         """
-        # 记录到文件
-        self.logger.log(level, message)
-        
-        # 添加到队列
-        self._add_to_queue(
-            logging.getLevelName(level),
-            message,
-            source
-        )
+        limiter = self.rate_limiter
+        if limiter is not None:
+            # 字符串级别转为整数比较，未注册的级别（如SUCCESS）按INFO处理
+            levelno = logging.getLevelName(level) if isinstance(level, str) else level
+            if not isinstance(levelno, int):
+                levelno = logging.INFO
+            allowed, notices = limiter.check(levelno, message, source)
+            for notice in notices:
+                self._write(*notice)
+            if not allowed:
+                return
+        self._write(level, message, source)
+        
+    def _log_notices(self):
+        """记录限流器中尚未报告的重复日志汇总"""
+        limiter = self.rate_limiter
+        if limiter is not None:
+            for notice in limiter.drain():
+                self._write(*notice)
+                
+    def _write(self, level, message, source):
+        """记录一条日志到文件、内存缓冲区并发送信号，不经过限流器
+        
+        Args:
+            level: 日志级别
+            message: 日志消息
+            source: 日志来源
+        """
+        # 记录到文件，来源随日志记录一起写入
+        self.logger.log(level, message, extra={"source": source})
+        
+        # 添加到内存缓冲区
+        self._add_to_queue(level, message, source)
         
         # 发送信号
         self.log_message.emit(message)
@@ -141,32 +426,19 @@ class LoggerManager(QObject):
         self.log(message, logging.DEBUG, source)
         
     def _add_to_queue(self, level, message, source="app"):
-        """将日志消息添加到队列
+        """将日志消息添加到内存缓冲区
         
         Args:
             level: 日志级别
             message: 日志消息
             source: 日志来源
         """
-        try:
-            # 如果队列已满，移除最旧的消息
-            if self.log_queue.full():
-                try:
-                    self.log_queue.get_nowait()
-                except queue.Empty:
-                    pass
-                    
-            # 创建日志消息对象
-            log_message = LogMessage(
-                level=level if isinstance(level, str) else logging.getLevelName(level),
-                message=message,
-                source=source
-            )
-            
-            # 添加到队列
-            self.log_queue.put(log_message)
-        except Exception as e:
-            print(f"Error adding log to queue: {e}")
+        log_message = LogMessage(
+            level=level if isinstance(level, str) else logging.getLevelName(level),
+            message=message,
+            source=source
+        )
+        self._memory_logs.append(log_message)
             
     def get_recent_logs(self, max_count=100, level=None, source=None):
         """获取最近的日志
@@ -181,81 +453,208 @@ class LoggerManager(QObject):
         """
         logs = []
         try:
-            # 复制队列内容
-            with self.log_queue.mutex:
-                items = list(self.log_queue.queue)
-                
-            # 应用过滤
-            for item in items:
+            items, _ = self._memory_logs.get_since(0)
+            
+            # 从最新的日志开始过滤，取够数量即停止
+            for item in reversed(items):
+                if len(logs) >= max_count:
+                    break
                 if level and item.level != level:
                     continue
                 if source and item.source != source:
                     continue
                 logs.append(item)
                 
-            # 返回最新的日志
-            return logs[-max_count:]
+            # 按时间先后返回
+            logs.reverse()
+            return logs
         except Exception as e:
             self.error(f"获取最近日志失败: {e}")
             return []
+            
+    def get_logs_since(self, since_seq=0, level=None, source=None):
+        """获取序号大于since_seq的新日志
         
-    def read_log_file(self, max_lines=1000, level=None, source=None):
-        """从日志文件中读取日志
+        读取方保存上次返回的序号，下次只取之后的新日志，耗时只与新日志数量有关。
+        
+        Args:
+            since_seq: 上次读取到的序号，为0时返回内存中的全部日志
+            level: 过滤的日志级别
+            source: 过滤的日志来源
+            
+        Returns:
+            tuple: (日志消息列表, 最新序号)
+        """
+        items, last_seq = self._memory_logs.get_since(since_seq)
+        if level or source:
+            items = [
+                item for item in items
+                if (not level or item.level == level) and (not source or item.source == source)
+            ]
+        return items, last_seq
+        
+    def get_last_seq(self):
+        """获取内存中最近一条日志的序号
+        
+        Returns:
+            int: 序号，没有日志时为0
+        """
+        return self._memory_logs.last_seq
+        
+    def read_log_file(self, max_lines=1000, level=None, source=None, keyword=None):
+        """从日志文件中读取最新的日志
         
         Args:
             max_lines: 最大返回行数
             level: 过滤的日志级别
             source: 过滤的日志来源
+            keyword: 过滤的关键字，不区分大小写
             
         Returns:
-            list: 日志消息列表
+            list: 按时间先后排列的日志消息列表
         """
-        if not os.path.exists(self.log_file):
+        logs = []
+        try:
+            for log_message in self.iter_log_file(None, level, source, keyword):
+                logs.append(log_message)
+                if len(logs) >= max_lines:
+                    break
+        except Exception as e:
+            self.error(f"读取日志文件失败: {e}", "LoggerManager")
             return []
+        logs.reverse()
+        return logs
+        
+    def iter_log_file(self, file_path=None, level=None, source=None, keyword=None):
+        """从日志文件末尾开始向前逐条产出符合过滤条件的日志
+        
+        按块从文件末尾向前读取，调用方取够需要的条数后停止迭代即可，
+        不需要读取整个文件。
+        
+        Args:
+            file_path: 日志文件路径，为None时使用当前日志文件
+            level: 过滤的日志级别
+            source: 过滤的日志来源
+            keyword: 过滤的关键字，不区分大小写
+            
+        Yields:
+            LogMessage: 日志消息，从最新的一条开始
+        """
+        if file_path is None or os.path.abspath(file_path) == os.path.abspath(self.log_file):
+            # 先写入队列中尚未写入的日志
+            self.flush(self.READ_FLUSH_TIMEOUT)
+            file_path = self.log_file
+        if not os.path.exists(file_path):
+            return
+            
+        keyword = keyword.lower() if keyword else None
+        for line in iter_lines_reverse(file_path):
+            # 关键字在解析之前先按原始行过滤，大多数行不需要解析
+            if keyword and keyword not in line.lower():
+                continue
+            log_message = self.parse_log_line(line)
+            if log_message is None:
+                continue
+            if level and log_message.level != level:
+                continue
+            if source and log_message.source != source:
+                continue
+            yield log_message
+            
+    def read_log_range(self, start_ts=None, end_ts=None, level=None, source=None, keyword=None, max_records=1000):
+        """从结构化日志文件中读取一段时间内的日志
+        
+        在块索引中二分查找起始时间，不需要从头解析整个文件。
+        
+        Args:
+            start_ts: 起始时间戳，为None时从最早的日志开始
+            end_ts: 结束时间戳，为None时到最新的日志为止
+            level: 过滤的日志级别
+            source: 过滤的日志来源
+            keyword: 过滤的关键字，不区分大小写
+            max_records: 最大返回条数
             
+        Returns:
+            list: 按时间先后排列的日志消息列表，未启用结构化日志时为空列表
+        """
         logs = []
         try:
-            with open(self.log_file, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-                
-            # 解析日志行
-            for line in lines[-max_lines:]:
-                parts = line.split(" - ", 3)
-                if len(parts) >= 4:
-                    time_str = parts[0]
-                    log_level = parts[2]
-                    content = parts[3]
-                    
-                    # 尝试提取source
-                    if "[" in content and "]" in content:
-                        source_part = content.split("]", 1)[0] + "]"
-                        if source_part.startswith("["):
-                            source_value = source_part[1:-1]
-                            message = content.split("]", 1)[1].strip()
-                        else:
-                            source_value = "app"
-                            message = content
-                    else:
-                        source_value = "app"
-                        message = content
-                        
-                    # 应用过滤
-                    if (level is None or log_level == level) and (source is None or source_value == source):
-                        log_message = LogMessage(log_level, message.strip(), time_str, source_value)
-                        logs.append(log_message)
-                        
-            return logs
+            for log_message in self.iter_jsonl(start_ts, end_ts, level, source, keyword):
+                logs.append(log_message)
+                if len(logs) >= max_records:
+                    break
         except Exception as e:
-            self.error(f"读取日志文件失败: {e}", "LoggerManager")
+            self.error(f"读取结构化日志失败: {e}", "LoggerManager")
             return []
+        return logs
+        
+    def iter_jsonl(self, start_ts=None, end_ts=None, level=None, source=None, keyword=None, reverse=False):
+        """逐条产出结构化日志文件中符合条件的日志
+        
+        Args:
+            start_ts: 起始时间戳
+            end_ts: 结束时间戳
+            level: 过滤的日志级别
+            source: 过滤的日志来源
+            keyword: 过滤的关键字，不区分大小写
+            reverse: 是否从最新的日志开始产出
+            
+        Yields:
+            LogMessage: 日志消息
+        """
+        if not self.jsonl_file:
+            return
+        # 先写入队列中尚未写入的日志
+        self.flush(self.READ_FLUSH_TIMEOUT)
+        if not os.path.exists(self.jsonl_file):
+            return
             
+        keyword = keyword.lower() if keyword else None
+        reader = JsonLinesLogReader(self.jsonl_file)
+        for item in reader.iter_range(start_ts, end_ts, {level} if level else None, reverse):
+            if source and item.get("source") != source:
+                continue
+            log_message = LogMessage(
+                item.get("level", "INFO"), item.get("msg", ""),
+                source=item.get("source"), timestamp=item.get("ts", 0.0)
+            )
+            if keyword and keyword not in str(log_message).lower():
+                continue
+            yield log_message
+            
+    @staticmethod
+    def parse_log_line(line):
+        """解析日志文件中的一行
+        
+        行格式为 "时间 - 级别 - 记录器名称 - [来源] 消息"，
+        其他模块通过根日志记录器写入的行没有来源前缀，以记录器名称作为来源。
+        
+        Args:
+            line: 日志行
+            
+        Returns:
+            LogMessage: 日志消息，不是日志记录的行（如异常堆栈）返回None
+        """
+        parts = line.split(" - ", 3)
+        if len(parts) < 4 or parts[1] not in LoggerManager.LEVEL_COLORS:
+            return None
+        time_str, log_level, name, content = parts
+        
+        # 尝试提取source
+        if content.startswith("[") and "]" in content:
+            source_value, message = content[1:].split("]", 1)
+        else:
+            source_value, message = name, content
+            
+        # 日志文件中的时间用逗号分隔毫秒
+        return LogMessage(log_level, message.strip(), time_str.replace(",", "."), source_value)
+        
     def clear_memory_logs(self):
-        """清空内存中的日志队列"""
-        with self.log_queue.mutex:
-            self.log_queue.queue.clear()
+        """清空内存中的日志缓冲区"""
+        self._memory_logs.clear()
             
     def get_log_files(self):
-        """获取所有日志文件
+        """获取所有日志文件，包括滚动产生的旧日志和压缩后的日志
         
         Returns:
             list: 日志文件路径列表
@@ -265,7 +664,7 @@ class LoggerManager(QObject):
             
         log_files = []
         for file in os.listdir(self.log_dir):
-            if file.endswith(".log"):
+            if re.search(r"\.log(\.\d+|\.gz|\.zst)?$", file):
                 log_files.append(os.path.join(self.log_dir, file))
                 
         # 按修改时间排序，最新的在前
@@ -0,0 +1,463 @@
+import os
+import json
+import stat
+import time
+import shutil
+import platform
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from utils.logger import LoggerManager
+
+
+class _ProbeContext:
+    """记录一次查找过程中检查过的路径及其状态
+    
+    查找结果只取决于这些路径是否存在、是文件还是目录，以及列出过内容的目录的修改时间，
+    这些状态都没有变化时缓存的结果仍然有效，不需要重新查找。
+    """
+    
+    def __init__(self):
+        # 路径 -> [是否为目录, 修改时间]，路径不存在时为None，不关心修改时间时为[是否为目录, None]
+        self.stamps = {}
+        
+    @staticmethod
+    def stamp(path, with_mtime):
+        """获取路径的当前状态
+        
+        Args:
+            path: 文件或目录路径
+            with_mtime: 是否包含修改时间
+            
+        Returns:
+            list: [是否为目录, 修改时间或None]，路径不存在时为None
+        """
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return None
+        return [stat.S_ISDIR(st.st_mode), st.st_mtime_ns if with_mtime else None]
+        
+    def _record(self, path, with_mtime=False):
+        state = self.stamps.get(path)
+        if state is not None and (state[1] is not None or not with_mtime):
+            return state
+        state = self.stamp(path, with_mtime)
+        self.stamps[path] = state
+        return state
+        
+    def exists(self, path):
+        return self._record(path) is not None
+        
+    def isdir(self, path):
+        state = self._record(path)
+        return state is not None and state[0]
+        
+    def isfile(self, path):
+        state = self._record(path)
+        return state is not None and not state[0]
+        
+    def listdir(self, path):
+        """列出目录内容，记录目录的修改时间（增删文件时会变化）"""
+        self._record(path, with_mtime=True)
+        try:
+            return sorted(os.listdir(path))
+        except OSError:
+            return []
+            
+    def walk(self, path):
+        """遍历目录树，记录每个遍历到的目录的修改时间"""
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            self._record(root, with_mtime=True)
+            yield root, dirs, sorted(files)
+            
+    def which(self, name):
+        """在PATH中查找可执行文件，记录PATH中每个目录的修改时间"""
+        for directory in os.environ.get("PATH", "").split(os.pathsep):
+            if directory:
+                self._record(directory, with_mtime=True)
+        return shutil.which(name)
+
+
+class PathDiscovery:
+    """Cursor和Chrome安装路径的查找服务
+    
+    每项查找的结果连同查找时检查过的路径状态一起缓存，这些路径没有变化时直接返回缓存的结果；
+    缓存同时保存到文件中，冷启动时只需要检查路径状态，不需要重新遍历目录。
+    互不依赖的查找并行执行，依赖Cursor数据目录的查找共用同一个数据目录结果。
+    """
+    
+    # 查找项 -> (说明, 是否依赖Cursor数据目录)
+    PROBES = {
+        "cursor_exe": ("Cursor可执行文件", False),
+        "cursor_data_dir": ("Cursor数据目录", False),
+        "cursor_config_file": ("Cursor配置文件", True),
+        "cursor_db_file": ("Cursor数据库文件", True),
+        "chrome_exe": ("Chrome浏览器", False),
+        "chrome_user_data_dir": ("Chrome用户数据目录", False),
+        "backup_dir": ("Cursor备份目录", True),
+    }
+    
+    # 缓存文件格式版本，查找规则变化时增加
+    CACHE_VERSION = 1
+    
+    # 单例模式
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    def __new__(cls, *args, **kwargs):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = super(PathDiscovery, cls).__new__(cls)
+                cls._instance._initialized = False
+        return cls._instance
+        
+    def __init__(self, cache_file="config/path_cache.json"):
+        """初始化路径查找服务，只在第一次创建实例时执行
+        
+        Args:
+            cache_file: 查找结果缓存文件路径
+        """
+        with self._instance_lock:
+            if self._initialized:
+                return
+            self.cache_file = cache_file
+            self.logger = LoggerManager()
+            self._lock = threading.Lock()
+            # 查找项 -> {"path", "data_dir", "stamps", "time"}
+            self._entries = {}
+            self._stats = {"hits": 0, "probes": 0, "invalidated": 0}
+            self._load_cache()
+            self._initialized = True
+            
+    def get(self, name, refresh=False):
+        """获取一项路径
+        
+        Args:
+            name: 查找项名称，见PROBES
+            refresh: 是否忽略缓存重新查找
+            
+        Returns:
+            str: 找到的路径，未找到时为空字符串
+        """
+        data_dir = self.get("cursor_data_dir", refresh) if self.PROBES[name][1] else None
+        path, changed = self._resolve(name, data_dir, refresh)
+        if changed:
+            self._save_cache()
+        return path
+        
+    def discover(self, names=None, refresh=False):
+        """并行获取多项路径
+        
+        先并行执行不依赖Cursor数据目录的查找，再用同一个数据目录结果并行执行依赖它的查找。
+        
+        Args:
+            names: 查找项名称列表，为None时获取全部
+            refresh: 是否忽略缓存重新查找
+            
+        Returns:
+            dict: 查找项名称 -> 路径，未找到的为空字符串
+        """
+        names = list(self.PROBES) if names is None else list(names)
+        dependent = [name for name in names if self.PROBES[name][1]]
+        independent = [name for name in names if not self.PROBES[name][1]]
+        if dependent and "cursor_data_dir" not in independent:
+            independent.append("cursor_data_dir")
+            
+        results = {}
+        changed = False
+        with ThreadPoolExecutor(max_workers=max(len(independent), len(dependent), 1),
+                                thread_name_prefix="PathDiscovery") as executor:
+            for name, (path, name_changed) in zip(
+                    independent, executor.map(lambda n: self._resolve(n, None, refresh), independent)):
+                results[name] = path
+                changed = changed or name_changed
+            data_dir = results.get("cursor_data_dir", "")
+            for name, (path, name_changed) in zip(
+                    dependent, executor.map(lambda n: self._resolve(n, data_dir, refresh), dependent)):
+                results[name] = path
+                changed = changed or name_changed
+        if changed:
+            self._save_cache()
+        return {name: results[name] for name in names}
+        
+    def invalidate(self, name=None):
+        """清除缓存的查找结果
+        
+        Args:
+            name: 查找项名称，为None时清除全部
+        """
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+        self._save_cache()
+        
+    def get_stats(self):
+        """获取查找统计信息
+        
+        Returns:
+            dict: 缓存命中、实际查找、缓存失效的次数以及缓存条目数
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+        
+    def _resolve(self, name, data_dir, refresh):
+        """使用缓存或执行查找（可能在工作线程中执行）
+        
+        Args:
+            name: 查找项名称
+            data_dir: Cursor数据目录，不依赖时为None
+            refresh: 是否忽略缓存
+            
+        Returns:
+            tuple: (路径, 是否执行了查找)
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is not None and not refresh:
+            if entry.get("data_dir") == data_dir and self._is_valid(entry):
+                self._count("hits")
+                return entry["path"], False
+            self._count("invalidated")
+            
+        label = self.PROBES[name][0]
+        ctx = _ProbeContext()
+        probe = getattr(self, f"_probe_{name}")
+        try:
+            path = probe(ctx, data_dir) if self.PROBES[name][1] else probe(ctx)
+        except Exception as e:
+            self.logger.error(f"查找{label}失败: {str(e)}", "PathDiscovery")
+            return "", False
+        path = path or ""
+        self._count("probes")
+        if path:
+            self.logger.info(f"找到{label}: {path}", "PathDiscovery")
+        else:
+            self.logger.warning(f"未找到{label}", "PathDiscovery")
+            
+        with self._lock:
+            self._entries[name] = {
+                "path": path,
+                "data_dir": data_dir,
+                "stamps": ctx.stamps,
+                "time": time.time()
+            }
+        return path, True
+        
+    @staticmethod
+    def _is_valid(entry):
+        """缓存的查找结果是否仍然有效：查找时检查过的路径状态都没有变化"""
+        for path, state in entry["stamps"].items():
+            current = _ProbeContext.stamp(path, state is not None and state[1] is not None)
+            if current != state:
+                return False
+        return True
+        
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+            
+    @staticmethod
+    def _environment():
+        """缓存对应的运行环境，换了系统或用户后缓存无效"""
+        return {"system": platform.system(), "home": os.path.expanduser("~")}
+        
+    def _load_cache(self):
+        """读取缓存文件，格式或运行环境不符时忽略"""
+        try:
+            with open(self.cache_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != self.CACHE_VERSION or data.get("environment") != self._environment():
+            return
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self._entries = {name: entry for name, entry in entries.items() if name in self.PROBES}
+            
+    def _save_cache(self):
+        """把查找结果写入缓存文件（先写临时文件再替换）"""
+        with self._lock:
+            data = json.dumps({
+                "version": self.CACHE_VERSION,
+                "environment": self._environment(),
+                "entries": self._entries
+            }, ensure_ascii=False)
+        directory = os.path.dirname(self.cache_file) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(
+                prefix=os.path.basename(self.cache_file) + ".", suffix=".tmp", dir=directory
+            )
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(data)
+                os.replace(temp_path, self.cache_file)
+            except BaseException:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+        except OSError as e:
+            self.logger.warning(f"保存路径查找缓存失败: {str(e)}", "PathDiscovery")
+            
+    # 各项查找，只通过ctx访问文件系统，检查过的路径会被记录下来
+    
+    def _probe_cursor_exe(self, ctx):
+        if platform.system() == "Windows":
+            possible_paths = [
+                os.path.expandvars("%LOCALAPPDATA%\\Programs\\cursor\\Cursor.exe"),
+                os.path.expandvars("%LOCALAPPDATA%\\Programs\\Cursor\\Cursor.exe"),
+                os.path.expandvars("%USERPROFILE%\\AppData\\Local\\Programs\\cursor\\Cursor.exe"),
+                os.path.expandvars("%USERPROFILE%\\AppData\\Local\\Programs\\Cursor\\Cursor.exe"),
+                "C:\\Users\\Administrator\\AppData\\Local\\Programs\\cursor\\Cursor.exe",
+                "C:\\Program Files\\Cursor\\Cursor.exe",
+                "C:\\Program Files (x86)\\Cursor\\Cursor.exe"
+            ]
+        elif platform.system() == "Darwin":
+            possible_paths = [
+                "/Applications/Cursor.app/Contents/MacOS/Cursor",
+                os.path.expanduser("~/Applications/Cursor.app/Contents/MacOS/Cursor")
+            ]
+        else:
+            possible_paths = [
+                "/usr/bin/cursor",
+                "/usr/local/bin/cursor",
+                os.path.expanduser("~/.local/bin/cursor")
+            ]
+        for path in possible_paths:
+            if ctx.exists(path):
+                return path
+        return ""
+        
+    def _probe_cursor_data_dir(self, ctx):
+        if platform.system() == "Windows":
+            possible_paths = [
+                os.path.expandvars("%APPDATA%\\Cursor"),
+                os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor")
+            ]
+        elif platform.system() == "Darwin":
+            possible_paths = [
+                os.path.expanduser("~/Library/Application Support/Cursor")
+            ]
+        else:
+            possible_paths = [
+                os.path.expanduser("~/.config/Cursor")
+            ]
+        for path in possible_paths:
+            if ctx.isdir(path):
+                return path
+        return ""
+        
+    def _probe_cursor_config_file(self, ctx, data_dir):
+        if not data_dir:
+            return ""
+        specific_paths = [
+            os.path.expandvars("%APPDATA%\\Cursor\\User\\globalStorage\\storage.json"),
+            os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor\\User\\globalStorage\\storage.json"),
+            os.path.join(data_dir, "User", "globalStorage", "storage.json")
+        ]
+        for path in specific_paths:
+            if ctx.isfile(path):
+                return path
+                
+        for file_name in ["Config", "config.json", "settings.json", "preferences.json", "storage.json"]:
+            file_path = os.path.join(data_dir, file_name)
+            if ctx.isfile(file_path):
+                return file_path
+                
+        user_storage_dir = os.path.join(data_dir, "User", "globalStorage")
+        if ctx.isdir(user_storage_dir):
+            for file_name in ctx.listdir(user_storage_dir):
+                if file_name.endswith(".json"):
+                    return os.path.join(user_storage_dir, file_name)
+        return ""
+        
+    def _probe_cursor_db_file(self, ctx, data_dir):
+        if not data_dir:
+            return ""
+        specific_paths = [
+            os.path.expandvars("%APPDATA%\\Cursor\\User\\globalStorage\\state.vscdb"),
+            os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor\\User\\globalStorage\\state.vscdb"),
+            os.path.join(data_dir, "User", "globalStorage", "state.vscdb")
+        ]
+        for path in specific_paths:
+            if ctx.isfile(path):
+                return path
+                
+        possible_dirs = [
+            os.path.join(data_dir, "Local Storage", "leveldb"),
+            os.path.join(data_dir, "databases"),
+            os.path.join(data_dir, "IndexedDB"),
+            os.path.join(data_dir, "User", "globalStorage")
+        ]
+        for directory in possible_dirs:
+            if ctx.isdir(directory):
+                for root, _, files in ctx.walk(directory):
+                    for file in files:
+                        if file.endswith((".sqlite", ".db", ".vscdb")):
+                            return os.path.join(root, file)
+        return ""
+        
+    def _probe_chrome_exe(self, ctx):
+        if platform.system() == "Windows":
+            possible_paths = [
+                "C:\\Program Files\\Google\\Chrome\\Application\\chrome.exe",
+                os.path.expandvars("%ProgramFiles%\\Google\\Chrome\\Application\\chrome.exe"),
+                os.path.expandvars("%ProgramFiles(x86)%\\Google\\Chrome\\Application\\chrome.exe"),
+                os.path.expandvars("%LOCALAPPDATA%\\Google\\Chrome\\Application\\chrome.exe")
+            ]
+        elif platform.system() == "Darwin":
+            possible_paths = [
+                "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+                os.path.expanduser("~/Applications/Google Chrome.app/Contents/MacOS/Google Chrome")
+            ]
+        else:
+            # 在进程内查找PATH，不需要启动which子进程
+            chrome_path = ctx.which("google-chrome")
+            if chrome_path:
+                return chrome_path
+            possible_paths = [
+                "/usr/bin/google-chrome",
+                "/usr/bin/google-chrome-stable",
+                "/usr/bin/chromium",
+                "/usr/bin/chromium-browser"
+            ]
+        for path in possible_paths:
+            if ctx.exists(path):
+                return path
+        return ""
+        
+    def _probe_chrome_user_data_dir(self, ctx):
+        if platform.system() == "Windows":
+            possible_paths = [
+                os.path.expandvars("%LOCALAPPDATA%\\Google\\Chrome\\User Data")
+            ]
+        elif platform.system() == "Darwin":
+            possible_paths = [
+                os.path.expanduser("~/Library/Application Support/Google/Chrome")
+            ]
+        else:
+            possible_paths = [
+                os.path.expanduser("~/.config/google-chrome"),
+                os.path.expanduser("~/.config/chromium")
+            ]
+        for path in possible_paths:
+            if ctx.isdir(path):
+                return path
+        return ""
+        
+    def _probe_backup_dir(self, ctx, data_dir):
+        specific_paths = [
+            os.path.expandvars("%APPDATA%\\Cursor\\User\\globalStorage\\backups"),
+            os.path.expandvars("%USERPROFILE%\\AppData\\Roaming\\Cursor\\User\\globalStorage\\backups"),
+            os.path.join(data_dir, "User", "globalStorage", "backups") if data_dir else None
+        ]
+        for path in specific_paths:
+            if path and ctx.isdir(path):
+                return path
+        return ""
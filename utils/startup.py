@@ -0,0 +1,318 @@
+import time
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from utils.logger import LoggerManager
+
+
+# 启动时间线中的一项: 组件名、相对程序启动的开始时间（毫秒）、耗时（毫秒）、执行线程和结果
+StartupEntry = namedtuple("StartupEntry", ["name", "start_ms", "duration_ms", "thread", "status"])
+
+
+class StartupTimeline:
+    """启动时间线
+    
+    记录启动过程中每个组件的开始时间和耗时，时间都相对于begin()调用的时刻。
+    主窗口显示之后按需创建的选项卡也会记录在时间线中。
+    """
+    
+    # 单例模式
+    _instance = None
+    
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(StartupTimeline, cls).__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+        
+    def __init__(self):
+        """初始化启动时间线"""
+        if self._initialized:
+            return
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self._entries = []
+        self._initialized = True
+        
+    def begin(self):
+        """从当前时刻开始计时，清空已有的记录"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._entries = []
+            
+    def elapsed_ms(self):
+        """获取从开始计时到现在的毫秒数
+        
+        Returns:
+            float: 毫秒数
+        """
+        return (time.perf_counter() - self._origin) * 1000
+        
+    @contextmanager
+    def measure(self, name):
+        """测量一段代码的耗时
+        
+        Args:
+            name: 组件名
+            
+        Yields:
+            None
+        """
+        started = time.perf_counter()
+        status = "完成"
+        try:
+            yield
+        except Exception as e:
+            status = f"失败: {e}"
+            raise
+        finally:
+            self.record(name, started, time.perf_counter(), status)
+            
+    def record(self, name, started, ended, status="完成"):
+        """记录一个组件的耗时
+        
+        Args:
+            name: 组件名
+            started: 开始时间（time.perf_counter()）
+            ended: 结束时间（time.perf_counter()）
+            status: 执行结果
+        """
+        entry = StartupEntry(
+            name,
+            (started - self._origin) * 1000,
+            (ended - started) * 1000,
+            threading.current_thread().name,
+            status
+        )
+        with self._lock:
+            self._entries.append(entry)
+            
+    def mark(self, name):
+        """记录一个时间点（耗时为0），如主窗口首次显示
+        
+        Args:
+            name: 时间点名称
+        """
+        now = time.perf_counter()
+        self.record(name, now, now)
+        
+    def entries(self):
+        """获取所有记录，按开始时间排列
+        
+        Returns:
+            list: StartupEntry列表
+        """
+        with self._lock:
+            return sorted(self._entries, key=lambda entry: entry.start_ms)
+            
+    def log_summary(self, title="启动完成"):
+        """将时间线写入日志
+        
+        Args:
+            title: 汇总日志的标题
+        """
+        logger = LoggerManager()
+        entries = self.entries()
+        logger.info(f"{title}，总计 {self.elapsed_ms():.1f} ms，{len(entries)} 项", "Startup")
+        for entry in entries:
+            logger.info(
+                f"{entry.name}: 开始于 {entry.start_ms:.1f} ms，耗时 {entry.duration_ms:.1f} ms，"
+                f"线程 {entry.thread}，{entry.status}",
+                "Startup"
+            )
+
+
+class StartupOrchestrator(QObject):
+    """启动编排器
+    
+    主窗口显示之后再初始化其余组件: 不涉及界面的初始化函数在后台线程池中执行，
+    需要在GUI线程中创建的对象（QObject、界面）在GUI线程中依次执行。
+    每个组件可以声明依赖的组件，依赖全部完成后才开始执行；每个组件的耗时都记录在启动时间线中。
+    完成回调总是在GUI线程中调用。
+    """
+    
+    # 组件完成信号，参数为 (组件名, 初始化函数的返回值)
+    component_ready = pyqtSignal(str, object)
+    # 组件失败信号，参数为 (组件名, 错误信息)
+    component_failed = pyqtSignal(str, str)
+    # 所有已添加的组件都已完成（包括失败）
+    all_ready = pyqtSignal()
+    
+    # 后台线程完成后排队投递到GUI线程，参数为 (组件名, 返回值, 错误信息)
+    _finished = pyqtSignal(str, object, str)
+    
+    def __init__(self, max_workers=4, timeline=None, parent=None):
+        """初始化启动编排器
+        
+        Args:
+            max_workers: 后台线程池的线程数
+            timeline: 启动时间线，为None时使用StartupTimeline单例
+            parent: 父对象
+        """
+        super().__init__(parent)
+        self.logger = LoggerManager()
+        self.timeline = timeline or StartupTimeline()
+        self.max_workers = max_workers
+        self._executor = None
+        
+        # 组件名 -> (初始化函数, 依赖的组件, 是否在后台执行, 完成回调)
+        self._tasks = {}
+        # 已完成的组件名 -> 返回值，失败的组件返回值为None
+        self._results = {}
+        self._failed = set()
+        self._started = set()
+        # 等待依赖完成的回调列表，元素为 (依赖的组件, 回调)
+        self._waiters = []
+        self._running = False
+        
+        self._finished.connect(self._on_finished)
+        
+    def add(self, name, fn, requires=(), background=True, on_ready=None):
+        """添加一个组件的初始化函数
+        
+        Args:
+            name: 组件名
+            fn: 初始化函数，无参数，返回值会传给完成回调
+            requires: 依赖的组件名
+            background: 是否在后台线程池中执行，创建QObject或界面的函数必须为False
+            on_ready: 完成回调，参数为初始化函数的返回值，在GUI线程中调用
+        """
+        self._tasks[name] = (fn, tuple(requires), background, on_ready)
+        if self._running:
+            self._schedule()
+            
+    def start(self):
+        """开始执行所有依赖已满足的组件"""
+        if self._running:
+            return
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="Startup")
+        self._schedule()
+        
+    def when_ready(self, names, callback):
+        """在指定的组件都完成后调用回调，已经完成时立即调用
+        
+        Args:
+            names: 组件名列表
+            callback: 无参数的回调，在GUI线程中调用
+        """
+        names = tuple(names)
+        if self.is_ready(*names):
+            callback()
+        else:
+            self._waiters.append((names, callback))
+            
+    def is_ready(self, *names):
+        """指定的组件是否都已完成（失败也算完成）
+        
+        Args:
+            *names: 组件名
+            
+        Returns:
+            bool: 是否都已完成
+        """
+        return all(name in self._results for name in names)
+        
+    def result(self, name, default=None):
+        """获取组件初始化函数的返回值
+        
+        Args:
+            name: 组件名
+            default: 组件未完成或失败时返回的值
+            
+        Returns:
+            object: 返回值
+        """
+        value = self._results.get(name)
+        return default if value is None else value
+        
+    def get_status(self):
+        """获取各组件的状态
+        
+        Returns:
+            dict: 组件名 -> "等待"、"执行中"、"完成"或"失败"
+        """
+        status = {}
+        for name in self._tasks:
+            if name in self._failed:
+                status[name] = "失败"
+            elif name in self._results:
+                status[name] = "完成"
+            elif name in self._started:
+                status[name] = "执行中"
+            else:
+                status[name] = "等待"
+        return status
+        
+    def shutdown(self, wait=False):
+        """关闭后台线程池
+        
+        Args:
+            wait: 是否等待正在执行的初始化函数结束
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            
+    def _schedule(self):
+        """开始执行依赖已满足且尚未开始的组件"""
+        for name, (fn, requires, background, _) in list(self._tasks.items()):
+            if name in self._started or not self.is_ready(*requires):
+                continue
+            self._started.add(name)
+            if background and self._executor is not None:
+                self._executor.submit(self._run, name, fn)
+            else:
+                # 在GUI线程中执行，放到事件循环中以免阻塞当前的绘制
+                QTimer.singleShot(0, lambda name=name, fn=fn: self._run(name, fn))
+                
+    def _run(self, name, fn):
+        """执行初始化函数并记录耗时（在后台线程或GUI线程中执行）
+        
+        Args:
+            name: 组件名
+            fn: 初始化函数
+        """
+        started = time.perf_counter()
+        try:
+            result = fn()
+        except Exception as e:
+            self.timeline.record(name, started, time.perf_counter(), f"失败: {e}")
+            self._finished.emit(name, None, str(e) or type(e).__name__)
+            return
+        self.timeline.record(name, started, time.perf_counter())
+        self._finished.emit(name, result, "")
+        
+    def _on_finished(self, name, result, error):
+        """组件完成（在GUI线程中执行）"""
+        self._results[name] = result
+        if error:
+            self._failed.add(name)
+            self.logger.error(f"初始化{name}失败: {error}", "Startup")
+            self.component_failed.emit(name, error)
+        else:
+            on_ready = self._tasks[name][3]
+            if on_ready is not None:
+                try:
+                    on_ready(result)
+                except Exception as e:
+                    self.logger.error(f"处理{name}初始化结果时出错: {e}", "Startup")
+            self.component_ready.emit(name, result)
+            
+        # 调用依赖已满足的回调
+        waiting, self._waiters = self._waiters, []
+        for names, callback in waiting:
+            if self.is_ready(*names):
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"执行启动回调时出错: {e}", "Startup")
+            else:
+                self._waiters.append((names, callback))
+                
+        self._schedule()
+        if self.is_ready(*self._tasks):
+            self.shutdown()
+            self.all_ready.emit()
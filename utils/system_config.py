@@ -1,7 +1,7 @@
-from typing import Any, List, Dict
+from typing import Any, Dict
 from utils.config_manager import ConfigManager
+from utils.path_discovery import PathDiscovery
 import os
-import time
 import sqlite3
 import platform
 import logging
@@ -12,144 +12,144 @@ class SystemConfigManager(ConfigManager):
     # 添加类变量，记录是否已经初始化过默认配置
     _has_initialized_defaults = False
     
+    # 路径查找项 -> 对应的配置 (节, 键)
+    PATH_KEYS = {
+        "cursor_exe": ("cursor", "executable_path"),
+        "cursor_data_dir": ("cursor", "data_dir"),
+        "cursor_config_file": ("cursor", "config_file"),
+        "cursor_db_file": ("cursor", "db_file"),
+        "chrome_exe": ("chrome", "executable_path"),
+        "chrome_user_data_dir": ("chrome", "user_data_dir"),
+    }
+    
     def __init__(self, config_file: str = "config/system_config.json"):
         """初始化系统配置管理器
         
         Args:
             config_file: 配置文件路径
         """
-        # 先调用父类的初始化
-        super().__init__(config_file)
-        
-        # 设置日志记录器
-        self.logger = logging.getLogger("SystemConfigManager")
-        
-        # 检查是否已初始化过默认路径
-        if not SystemConfigManager._has_initialized_defaults:
-            try:
-                # 设置Cursor可执行文件路径
-                if not self.get_config("cursor", "executable_path"):
-                    cursor_exe = self._find_cursor_exe()
-                    if cursor_exe:
-                        self.set_config("cursor", "executable_path", cursor_exe)
-                        self.logger.info(f"设置Cursor可执行文件路径: {cursor_exe}")
-                    else:
-                        self.logger.warning("未找到Cursor可执行文件")
-                        
-                # 设置Cursor数据目录
-                if not self.get_config("cursor", "data_dir"):
-                    cursor_data = self._find_cursor_data_dir()
-                    if cursor_data:
-                        self.set_config("cursor", "data_dir", cursor_data)
-                        self.logger.info(f"设置Cursor数据目录: {cursor_data}")
-                    else:
-                        self.logger.warning("未找到Cursor数据目录")
-                        
-                # 设置Cursor配置文件
-                if not self.get_config("cursor", "config_file"):
-                    cursor_config = self._find_cursor_config_file()
-                    if cursor_config:
-                        self.set_config("cursor", "config_file", cursor_config)
-                        self.logger.info(f"设置Cursor配置文件: {cursor_config}")
-                    else:
-                        self.logger.warning("未找到Cursor配置文件")
-                        
-                # 设置Cursor数据库文件
-                if not self.get_config("cursor", "db_file"):
-                    cursor_db = self._find_cursor_db_file()
-                    if cursor_db:
-                        self.set_config("cursor", "db_file", cursor_db)
-                        self.logger.info(f"设置Cursor数据库文件: {cursor_db}")
-                    else:
-                        self.logger.warning("未找到Cursor数据库文件")
-                        
-                # 设置Chrome可执行文件路径
-                if not self.get_config("chrome", "executable_path"):
-                    chrome_exe = self._find_chrome_exe()
-                    if chrome_exe:
-                        self.set_config("chrome", "executable_path", chrome_exe)
-                        self.logger.info(f"设置Chrome可执行文件路径: {chrome_exe}")
-                    else:
-                        self.logger.warning("未找到Chrome可执行文件")
-                        
-                # 设置Chrome用户数据目录
-                if not self.get_config("chrome", "user_data_dir"):
-                    chrome_data = self._find_chrome_user_data_dir()
-                    if chrome_data:
-                        self.set_config("chrome", "user_data_dir", chrome_data)
-                        self.logger.info(f"设置Chrome用户数据目录: {chrome_data}")
-                    else:
-                        self.logger.warning("未找到Chrome用户数据目录")
-                        
-                # 设置Chrome自动化配置
-                if not self.has_config("chrome.automation"):
-                    automation_config = {
-                        "headless": False,  # 无头模式
-                        "user_agent": {
-                            "enabled": False,
-                            "type": "default",  # default, custom, random, mobile, tablet
-                            "custom": "",       # 自定义UA字符串
-                            "presets": {
-                                "chrome_windows": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-                                "chrome_mac": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-                                "chrome_android": "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36",
-                                "chrome_ios": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/122.0.0.0 Mobile/15E148 Safari/604.1"
-                            }
-                        },
-                        "window_size": {
-                            "width": 1920,
-                            "height": 1080
-                        },
-                        "disable_gpu": True,         # 禁用GPU
-                        "disable_images": False,     # 禁用图片加载
-                        "incognito": False,         # 无痕模式
-                        "disable_javascript": False, # 禁用JavaScript
-                        "timeout": 30,              # 页面加载超时时间(秒)
-                        "use_local_browser": True   # 使用本地浏览器
-                    }
-                    self.set_config("chrome", "automation", automation_config)
-                    self.logger.info("已设置Chrome自动化默认配置")
-                
-                # 标记已初始化默认配置
-                SystemConfigManager._has_initialized_defaults = True
-                
-            except Exception as e:
-                self.error(f"初始化系统配置失败: {str(e)}")
-                
+        # 与启动线程同时创建时等待其完成初始化，不会重复查找路径
+        with self._init_lock:
+            # 先调用父类的初始化
+            super().__init__(config_file)
+            
+            # 设置日志记录器
+            self.logger = logging.getLogger("SystemConfigManager")
+            
+            # 检查是否已初始化过默认路径
+            if not SystemConfigManager._has_initialized_defaults:
+                try:
+                    # 缺少的路径一次并行查找，结果有缓存时不需要重新遍历目录
+                    missing = [
+                        name for name, (section, key) in self.PATH_KEYS.items()
+                        if not self.get_config(section, key)
+                    ]
+                    found = PathDiscovery().discover(missing) if missing else {}
+                    
+                    # 设置Cursor可执行文件路径
+                    if not self.get_config("cursor", "executable_path"):
+                        cursor_exe = found.get("cursor_exe", "")
+                        if cursor_exe:
+                            self.set_config("cursor", "executable_path", cursor_exe)
+                            self.logger.info(f"设置Cursor可执行文件路径: {cursor_exe}")
+                        else:
+                            self.logger.warning("未找到Cursor可执行文件")
+                            
+                    # 设置Cursor数据目录
+                    if not self.get_config("cursor", "data_dir"):
+                        cursor_data = found.get("cursor_data_dir", "")
+                        if cursor_data:
+                            self.set_config("cursor", "data_dir", cursor_data)
+                            self.logger.info(f"设置Cursor数据目录: {cursor_data}")
+                        else:
+                            self.logger.warning("未找到Cursor数据目录")
+                            
+                    # 设置Cursor配置文件
+                    if not self.get_config("cursor", "config_file"):
+                        cursor_config = found.get("cursor_config_file", "")
+                        if cursor_config:
+                            self.set_config("cursor", "config_file", cursor_config)
+                            self.logger.info(f"设置Cursor配置文件: {cursor_config}")
+                        else:
+                            self.logger.warning("未找到Cursor配置文件")
+                            
+                    # 设置Cursor数据库文件
+                    if not self.get_config("cursor", "db_file"):
+                        cursor_db = found.get("cursor_db_file", "")
+                        if cursor_db:
+                            self.set_config("cursor", "db_file", cursor_db)
+                            self.logger.info(f"设置Cursor数据库文件: {cursor_db}")
+                        else:
+                            self.logger.warning("未找到Cursor数据库文件")
+                            
+                    # 设置Chrome可执行文件路径
+                    if not self.get_config("chrome", "executable_path"):
+                        chrome_exe = found.get("chrome_exe", "")
+                        if chrome_exe:
+                            self.set_config("chrome", "executable_path", chrome_exe)
+                            self.logger.info(f"设置Chrome可执行文件路径: {chrome_exe}")
+                        else:
+                            self.logger.warning("未找到Chrome可执行文件")
+                            
+                    # 设置Chrome用户数据目录
+                    if not self.get_config("chrome", "user_data_dir"):
+                        chrome_data = found.get("chrome_user_data_dir", "")
+                        if chrome_data:
+                            self.set_config("chrome", "user_data_dir", chrome_data)
+                            self.logger.info(f"设置Chrome用户数据目录: {chrome_data}")
+                        else:
+                            self.logger.warning("未找到Chrome用户数据目录")
+                            
+                    # 设置Chrome自动化配置
+                    if not self.has_config("chrome.automation"):
+                        automation_config = {
+                            "headless": False,  # 无头模式
+                            "user_agent": {
+                                "enabled": False,
+                                "type": "default",  # default, custom, random, mobile, tablet
+                                "custom": "",       # 自定义UA字符串
+                                "presets": {
+                                    "chrome_windows": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+                                    "chrome_mac": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+                                    "chrome_android": "Mozilla/5.0 (Linux; Android 10; K) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Mobile Safari/537.36",
+                                    "chrome_ios": "Mozilla/5.0 (iPhone; CPU iPhone OS 16_0 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) CriOS/122.0.0.0 Mobile/15E148 Safari/604.1"
+                                }
+                            },
+                            "window_size": {
+                                "width": 1920,
+                                "height": 1080
+                            },
+                            "disable_gpu": True,         # 禁用GPU
+                            "disable_images": False,     # 禁用图片加载
+                            "incognito": False,         # 无痕模式
+                            "disable_javascript": False, # 禁用JavaScript
+                            "timeout": 30,              # 页面加载超时时间(秒)
+                            "use_local_browser": True   # 使用本地浏览器
+                        }
+                        self.set_config("chrome", "automation", automation_config)
+                        self.logger.info("已设置Chrome自动化默认配置")
+                    
+                    # 标记已初始化默认配置
+                    SystemConfigManager._has_initialized_defaults = True
+                    
+                except Exception as e:
+                    self.error(f"初始化系统配置失败: {str(e)}")
+                    
     # 添加一个方法，用于强制重新检测路径
     def redetect_paths(self):
-        """强制重新检测所有路径，通常在用户明确要求时调用"""
+        """强制重新检测所有路径，通常在用户明确要求时调用
+        
+        忽略路径查找缓存，各项路径并行重新查找，找到的路径一次写入配置文件。
+        """
         try:
-            cursor_exe = self._find_cursor_exe()
-            if cursor_exe:
-                self.set_config("cursor", "executable_path", cursor_exe)
-                self.logger.info(f"重新检测到Cursor可执行文件路径: {cursor_exe}")
-            
-            cursor_data = self._find_cursor_data_dir()
-            if cursor_data:
-                self.set_config("cursor", "data_dir", cursor_data)
-                self.logger.info(f"重新检测到Cursor数据目录: {cursor_data}")
-            
-            cursor_config = self._find_cursor_config_file()
-            if cursor_config:
-                self.set_config("cursor", "config_file", cursor_config)
-                self.logger.info(f"重新检测到Cursor配置文件: {cursor_config}")
-            
-            cursor_db = self._find_cursor_db_file()
-            if cursor_db:
-                self.set_config("cursor", "db_file", cursor_db)
-                self.logger.info(f"重新检测到Cursor数据库文件: {cursor_db}")
-            
-            chrome_exe = self._find_chrome_exe()
-            if chrome_exe:
-                self.set_config("chrome", "executable_path", chrome_exe)
-                self.logger.info(f"重新检测到Chrome可执行文件路径: {chrome_exe}")
-            
-            chrome_data = self._find_chrome_user_data_dir()
-            if chrome_data:
-                self.set_config("chrome", "user_data_dir", chrome_data)
-                self.logger.info(f"重新检测到Chrome用户数据目录: {chrome_data}")
-                
+            found = PathDiscovery().discover(list(self.PATH_KEYS), refresh=True)
+            updates = {}
+            for name, (section, key) in self.PATH_KEYS.items():
+                if found[name]:
+                    updates[f"{section}.{key}"] = found[name]
+                    self.logger.info(f"重新检测到{PathDiscovery.PROBES[name][0]}: {found[name]}")
+            if updates:
+                return self.update_config(updates)
             return True
         except Exception as e:
             self.error(f"重新检测路径失败: {str(e)}")
@@ -182,7 +182,8 @@ class SystemConfigManager(ConfigManager):
         Returns:
             Any: 配置值
         """
-        return super().get_config(f"{section}.{key}", default)
+        # 直接查展开的配置视图，不经过父类方法
+        return self._flat_view().get(f"{section}.{key}", default)
         
     def set_config(self, section: str, key: str, value: Any) -> bool:
         """设置配置值
@@ -197,28 +198,6 @@ class SystemConfigManager(ConfigManager):
         """
         return super().set_config(f"{section}.{key}", value)
 
-    def get_backups(self) -> List[Dict[str, str]]:
-        """获取备份列表
-        
-        Returns:
-            List[Dict[str, str]]: 备份列表，每个备份包含name、time和size信息
-        """
-        backup_dir = self.get_config("backup", "backup_dir", "backups")
-        backups = []
-        
-        if os.path.exists(backup_dir):
-            for file in os.listdir(backup_dir):
-                file_path = os.path.join(backup_dir, file)
-                if os.path.isfile(file_path):
-                    stat = os.stat(file_path)
-                    backups.append({
-                        "name": file,
-                        "time": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat.st_mtime)),
-                        "size": f"{stat.st_size / 1024:.1f} KB"
-                    })
-        
-        return sorted(backups, key=lambda x: x["time"], reverse=True)
-
     def check_cursor_db_status(self) -> Dict[str, Any]:
         """检查Cursor数据库状态
         